@@ -1,8 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 import os
 from dotenv import load_dotenv
-from app.routers import news, nba_stats
+from app.routers import events, league, news, nba_stats
+from app.services import event_hub, executor, news_service, pipeline
+from app.services.scheduler import scheduler
+from app.src.data import espn_connector, gamelog_store, nba_stats_client, player_index
+from app.src.utils import async_http, config
+from app.src.utils.fast_json import FastJSONResponse, FastJSONRoute
+from app.src.utils.http_cache import CacheRule, HTTPCacheMiddleware, cache_version, caches_fresh
 
 try:
     from supabase import create_client, Client
@@ -11,15 +19,39 @@ except ImportError:
     supabase_installed = False
     Client = object # Dummy class for type hinting
 
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    BrotliMiddleware = None
+
 
 # Load environment variables from .env file FIRST
 load_dotenv()
 
-app = FastAPI(title="NBA Fantasy Intelligence API")
+@asynccontextmanager
+async def lifespan(app):
+    # Name -> PLAYER_ID index used by news ingestion and player filters: build it before serving
+    await executor.run_io(player_index.get_player_index)
+    # Warm every cache before serving, then keep them fresh in the background,
+    # so user requests read loaded snapshots instead of waiting on upstream
+    if config.SCHEDULER_ENABLED:
+        pipeline.register_jobs(scheduler)
+        await scheduler.start(warm_timeout=config.STARTUP_WARM_TIMEOUT_SECONDS)
+    yield
+    event_hub.hub.close()
+    await scheduler.stop()
+    await async_http.close()
+    executor.shutdown()
+
+
+app = FastAPI(title="NBA Fantasy Intelligence API", lifespan=lifespan, default_response_class=FastJSONResponse)
+app.router.route_class = FastJSONRoute
 
 # Include Routers
 app.include_router(news.router, prefix="/news", tags=["News"])
 app.include_router(nba_stats.router, prefix="/nba", tags=["NBA Stats"])
+app.include_router(league.router, prefix="/league", tags=["League"])
+app.include_router(events.router, prefix="/events", tags=["Events"])
 
 # Supabase Client (Optional for now, but kept for future user features like watchlists)
 supabase_url = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
@@ -35,9 +67,47 @@ async def health():
     return {
         "status": "ok",
         "service": "NBA Fantasy Intelligence",
-        "supabase": bool(supabase)
+        "supabase": bool(supabase),
+        "scheduler": scheduler.status(),
+        "caches": pipeline.cache_status(),
+        "nba_stats": nba_stats_client.status(),
+        "events": event_hub.hub.status(),
     }
 
+# HTTP caching: ETags follow the version of the snapshot each route reads, so
+# repeat views get a 304 until the data is refreshed. stale-while-revalidate
+# lets browsers/CDNs serve the old copy while they revalidate in the background.
+stats_cache = nba_stats.league_stats_cache
+game_logs_cache = gamelog_store.game_logs_cache
+
+def _news_version():
+    # The store version only moves when new items arrive, not on every poll
+    return str(news_service.store.version) if news_service.news_cache.version else None
+
+def _league_version():
+    stats = cache_version(stats_cache) or "0"
+    return f"{stats}.{espn_connector.connections.generation}"
+
+cache_rules = [
+    CacheRule("/nba/rankings", max_age=60, stale_while_revalidate=config.LEAGUE_STATS_TTL_MINUTES * 60,
+              version=lambda: cache_version(stats_cache), fresh=lambda: caches_fresh(stats_cache), vary=["Accept"]),
+    CacheRule("/nba/trending", max_age=300, stale_while_revalidate=config.GAME_LOGS_TTL_MINUTES * 60,
+              version=lambda: cache_version(game_logs_cache), fresh=lambda: caches_fresh(game_logs_cache)),
+    CacheRule("/nba/player", max_age=300, stale_while_revalidate=config.GAME_LOGS_TTL_MINUTES * 60,
+              version=lambda: cache_version(game_logs_cache), fresh=lambda: caches_fresh(game_logs_cache)),
+    CacheRule("/news/sources"), # live metrics
+    CacheRule("/news", max_age=30, stale_while_revalidate=int(config.NEWS_REFRESH_MINUTES * 60),
+              version=_news_version, fresh=lambda: caches_fresh(news_service.news_cache)),
+    # League data can come from private-league credentials: browser cache only
+    CacheRule("/league", max_age=60, stale_while_revalidate=int(config.ESPN_ROSTER_REFRESH_MINUTES * 60), private=True,
+              version=_league_version, fresh=lambda: caches_fresh(stats_cache) and not espn_connector.connections.is_due()),
+    CacheRule("/events"), # event streams and their counters
+    CacheRule("/health"),
+]
+
+if config.HTTP_CACHE_ENABLED:
+    app.add_middleware(HTTPCacheMiddleware, rules=cache_rules)
+
 # CORS Configuration
 origins = [
     "http://localhost:3000",
@@ -55,4 +125,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
+
+# Compress large payloads (rankings, matchup and league analysis); small ones aren't worth the CPU
+if BrotliMiddleware is not None:
+    app.add_middleware(BrotliMiddleware, minimum_size=config.COMPRESSION_MIN_BYTES, gzip_fallback=True)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=config.COMPRESSION_MIN_BYTES)
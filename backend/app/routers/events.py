@@ -0,0 +1,71 @@
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from app.services import event_hub, executor
+from app.src.data import player_index
+from app.src.utils.fast_json import FastJSONRoute
+from app.src.utils.team_mapping import normalize_team_abbr
+
+router = APIRouter(route_class=FastJSONRoute)
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+@router.get("/")
+async def stream_events(
+    topics: str = ",".join(event_hub.TOPICS),
+    players: str = None,
+    player_ids: str = None,
+    teams: str = None,
+    last_event_id: Optional[int] = None,
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Server-sent event stream replacing /news and /nba/rankings polling.
+    Events: `news` (one new item, same shape as /news) and `rankings` (the default 9-cat
+    ranking's changed/added/removed rows after a stats refresh, with the snapshot version).
+    topics: comma-separated, news and/or rankings (default both).
+    players (names), player_ids (nba_api PLAYER_IDs) and teams (abbreviations) form a
+    watchlist: only events about those players or teams are sent. No watchlist = everything.
+    Reconnecting clients (EventSource sends Last-Event-ID, or pass ?last_event_id=) get the
+    events they missed; a `resync` event means re-read the REST endpoints instead.
+    """
+    topic_set = set(_split(topics))
+    unknown = topic_set - set(event_hub.TOPICS)
+    if unknown or not topic_set:
+        raise HTTPException(status_code=400, detail=f"topics must be among {', '.join(event_hub.TOPICS)}")
+
+    watched = set()
+    try:
+        watched.update(int(player_id) for player_id in _split(player_ids))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="player_ids must be comma-separated integers")
+    names = _split(players)
+    if names:
+        resolved = await executor.run_io(lambda: player_index.get_player_index().resolve_many(names))
+        unresolved = [name for name, player_id in resolved.items() if player_id is None]
+        if unresolved:
+            raise HTTPException(status_code=400, detail=f"Unknown players: {', '.join(unresolved)}")
+        watched.update(resolved.values())
+
+    hub = event_hub.hub
+    if hub.full:
+        raise HTTPException(status_code=503, detail="Too many open event streams", headers={"Retry-After": "30"})
+
+    subscription = event_hub.Subscription(
+        topics=topic_set,
+        player_ids=watched,
+        teams={normalize_team_abbr(team) for team in _split(teams)},
+    )
+    resume_from = last_event_id if last_event_id is not None else last_event_id_header
+    return StreamingResponse(
+        hub.stream(subscription, last_event_id=resume_from),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx would otherwise hold events back in its buffer
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/status")
+async def get_event_status():
+    """Open event streams and events published so far."""
+    return event_hub.hub.status()
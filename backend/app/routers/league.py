@@ -0,0 +1,89 @@
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException
+from app.routers.nba_stats import league_stats_cache
+from app.services import executor, matchup_service
+from app.src.analysis import roster_analyzer
+from app.src.data import espn_connector
+from app.src.utils import config
+from app.src.utils.fast_json import FastJSONRoute
+
+router = APIRouter(route_class=FastJSONRoute)
+
+def _check_league(league_id):
+    """
+    Only configured leagues are served: they are loaded with the server's ESPN cookies,
+    so any other league_id would read private leagues through the owner's account.
+    """
+    if league_id is None:
+        return
+    if str(league_id) not in config.LEAGUE_IDS and str(league_id) != str(config.LEAGUE_ID):
+        raise HTTPException(status_code=404, detail=f"League {league_id} not found")
+
+def build_league_overview(league_id=None, season=None):
+    league = espn_connector.get_league_snapshot(league_id, season)
+    if league is None:
+        return None
+    try:
+        table = league_stats_cache.get()["table"]
+    except Exception as e:
+        # Composition still works without the Z-score table
+        print(f"Error fetching NBA stats: {e}")
+        table = None
+    return roster_analyzer.analyze_league_rosters(league, table)
+
+@router.get("/overview")
+async def get_league_overview(league_id: Optional[int] = None, season: Optional[int] = None):
+    """
+    Every team's roster composition, likely punts and category strength profile
+    (joined with the Z-score rankings) in one call.
+    """
+    _check_league(league_id)
+    try:
+        overview = await executor.run_io(build_league_overview, league_id, season)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out loading the league")
+    if overview is None:
+        raise HTTPException(status_code=502, detail="Could not connect to the ESPN league")
+    return overview
+
+def build_schedule_outlook(league_id=None, season=None, my_team_id=None, weeks=None):
+    """Season outlook, or only the next `weeks` matchup periods. None if the league can't be loaded."""
+    league = espn_connector.get_league_snapshot(league_id, season)
+    if league is None:
+        return None
+    if weeks is None:
+        return matchup_service.get_season_outlook(league, my_team_id)
+    return {"periods": matchup_service.get_upcoming_periods(league, weeks, my_team_id)}
+
+async def _schedule_response(league_id, season, my_team_id, weeks=None):
+    _check_league(league_id)
+    try:
+        outlook = await executor.run_io(build_schedule_outlook, league_id, season, my_team_id, weeks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out loading the league")
+    if outlook is None:
+        raise HTTPException(status_code=502, detail="Could not connect to the ESPN league")
+    return outlook
+
+@router.get("/schedule/season")
+async def get_season_schedule(league_id: Optional[int] = None, season: Optional[int] = None, my_team_id: Optional[int] = None):
+    """
+    Games per matchup period for every team across the whole season, plus each period's
+    matchup analysis (my_team_id's matchup first when given).
+    """
+    return await _schedule_response(league_id, season, my_team_id)
+
+@router.get("/schedule/upcoming")
+async def get_upcoming_schedule(
+    weeks: int = 1,
+    league_id: Optional[int] = None,
+    season: Optional[int] = None,
+    my_team_id: Optional[int] = None,
+):
+    """Matchup analysis for the current and the following `weeks - 1` matchup periods."""
+    if weeks < 1 or weeks > 26:
+        raise HTTPException(status_code=400, detail="weeks must be between 1 and 26")
+    return await _schedule_response(league_id, season, my_team_id, weeks)
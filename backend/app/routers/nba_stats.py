@@ -1,107 +1,298 @@
-from fastapi import APIRouter, HTTPException
-from nba_api.stats.endpoints import leaguedashplayerstats, playergamelog
-from nba_api.stats.static import players
-import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, HTTPException, Request, Response
+from pydantic import BaseModel
+from nba_api.stats.endpoints import leaguedashplayerstats
+from datetime import timedelta
+from app.services import event_hub, executor
+from app.src.analysis import consistency, trends, zscore_engine
+from app.src.data import gamelog_store, nba_stats_client
+from app.src.utils import columnar, config, disk_cache
+from app.src.utils.fast_json import FastJSONResponse, FastJSONRoute
+from app.src.utils.snapshot_cache import SnapshotCache
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # --- Helper Functions ---
 
-def get_advanced_player_stats():
+LEAGUE_DASH_COLS = ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FTM', 'FTA', 'FT_PCT', 'FG3M', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV']
+
+def fetch_league_dash_stats():
     """
-    Fetches league-wide player stats and calculates Z-scores (Standard Deviations) 
-    for the 9-cat fantasy categories to determine value.
+    Blocking round-trip to stats.nba.com for the league-wide per-game frame.
+    Only the snapshot cache should call this; endpoints read the cached snapshot.
     """
-    try:
-        # Fetch stats for the current season
-        # measure_type='Base' gives us the raw counting stats
-        stats = leaguedashplayerstats.LeagueDashPlayerStats(per_mode_detailed='PerGame', season='2024-25').get_data_frames()[0]
-        
-        # Keep only relevant fantasy columns
-        cols = ['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FTM', 'FTA', 'FT_PCT', 'FG3M', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV']
-        df = stats[cols].copy()
-
-        # Filter: Remove players with very few games or minutes to reduce noise
-        # (Optional: can make this dynamic later)
-        # df = df[df['MIN'] > 15] 
-
-        # --- 9-Cat Z-Score Calculation ---
-        # We calculate how many standard deviations a player is from the average.
-        # This standardizes value across different categories (e.g., 2 blocks is worth more than 2 points).
-        
-        categories = {
-            'PTS': 'PTS',
-            'REB': 'REB',
-            'AST': 'AST',
-            'STL': 'STL',
-            'BLK': 'BLK',
-            'FG3M': 'FG3M',
-            'TOV': 'TOV', # Negative value
-            'FG_PCT': 'FG_PCT',
-            'FT_PCT': 'FT_PCT'
+    # measure_type='Base' gives us the raw counting stats
+    stats = leaguedashplayerstats.LeagueDashPlayerStats(per_mode_detailed='PerGame', season=config.NBA_STATS_SEASON).get_data_frames()[0]
+
+    # Keep only relevant fantasy columns
+    return stats[LEAGUE_DASH_COLS].copy()
+
+def build_league_stats_snapshot():
+    """
+    Loader for the league stats snapshot: one upstream fetch plus one Z-score pass.
+    The array-backed ranking table lets any punt/format be ranked without refetching,
+    and the default 9-cat records are kept so requests don't pay for to_dict().
+    """
+    # Through the disk cache: restarts reuse a recent frame, and an unreachable
+    # stats.nba.com falls back to the last one stored
+    frame = disk_cache.cached_call('nba_stats', f"leaguedash:{config.NBA_STATS_SEASON}", fetch_league_dash_stats)
+    table = zscore_engine.build_ranking_table(frame)
+    order, totals = zscore_engine.rank_players(table)
+    return {
+        "table": table,
+        "records": zscore_engine.to_records(table, order, totals),
+        "rankings": OrderedDict(), # (config, limit) -> records, filled lazily per snapshot
+        "orders": OrderedDict(), # config -> (order, totals), filled lazily per snapshot
+    }
+
+# Process-wide league stats snapshot (TTL + stale-while-revalidate + single-flight)
+league_stats_cache = SnapshotCache(
+    build_league_stats_snapshot,
+    ttl=timedelta(minutes=config.LEAGUE_STATS_TTL_MINUTES),
+    name="league_stats",
+)
+
+def publish_ranking_changes(previous, snapshot):
+    """
+    Pushes how the default 9-cat ranking moved between two snapshots to /events
+    subscribers. Each subscriber only gets the rows of its watched players and teams.
+    """
+    if previous is None:
+        return
+    diff = zscore_engine.rank_changes(previous["records"], snapshot["records"])
+    rows = [row for part in diff.values() for row in part]
+    if not rows:
+        return
+    data = {"version": league_stats_cache.version, **diff}
+
+    def select(subscription):
+        if not subscription.filtered:
+            return data
+        picked = {
+            part: [row for row in part_rows if subscription.matches(row['PLAYER_ID'], row['TEAM_ABBREVIATION'])]
+            for part, part_rows in diff.items()
         }
+        return {"version": data["version"], **picked} if any(picked.values()) else None
+
+    event_hub.hub.publish(
+        "rankings", data,
+        players={row['PLAYER_ID'] for row in rows},
+        teams={row['TEAM_ABBREVIATION'] for row in rows},
+        select=select,
+    )
 
-        z_score_cols = []
-        
-        for cat_name, col_name in categories.items():
-            mean = df[col_name].mean()
-            std = df[col_name].std()
-            
-            z_col = f'{cat_name}_Z'
-            
-            if cat_name == 'TOV':
-                # For turnovers, fewer is better, so we invert the Z-score
-                df[z_col] = (mean - df[col_name]) / std
-            else:
-                df[z_col] = (df[col_name] - mean) / std
-                
-            z_score_cols.append(z_col)
-
-        # Total Value (Sum of Z-scores)
-        df['TOTAL_Z'] = df[z_score_cols].sum(axis=1)
-        
-        # Rank by Total Z-Score
-        df = df.sort_values(by='TOTAL_Z', ascending=False).reset_index(drop=True)
-        df['RANK'] = df.index + 1
-
-        return df.to_dict(orient='records')
+league_stats_cache.add_listener(publish_ranking_changes)
 
+def get_advanced_player_stats():
+    """
+    Returns league-wide players ranked by 9-cat Z-score, served from the cached snapshot.
+    The first call (or the first after a failed load) blocks on the upstream fetch.
+    """
+    try:
+        return league_stats_cache.get()["records"]
     except Exception as e:
         print(f"Error fetching NBA stats: {e}")
         return []
 
-def get_player_consistency(player_id, last_n_games=10):
+# Per-snapshot memos are keyed by client-chosen weights/punts/limits: keep only the most recent
+_RANKING_MEMO_MAX = 64
+_memo_lock = threading.Lock()
+
+def _memo_get(memo, key):
+    with _memo_lock:
+        value = memo.get(key)
+        if value is not None:
+            memo.move_to_end(key)
+        return value
+
+def _memo_put(memo, key, value):
+    with _memo_lock:
+        memo[key] = value
+        while len(memo) > _RANKING_MEMO_MAX:
+            memo.popitem(last=False)
+
+def get_custom_rankings(ranking_config, limit=200):
     """
-    Analyzes a specific player's variance over the last N games.
+    Ranks the cached snapshot under a custom config (punts, format, weights).
+    Recent results are memoized per snapshot, so repeat builds are a dict lookup.
     """
-    try:
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2024-25').get_data_frames()[0]
-        recent_games = gamelog.head(last_n_games)
-        
-        # Calculate consistency (Standard Deviation of their fantasy points or key stats)
-        # Lower std dev = more consistent
-        
-        stats_variance = {
-            'PTS_VAR': recent_games['PTS'].var(),
-            'PTS_STD': recent_games['PTS'].std(),
-            'MIN_AVG': recent_games['MIN'].mean()
-        }
-        
-        return stats_variance
-    except Exception as e:
-        return {}
+    snapshot = league_stats_cache.get()
+    key = (ranking_config, limit)
+    records = _memo_get(snapshot["rankings"], key)
+    if records is None:
+        order, totals = zscore_engine.rank_many(snapshot["table"], [ranking_config])[0]
+        records = zscore_engine.to_records(snapshot["table"], order, totals, limit=limit, pct_mode=ranking_config[3])
+        _memo_put(snapshot["rankings"], key, records)
+    return records
+
+def get_ranking_order(ranking_config):
+    """(order, totals) for a config, memoized per snapshot. Returns (table, order, totals)."""
+    snapshot = league_stats_cache.get()
+    ranked = _memo_get(snapshot["orders"], ranking_config)
+    if ranked is None:
+        ranked = zscore_engine.rank_many(snapshot["table"], [ranking_config])[0]
+        _memo_put(snapshot["orders"], ranking_config, ranked)
+    return (snapshot["table"],) + tuple(ranked)
+
+def get_ranking_page(ranking_config, sort=None, descending=True, offset=0, limit=200, fields=None):
+    """
+    One page of a ranking as columns: only the sort key is computed league-wide,
+    and only the requested fields of the returned rows are materialized.
+    """
+    table, order, totals = get_ranking_order(ranking_config)
+    rows = zscore_engine.select_rows(table, order, totals, sort, descending, offset, limit)
+    return zscore_engine.to_columns(table, rows, order, totals, fields, pct_mode=ranking_config[3]), len(order)
+
+def parse_weights(weights):
+    """Parses 'STL:1.5,BLK:2' into {'STL': 1.5, 'BLK': 2.0}."""
+    parsed = {}
+    for pair in filter(None, (weights or "").split(',')):
+        cat, _, value = pair.partition(':')
+        try:
+            parsed[cat.strip()] = float(value)
+        except ValueError:
+            raise ValueError(f"Invalid weight '{pair}'. Use CAT:VALUE, e.g. STL:1.5")
+    return parsed
+
+def analyze_player_consistency(player_id):
+    """
+    Builds volatility stats for a player's last 20 games from the local game-log
+    warehouse. Blocks only on a cold warehouse load, so run it through the executor.
+    """
+    # Read game logs (newest first) from the league-wide store
+    gamelog = gamelog_store.get_player_games(player_id)
+    
+    if gamelog.empty:
+         return {"message": "No games played"}
+
+    return consistency.summarize_consistency(gamelog, last_n=20)[int(player_id)]
+
+def analyze_consistency_batch(player_ids, last_n=20):
+    """Volatility stats for many players (None = every player) in one grouped pass."""
+    gamelogs = gamelog_store.game_logs_cache.get()
+    results = consistency.summarize_consistency(gamelogs, player_ids=player_ids, last_n=last_n)
+    missing = [pid for pid in player_ids if pid not in results] if player_ids is not None else []
+    return {
+        "games_window": last_n,
+        "players": results,
+        "missing": missing, # No games played
+    }
+
+def _raise_upstream_unavailable():
+    # Nothing cached and stats.nba.com is being short-circuited: tell clients when to retry
+    if nba_stats_client.breaker.state == "open":
+        retry_after = int(nba_stats_client.breaker.retry_after()) + 1
+        raise HTTPException(
+            status_code=503,
+            detail="NBA stats are temporarily unavailable",
+            headers={"Retry-After": str(retry_after)},
+        )
 
 # --- Endpoints ---
 
 @router.get("/rankings")
-async def get_player_rankings():
-    """Returns all players ranked by 9-cat Z-score value."""
-    stats = get_advanced_player_stats()
+async def get_player_rankings(
+    request: Request,
+    scoring: str = '9cat',
+    punt: str = None,
+    weights: str = None,
+    pct_mode: str = 'raw',
+    limit: int = 200,
+    offset: int = 0,
+    sort: Optional[str] = None,
+    order: Optional[Literal['asc', 'desc']] = None,
+    fields: Optional[str] = None,
+    format: Optional[str] = None,
+):
+    """
+    Returns players ranked by Z-score value (9-cat by default).
+    scoring: 9cat | 8cat | points. punt: comma-separated categories to drop (e.g. FT_PCT,TOV).
+    weights: comma-separated CAT:VALUE overrides (e.g. STL:1.5,BLK:2).
+    pct_mode: raw | impact (FG%/FT% weighted by attempts).
+    sort: any output column (e.g. STL_Z), highest first unless order=asc (RANK and text columns default to asc).
+    offset/limit: page of the sorted ranking. fields: comma-separated columns to return.
+    format: records (default) | columns | msgpack | arrow, or picked from the Accept header.
+    """
+    try:
+        ranking_config = zscore_engine.normalize_config(
+            scoring,
+            punt=[cat.strip() for cat in punt.split(',') if cat.strip()] if punt else (),
+            weights=parse_weights(weights),
+            pct_mode=pct_mode,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        output_format = columnar.negotiate_format(format, request.headers.get("accept"))
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    if limit < 1 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be positive and offset non-negative")
+
+    if output_format != 'records' or sort or offset or fields:
+        return await _ranking_page_response(ranking_config, output_format, sort, order, offset, limit, fields)
+
+    is_default = ranking_config == zscore_engine.normalize_config()
+
+    def load_rankings():
+        if is_default:
+            return get_advanced_player_stats()[:limit]
+        try:
+            return get_custom_rankings(ranking_config, limit)
+        except Exception as e:
+            print(f"Error fetching NBA stats: {e}")
+            return []
+
+    if league_stats_cache.peek() is not None:
+        # Snapshot is warm: get() never blocks (stale data triggers a background refresh)
+        stats = load_rankings()
+    else:
+        try:
+            stats = await executor.run_io(load_rankings)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Timed out fetching NBA stats")
     if not stats:
+        _raise_upstream_unavailable()
+        raise HTTPException(status_code=500, detail="Failed to fetch NBA stats")
+    return stats # Top 200 by default to keep payload light
+
+async def _ranking_page_response(ranking_config, output_format, sort, order, offset, limit, fields):
+    field_list = [f.strip() for f in fields.split(',') if f.strip()] if fields else None
+    descending = order == 'desc' if order else sort not in (None, 'RANK', 'PLAYER_NAME', 'TEAM_ABBREVIATION')
+
+    def load_page():
+        return get_ranking_page(ranking_config, sort, descending, offset, limit, field_list)
+
+    try:
+        if league_stats_cache.peek() is not None:
+            columns, total = load_page()
+        else:
+            columns, total = await executor.run_io(load_page)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching NBA stats")
+    except Exception as e:
+        print(f"Error fetching NBA stats: {e}")
+        _raise_upstream_unavailable()
         raise HTTPException(status_code=500, detail="Failed to fetch NBA stats")
-    return stats[:200] # Return top 200 for now to keep payload light
+
+    meta = {"total": total, "offset": offset, "limit": limit}
+    headers = {"X-Total-Count": str(total)}
+    if output_format == 'records':
+        names = list(columns)
+        return FastJSONResponse([dict(zip(names, values)) for values in zip(*columns.values())], headers=headers)
+    if output_format == 'columns':
+        return FastJSONResponse({**meta, "columns": list(columns), "data": columns}, headers=headers)
+    if output_format == 'msgpack':
+        content = columnar.encode_msgpack(columns, meta)
+    else:
+        content = columnar.encode_arrow(columns, meta)
+    return Response(content, media_type=columnar.MEDIA_TYPES[output_format], headers=headers)
 
 @router.get("/player/{player_id}/consistency")
 async def get_player_consistency_stats(player_id: int):
@@ -109,91 +300,58 @@ async def get_player_consistency_stats(player_id: int):
     Returns consistency metrics (Standard Deviation) for a player's last 20 games.
     """
     try:
-        # Fetch game logs
-        gamelog = playergamelog.PlayerGameLog(player_id=player_id, season='2024-25').get_data_frames()[0]
-        
-        if gamelog.empty:
-             return {"message": "No games played"}
-             
-        recent = gamelog.head(20) # Analyze last 20 games for relevant trend
-        
-        # Calculate Standard Deviation (Volatility) for 9-cat and normalize it
-        # using Coefficient of Variation (CV = std / mean) to give a rating.
-        stats_data = {}
-        
-        categories = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'FG_PCT', 'FT_PCT', 'TOV']
-        
-        for cat in categories:
-            val_mean = recent[cat].mean()
-            val_std = recent[cat].std()
-            
-            # Avoid division by zero
-            cv = (val_std / val_mean) if val_mean > 0.1 else 0.0
-            
-            # Rating Logic (CV thresholds)
-            # These thresholds might need tuning
-            rating = "Stable"
-            color = "blue"
-            
-            if cv < 0.15:
-                rating = "Elite"
-                color = "green"
-            elif cv < 0.30:
-                rating = "Stable"
-                color = "blue"
-            elif cv < 0.50:
-                rating = "Volatile"
-                color = "yellow"
-            else:
-                rating = "Wild"
-                color = "red"
-                
-            # Special case for percentages with low volume
-            if cat in ['FG_PCT', 'FT_PCT'] and val_mean < 0.1:
-                rating = "Low Vol"
-                color = "gray"
-
-            stats_data[cat] = {
-                "std": round(val_std, 2),
-                "mean": round(val_mean, 1),
-                "cv": round(cv, 2),
-                "rating": rating,
-                "color": color
-            }
-
-        # Calculate a "Consistency Grade" (A-F) based on PTS volatility mainly,
-        # but could ideally be an average of all CVs.
-        avg_pts = recent['PTS'].mean()
-        cv_pts = stats_data['PTS']['cv']
-        
-        grade = "B"
-        if cv_pts < 0.15: grade = "A+" 
-        elif cv_pts < 0.25: grade = "A"
-        elif cv_pts < 0.35: grade = "B"
-        elif cv_pts < 0.50: grade = "C"
-        else: grade = "F"
-
-        return {
-            "player_id": player_id,
-            "games_analyzed": len(recent),
-            "consistency_grade": grade,
-            "volatility_stats": stats_data, # New detailed structure
-            "recent_averages": {
-                "PTS": round(avg_pts, 1),
-                "MIN": round(recent['MIN'].mean(), 1)
-            }
-        }
-            
+        return await executor.run_io(analyze_player_consistency, player_id)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out fetching game logs")
+    except Exception as e:
+        print(f"Error fetching consistency: {e}")
+        _raise_upstream_unavailable()
+        raise HTTPException(status_code=500, detail="Failed to analyze consistency")
+
+class ConsistencyBatchRequest(BaseModel):
+    player_ids: Union[List[int], Literal["all"]] = "all"
+    last_n: int = 20
+
+@router.post("/consistency/batch")
+async def get_consistency_batch(request: ConsistencyBatchRequest):
+    """
+    Consistency metrics for many players in one request (e.g. a whole scouting table).
+    Accepts a list of player IDs or "all".
+    """
+    if request.last_n < 2:
+        raise HTTPException(status_code=400, detail="last_n must be at least 2")
+    player_ids = None if request.player_ids == "all" else request.player_ids
+
+    try:
+        # Even with the warehouse warm, the grouped pass over the season is too heavy for the event loop
+        return await executor.run_io(analyze_consistency_batch, player_ids, request.last_n)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out loading game logs")
     except Exception as e:
         print(f"Error fetching consistency: {e}")
+        _raise_upstream_unavailable()
         raise HTTPException(status_code=500, detail="Failed to analyze consistency")
 
 @router.get("/trending")
-async def get_trending_players():
+async def get_trending_players(days: int = 7, sort_by: str = 'MIN', limit: int = 25, min_games: int = 2):
     """
-    Identifies players with significant changes in minutes or usage 
-    over the last 7 days compared to season average.
+    Identifies players with significant changes in minutes, usage or category output
+    (including FG_PCT/FT_PCT) over the last N days (7, 14 or 30) compared to their season average.
     """
-    # Placeholder logic for now - implementation requires fetching gamelogs for all active players
-    # which is heavy. We will optimize this in step 2.
-    return {"message": "Trending player analysis coming soon"}
+    if days not in trends.WINDOWS:
+        raise HTTPException(status_code=400, detail=f"days must be one of {list(trends.WINDOWS)}")
+
+    def load_trending():
+        return trends.get_trending(trends.get_trend_index(), days=days, sort_by=sort_by.upper(), limit=limit, min_games=min_games)
+
+    try:
+        # After a game-log refresh, the new rows are read from SQLite and folded into the index: keep it off the loop
+        return await executor.run_io(load_trending)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Timed out loading game logs")
+    except Exception as e:
+        print(f"Error computing trends: {e}")
+        _raise_upstream_unavailable()
+        raise HTTPException(status_code=500, detail="Failed to compute trending players")
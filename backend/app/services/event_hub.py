@@ -0,0 +1,204 @@
+import asyncio
+import itertools
+import threading
+from collections import deque
+from app.src.utils import config
+from app.src.utils.fast_json import dumps
+
+TOPICS = ("news", "rankings")
+
+# Sent as-is: a comment line keeps proxies from closing idle streams; a resync event
+# tells the client it missed events and should re-read /news and /nba/rankings
+KEEPALIVE = b": keepalive\n\n"
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+class Event:
+    """
+    One published change. players/teams say what it is about (matched against
+    subscription filters). select(subscription), when given, returns the payload for
+    that subscriber, or None to skip it: events covering many players (a ranking diff)
+    are cut down to each watchlist instead of being sent whole.
+    """
+
+    __slots__ = ('id', 'topic', 'data', 'players', 'teams', 'select')
+
+    def __init__(self, event_id, topic, data, players=(), teams=(), select=None):
+        self.id = event_id
+        self.topic = topic
+        self.data = data
+        self.players = frozenset(players)
+        self.teams = frozenset(teams)
+        self.select = select
+
+    def frame(self, data):
+        return b"id: %d\nevent: %s\ndata: %s\n\n" % (self.id, self.topic.encode("ascii"), dumps(data))
+
+
+class Subscription:
+    """A connected client: its topics, watchlist (PLAYER_IDs and team abbreviations) and bounded queue."""
+
+    def __init__(self, topics=TOPICS, player_ids=(), teams=(), queue_size=None):
+        self.topics = frozenset(topics)
+        self.player_ids = frozenset(player_ids)
+        self.teams = frozenset(teams)
+        self.queue = asyncio.Queue(queue_size or config.EVENTS_QUEUE_SIZE)
+        self.last_id = 0 # newest event id queued, so replayed events aren't sent twice
+
+    @property
+    def filtered(self):
+        return bool(self.player_ids or self.teams)
+
+    @property
+    def filter_key(self):
+        """Subscribers with equal filters receive identical frames."""
+        return (self.player_ids, self.teams)
+
+    def matches(self, player_id=None, team=None):
+        """True for unfiltered subscriptions, else when the player or team is on the watchlist."""
+        return not self.filtered or player_id in self.player_ids or team in self.teams
+
+    def wants(self, event):
+        if event.topic not in self.topics:
+            return False
+        return not self.filtered or bool(self.player_ids & event.players or self.teams & event.teams)
+
+
+class EventHub:
+    """
+    Fans published events out to every subscribed client.
+
+    publish() may be called from any thread (refresh jobs run on the I/O pool); delivery
+    happens on the event loop. Each event is serialized once per distinct filter, not
+    once per client, so thousands of open dashboards cost one upstream refresh plus a
+    queue put each. A client whose queue fills up is sent a resync instead of stalling
+    the others. The last history_size events are kept for Last-Event-ID replay.
+    """
+
+    def __init__(self, history_size=500, max_subscribers=5000):
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        self._history = deque(maxlen=history_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._loop = None
+        self.published = 0
+        self.resyncs = 0
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    @property
+    def full(self):
+        return len(self._subscribers) >= self.max_subscribers
+
+    # --- Publishing ---
+
+    def publish(self, topic, data, players=(), teams=(), select=None):
+        """Numbers and records an event, then delivers it on the event loop. Thread-safe."""
+        with self._lock:
+            event = Event(next(self._ids), topic, data, players, teams, select)
+            self._history.append(event)
+            self.published += 1
+
+        loop = self._loop
+        if loop is None or loop.is_closed() or not self._subscribers:
+            return event
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(event)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, event)
+        return event
+
+    def _frame(self, event, subscription, frames):
+        # frames: filter_key -> this event's encoded frame (None: nothing for that filter)
+        if event.topic not in subscription.topics:
+            return None
+        if event.select is None:
+            if not subscription.wants(event):
+                return None
+            key = None
+        else:
+            key = subscription.filter_key if subscription.filtered else None
+        if key not in frames:
+            data = event.data if event.select is None else event.select(subscription)
+            frames[key] = event.frame(data) if data is not None else None
+        return frames[key]
+
+    def _dispatch(self, event):
+        frames = {}
+        for subscription in list(self._subscribers):
+            if event.id <= subscription.last_id:
+                continue
+            frame = self._frame(event, subscription, frames)
+            if frame is not None:
+                self._put(subscription, frame)
+                subscription.last_id = event.id
+
+    def _put(self, subscription, frame):
+        try:
+            subscription.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and have it re-read the REST endpoints
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(RESYNC)
+            self.resyncs += 1
+
+    # --- Subscribing ---
+
+    def _replay(self, subscription, last_event_id):
+        with self._lock:
+            history = list(self._history)
+            newest = history[-1].id if history else 0
+        subscription.last_id = newest
+        if last_event_id is None or last_event_id == newest:
+            return []
+        if last_event_id > newest or last_event_id < history[0].id - 1:
+            # The id comes from before a restart, or the missed events are no longer buffered
+            return [RESYNC]
+        replayed = (self._frame(event, subscription, {}) for event in history if event.id > last_event_id)
+        return [frame for frame in replayed if frame is not None]
+
+    async def stream(self, subscription, last_event_id=None, keepalive=None):
+        """
+        Yields SSE frames for a subscription until the hub closes or the client goes
+        away: first the events missed since last_event_id, then new ones as they come.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._subscribers.add(subscription)
+        try:
+            for frame in self._replay(subscription, last_event_id):
+                yield frame
+            while True:
+                try:
+                    frame = await asyncio.wait_for(subscription.queue.get(), keepalive or config.EVENTS_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    frame = KEEPALIVE
+                if frame is None: # hub closed
+                    return
+                yield frame
+        finally:
+            self._subscribers.discard(subscription)
+
+    def close(self):
+        """Ends every open stream (on application shutdown)."""
+        for subscription in list(self._subscribers):
+            while not subscription.queue.empty():
+                subscription.queue.get_nowait()
+            subscription.queue.put_nowait(None)
+
+    def status(self):
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+            "last_event_id": self._history[-1].id if self._history else 0,
+        }
+
+
+hub = EventHub(config.EVENTS_HISTORY_SIZE, config.EVENTS_MAX_SUBSCRIBERS)
@@ -0,0 +1,83 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from app.src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Lazily created so importing a router never spawns workers
+_io_pool = None
+_cpu_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_io_pool():
+    """Bounded thread pool for blocking network I/O (nba_api, requests, espn_api)."""
+    global _io_pool
+    with _pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=config.IO_POOL_SIZE, thread_name_prefix="upstream-io")
+        return _io_pool
+
+
+def get_cpu_pool():
+    """
+    Optional process pool for CPU-heavy parsing / pandas work.
+    Returns None when CPU_POOL_SIZE is 0, in which case CPU work shares the I/O threads.
+    """
+    global _cpu_pool
+    if config.CPU_POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _cpu_pool is None:
+            _cpu_pool = ProcessPoolExecutor(max_workers=config.CPU_POOL_SIZE)
+        return _cpu_pool
+
+
+async def _run_in_pool(pool, func, args, kwargs, timeout):
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs)
+    future = loop.run_in_executor(pool, call)
+    # Note: on timeout the caller gets asyncio.TimeoutError, but a thread that is
+    # already running keeps going until the upstream call returns.
+    return await asyncio.wait_for(future, timeout=timeout or config.UPSTREAM_TIMEOUT_SECONDS)
+
+
+async def run_io(func, *args, timeout=None, **kwargs):
+    """Runs a blocking network call on the I/O pool without stalling the event loop."""
+    return await _run_in_pool(get_io_pool(), func, args, kwargs, timeout)
+
+
+async def run_cpu(func, *args, timeout=None, **kwargs):
+    """
+    Runs CPU-bound work (HTML parsing, DataFrame crunching) off the event loop.
+    With a process pool, func and its arguments must be picklable (module-level functions).
+    """
+    pool = get_cpu_pool() or get_io_pool()
+    return await _run_in_pool(pool, func, args, kwargs, timeout)
+
+
+def call_cpu(func, *args, **kwargs):
+    """
+    Synchronous counterpart of run_cpu for code already running on a worker thread
+    (e.g. snapshot loaders): uses the process pool when configured, else runs inline.
+    """
+    pool = get_cpu_pool()
+    if pool is None:
+        return func(*args, **kwargs)
+    return pool.submit(func, *args, **kwargs).result(timeout=config.UPSTREAM_TIMEOUT_SECONDS)
+
+
+def shutdown():
+    """Releases pool workers on application shutdown."""
+    global _io_pool, _cpu_pool
+    with _pool_lock:
+        if _io_pool is not None:
+            _io_pool.shutdown(wait=False, cancel_futures=True)
+            _io_pool = None
+        if _cpu_pool is not None:
+            _cpu_pool.shutdown(wait=False, cancel_futures=True)
+            _cpu_pool = None
+    logger.info("Executor pools shut down")
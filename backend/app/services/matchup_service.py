@@ -1,23 +1,132 @@
 import pandas as pd
 import datetime
-from app.src.data import schedule_engine, matchup_utils
+import threading
+from collections import OrderedDict
+import numpy as np
+from app.src.data import league_model, matchup_calendar, matchup_utils
 
-def get_matchup_analysis(league, matchup_period, start_date, end_date, my_team_id=None):
+# --- Season Table ---
+
+class SeasonTable:
     """
-    Computes schedule analysis for a specific matchup period.
-    Ported from schedule_view.py logic to be API-ready.
+    Games per day for every fantasy team across the whole matchup calendar, plus
+    per-period totals, computed in one pass: a (fantasy team x NBA team) roster weight
+    matrix times the season game matrix, with period totals taken from a cumulative sum.
+    """
+
+    def __init__(self, team_ids, periods, span_start, daily):
+        self.team_ids = team_ids
+        self.team_row = {team_id: i for i, team_id in enumerate(team_ids)}
+        self.periods = periods # {period id: (start_date, end_date)}
+        self.span_start = span_start
+        self.daily = daily # (fantasy teams x calendar days)
+
+        cumulative = np.zeros((daily.shape[0], daily.shape[1] + 1), dtype=np.int64)
+        np.cumsum(daily, axis=1, out=cumulative[:, 1:])
+        starts = np.array([(start - span_start).days for start, _ in periods.values()], dtype=np.int64)
+        stops = np.array([(end - span_start).days + 1 for _, end in periods.values()], dtype=np.int64)
+        self.period_ids = list(periods)
+        self.totals = cumulative[:, stops] - cumulative[:, starts] # (fantasy teams x periods)
+
+        # Formatted outlooks keyed by my_team_id (None or one of team_ids, see get_season_outlook)
+        self.outlooks = {}
+
+    def covers(self, start_date, end_date):
+        return start_date >= self.span_start and (end_date - self.span_start).days < self.daily.shape[1]
+
+    def daily_counts(self, team_id, start_date, end_date):
+        start = (start_date - self.span_start).days
+        return self.daily[self.team_row[team_id], start:(end_date - self.span_start).days + 1]
+
+
+def build_season_table(snapshot, schedule):
+    index = snapshot.schedule
+    span_start = min(start for start, _ in schedule.values())
+    span_end = max(end for _, end in schedule.values())
+
+    weights = np.vstack([snapshot.roster_weights(team) for team in snapshot.teams]) if snapshot.teams \
+        else np.zeros((0, len(index.team_keys)), dtype=np.int64)
+    daily = index.daily_matrix(weights, span_start, span_end)
+    return SeasonTable([team.team_id for team in snapshot.teams], schedule, span_start, daily)
+
+
+_SEASON_TABLES_MAX = 16
+_season_tables = OrderedDict()
+_season_tables_lock = threading.Lock()
+
+
+def get_season_table(league, season_year=None):
     """
+    Season table for a league (or LeagueSnapshot), cached per (league, season, roster
+    version): roster moves produce a new table, everything else reads the precomputed one.
+    """
+    snapshot = league_model.get_snapshot(league)
+    season_year = season_year or snapshot.year or 2026
+    key = (snapshot.league_id, season_year, snapshot.roster_version)
+    with _season_tables_lock:
+        table = _season_tables.get(key)
+        if table is not None:
+            _season_tables.move_to_end(key)
+            return table
+
+    table = build_season_table(snapshot, matchup_calendar.get_matchup_schedule(season_year))
+    with _season_tables_lock:
+        _season_tables[key] = table
+        while len(_season_tables) > _SEASON_TABLES_MAX:
+            _season_tables.popitem(last=False)
+    return table
+
+
+# --- Matchup Analysis ---
+
+def _format_matchup(home_team, away_team, home_daily, away_daily, my_team_id=None):
+    home_total = int(home_daily.sum())
+    away_total = int(away_daily.sum())
+
+    diff = home_total - away_total
+
+    # Advantage calculation
+    advantage_message = "Even"
+    if diff > 0:
+        advantage_message = f"{home_team.team_name} +{diff}"
+    elif diff < 0:
+        advantage_message = f"{away_team.team_name} +{abs(diff)}"
+
+    is_my_matchup = False
+    if my_team_id:
+        is_my_matchup = (home_team.team_id == my_team_id or away_team.team_id == my_team_id)
+
+    return {
+        "home_team": {
+            "id": home_team.team_id,
+            "name": home_team.team_name,
+            "total_games": home_total,
+            "daily_counts": home_daily.tolist()
+        },
+        "away_team": {
+            "id": away_team.team_id,
+            "name": away_team.team_name,
+            "total_games": away_total,
+            "daily_counts": away_daily.tolist()
+        },
+        "diff": diff,
+        "advantage_message": advantage_message,
+        "is_my_matchup": is_my_matchup
+    }
+
+
+def _analyze_period(snapshot, matchup_period, start_date, end_date, daily_for, my_team_id=None):
     days_in_range = []
     curr = start_date
     while curr <= end_date:
         days_in_range.append(curr)
         curr += datetime.timedelta(days=1)
-        
+
     day_headers = [d.strftime('%a') for d in days_in_range]
     day_dates = [d.isoformat() for d in days_in_range]
-    
-    matchup_pairs = matchup_utils.get_matchups_from_team_schedules(league, matchup_period)
-    
+
+    matchup_pairs = matchup_utils.get_matchup_pairs(snapshot, matchup_period)
+
     if not matchup_pairs:
         return None
 
@@ -25,43 +134,11 @@ def get_matchup_analysis(league, matchup_period, start_date, end_date, my_team_i
     if my_team_id:
         matchup_pairs.sort(key=lambda pair: (pair[0].team_id == my_team_id or pair[1].team_id == my_team_id), reverse=True)
 
-    results = []
-    
-    for home_team, away_team in matchup_pairs:
-        home_total, home_daily = schedule_engine.count_games_in_range(home_team.roster, start_date, end_date)
-        away_total, away_daily = schedule_engine.count_games_in_range(away_team.roster, start_date, end_date)
-        
-        diff = home_total - away_total
-        
-        # Advantage calculation
-        advantage_message = "Even"
-        if diff > 0:
-            advantage_message = f"{home_team.team_name} +{diff}"
-        elif diff < 0:
-            advantage_message = f"{away_team.team_name} +{abs(diff)}"
-            
-        is_my_matchup = False
-        if my_team_id:
-            is_my_matchup = (home_team.team_id == my_team_id or away_team.team_id == my_team_id)
-
-        results.append({
-            "home_team": {
-                "id": home_team.team_id,
-                "name": home_team.team_name,
-                "total_games": home_total,
-                "daily_counts": [home_daily.get(d, 0) for d in days_in_range]
-            },
-            "away_team": {
-                "id": away_team.team_id,
-                "name": away_team.team_name,
-                "total_games": away_total,
-                "daily_counts": [away_daily.get(d, 0) for d in days_in_range]
-            },
-            "diff": diff,
-            "advantage_message": advantage_message,
-            "is_my_matchup": is_my_matchup
-        })
-        
+    results = [
+        _format_matchup(home_team, away_team, daily_for(home_team), daily_for(away_team), my_team_id)
+        for home_team, away_team in matchup_pairs
+    ]
+
     return {
         "period": matchup_period,
         "start_date": start_date.isoformat(),
@@ -70,3 +147,72 @@ def get_matchup_analysis(league, matchup_period, start_date, end_date, my_team_i
         "day_dates": day_dates,
         "matchups": results
     }
+
+
+def get_matchup_analysis(league, matchup_period, start_date, end_date, my_team_id=None):
+    """
+    Computes schedule analysis for a specific matchup period.
+    Ported from schedule_view.py logic to be API-ready.
+    Accepts a loaded League or its LeagueSnapshot.
+    """
+    snapshot = league_model.get_snapshot(league)
+    table = get_season_table(snapshot)
+    if table.covers(start_date, end_date):
+        # Slice of the precomputed season table
+        daily_for = lambda team: table.daily_counts(team.team_id, start_date, end_date)
+    else:
+        # Custom range outside the matchup calendar: straight from the game matrix
+        daily_for = lambda team: snapshot.schedule.daily_matrix(snapshot.roster_weights(team), start_date, end_date)[0]
+
+    return _analyze_period(snapshot, matchup_period, start_date, end_date, daily_for, my_team_id)
+
+
+def get_season_outlook(league, my_team_id=None, season_year=None):
+    """
+    Schedule analysis for every matchup period of the season, read from the season
+    table. Returns the per-period analyses (same shape as get_matchup_analysis)
+    and each team's games per period. Raises ValueError for an unknown my_team_id.
+    """
+    snapshot = league_model.get_snapshot(league)
+    table = get_season_table(snapshot, season_year)
+    if my_team_id is not None and my_team_id not in table.team_row:
+        # Also keeps table.outlooks bounded by the league's team count
+        raise ValueError(f"Team {my_team_id} is not in this league")
+    cached = table.outlooks.get(my_team_id)
+    if cached is not None:
+        return cached
+
+    periods = []
+    for period_id, (start_date, end_date) in table.periods.items():
+        analysis = _analyze_period(
+            snapshot, period_id, start_date, end_date,
+            lambda team: table.daily_counts(team.team_id, start_date, end_date),
+            my_team_id,
+        )
+        if analysis:
+            periods.append(analysis)
+
+    names = {team.team_id: team.team_name for team in snapshot.teams}
+    outlook = {
+        "period_ids": table.period_ids,
+        "periods": periods,
+        "teams": [
+            {
+                "id": team_id,
+                "name": names.get(team_id),
+                "period_totals": table.totals[row].tolist(),
+                "season_total": int(table.totals[row].sum()),
+            }
+            for row, team_id in enumerate(table.team_ids)
+        ],
+    }
+    table.outlooks[my_team_id] = outlook
+    return outlook
+
+
+def get_upcoming_periods(league, weeks=1, my_team_id=None, as_of=None, season_year=None):
+    """The current and following `weeks - 1` matchup periods from the season outlook."""
+    outlook = get_season_outlook(league, my_team_id, season_year)
+    table = get_season_table(league, season_year)
+    current = matchup_calendar.get_current_matchup_period_id(table.periods, as_of)
+    return [p for p in outlook["periods"] if current <= p["period"] < current + weeks]
@@ -0,0 +1,443 @@
+import bisect
+import datetime
+import hashlib
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict, defaultdict
+import numpy as np
+from app.services import event_hub, executor
+from app.src.data import news_sources, player_index
+from app.src.utils import async_http, config, disk_cache
+from app.src.utils.player_names import normalize_player_name
+from app.src.utils.snapshot_cache import SnapshotCache
+from app.src.utils.team_mapping import normalize_team_abbr
+
+logger = logging.getLogger(__name__)
+
+
+def _item_time(item, ingested_at):
+    """Published time when the source gives one, else when we first saw the item (UTC)."""
+    if item.get("published"):
+        try:
+            published = datetime.datetime.fromisoformat(item["published"])
+            if published.tzinfo is None:
+                published = published.replace(tzinfo=datetime.timezone.utc)
+            return published
+        except ValueError:
+            pass
+    return ingested_at
+
+
+# --- Duplicate Detection ---
+
+_WORDS = re.compile(r"[a-z0-9]+")
+# MinHash signature length, split into LSH bands of MINHASH_ROWS rows: two items whose
+# shingle sets have Jaccard similarity >= 0.8 share at least one band with ~99.9% probability
+MINHASH_SIZE = 64
+MINHASH_ROWS = 4
+NEAR_DUPLICATE_SIMILARITY = 0.8
+_MINHASH_RNG = np.random.default_rng(20240101) # fixed: signatures must be comparable across refreshes
+_MINHASH_MASKS = _MINHASH_RNG.integers(0, 2 ** 63, MINHASH_SIZE, dtype=np.uint64)
+_MINHASH_MULTIPLIERS = _MINHASH_RNG.integers(0, 2 ** 63, MINHASH_SIZE, dtype=np.uint64) | np.uint64(1)
+
+
+def _tokens(item):
+    # Compare story bodies: sources rewrite headlines but often syndicate the same report
+    report = _WORDS.findall((item.get("report") or "").lower())
+    if len(report) >= 8:
+        return report
+    return _WORDS.findall(f"{item.get('headline') or ''} {item.get('report') or ''}".lower())
+
+
+def _digest(tokens):
+    return hashlib.sha1(" ".join(tokens).encode("utf-8")).hexdigest()[:16]
+
+
+def content_hash(item):
+    """Hash of an item's normalized text: the same story syndicated by two sources collides."""
+    return _digest(_tokens(item))
+
+
+def minhash(tokens):
+    """MinHash signature of a text's words and word pairs (one uint64 per hash function)."""
+    shingles = set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+    hashes = np.array(
+        [int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little") for s in shingles],
+        dtype=np.uint64,
+    )
+    # Each (mask, multiplier) pair acts as one random permutation of the hash space
+    return ((hashes[:, None] ^ _MINHASH_MASKS) * _MINHASH_MULTIPLIERS).min(axis=0)
+
+
+class DuplicateIndex:
+    """
+    Recent items' content hashes and MinHash signatures. Near-duplicate lookups only
+    compare against items sharing an LSH band with the new signature. Bounded to the
+    newest max_items entries.
+    """
+
+    def __init__(self, max_items=2000, similarity=NEAR_DUPLICATE_SIMILARITY):
+        self.max_items = max_items
+        self.similarity = similarity
+        self._hashes = {} # content hash -> item id
+        self._entries = OrderedDict() # item id -> (content hash, signature)
+        self._bands = defaultdict(set) # (band, band bytes) -> item ids
+
+    @staticmethod
+    def _band_keys(signature):
+        return [(band, signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS].tobytes()) for band in range(MINHASH_SIZE // MINHASH_ROWS)]
+
+    def find(self, item):
+        """
+        Returns (id of the item this duplicates or None, keys to pass to add()).
+        Items without any text are never duplicates (and get no keys).
+        """
+        tokens = _tokens(item)
+        if not tokens:
+            return None, None
+        digest = _digest(tokens)
+        if digest in self._hashes:
+            return self._hashes[digest], None
+        signature = minhash(tokens) if len(tokens) >= 8 else None # too short to judge
+        if signature is not None:
+            candidates = set()
+            for band_key in self._band_keys(signature):
+                candidates.update(self._bands.get(band_key, ()))
+            for other_id in candidates:
+                # Share of equal MinHash values estimates the Jaccard similarity
+                if np.mean(signature == self._entries[other_id][1]) >= self.similarity:
+                    return other_id, None
+        return None, (digest, signature)
+
+    def add(self, item_id, keys):
+        if keys is None:
+            return
+        digest, signature = keys
+        self._hashes[digest] = item_id
+        self._entries[item_id] = keys
+        if signature is not None:
+            for band_key in self._band_keys(signature):
+                self._bands[band_key].add(item_id)
+        while len(self._entries) > self.max_items:
+            old_id, (old_digest, old_signature) = self._entries.popitem(last=False)
+            self._hashes.pop(old_digest, None)
+            if old_signature is not None:
+                for band_key in self._band_keys(old_signature):
+                    ids = self._bands[band_key]
+                    ids.discard(old_id)
+                    if not ids:
+                        del self._bands[band_key]
+
+
+class NewsStore:
+    """
+    Append-only, thread-safe store of parsed news items keyed by their stable ID.
+
+    Every item gets a sequence number in ingest order (oldest first), which doubles as
+    the pagination cursor. Player, team and timestamp indexes map to sequence numbers,
+    so filtered queries never scan the whole store. The oldest items are dropped past max_items.
+    Stories already in the store from another source (same or near-identical text) are skipped.
+    """
+
+    def __init__(self, max_items=2000):
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items = []
+        self._by_id = {}
+        self._offset = 0 # sequence number of self._items[0]
+
+        # Indexes: key -> ascending list of sequence numbers
+        self._by_player = defaultdict(list)
+        self._by_player_id = defaultdict(list)
+        self._by_team = defaultdict(list)
+        self._by_source = defaultdict(list)
+        # (timestamp, seq) sorted by timestamp
+        self._by_time = []
+        self.version = 0
+        self._duplicates = DuplicateIndex(max_items)
+        self.duplicates_skipped = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def _index(self, item, seq, ingested_at):
+        for name in (item.get("player") or "").split(";"):
+            key = normalize_player_name(name)
+            if key:
+                self._by_player[key].append(seq)
+        for player_id in item.get("player_ids") or ():
+            self._by_player_id[player_id].append(seq)
+        team = normalize_team_abbr(item.get("team_abbr"))
+        if team:
+            self._by_team[team].append(seq)
+        if item.get("source"):
+            self._by_source[item["source"].lower()].append(seq)
+        bisect.insort(self._by_time, (_item_time(item, ingested_at), seq))
+
+    def _trim(self):
+        overflow = len(self._items) - self.max_items
+        if overflow <= 0:
+            return
+        for item in self._items[:overflow]:
+            self._by_id.pop(item["id"], None)
+        del self._items[:overflow]
+        self._offset += overflow
+
+        # Sequence lists are ascending, so expired entries sit at the front
+        for index in (self._by_player, self._by_player_id, self._by_team, self._by_source):
+            for key in list(index):
+                seqs = index[key]
+                del seqs[:bisect.bisect_left(seqs, self._offset)]
+                if not seqs:
+                    del index[key]
+        self._by_time = [(ts, seq) for ts, seq in self._by_time if seq >= self._offset]
+
+    def add(self, items):
+        """
+        Ingests a scraped page (newest first). Returns only the items not seen before,
+        also newest first.
+        """
+        added = []
+        ingested_at = datetime.datetime.now(datetime.timezone.utc)
+        with self._lock:
+            # Append oldest first so the list stays in chronological ingest order
+            for item in reversed(items):
+                if item["id"] in self._by_id:
+                    continue
+                duplicate_of, keys = self._duplicates.find(item)
+                if duplicate_of is not None:
+                    self.duplicates_skipped += 1
+                    continue
+                self._duplicates.add(item["id"], keys)
+                seq = self._offset + len(self._items)
+                self._items.append(item)
+                self._by_id[item["id"]] = item
+                self._index(item, seq, ingested_at)
+                added.append(item)
+
+            self._trim()
+            if added:
+                self.version += 1
+        return added[::-1]
+
+    def get(self, item_id):
+        return self._by_id.get(item_id)
+
+    def latest(self, limit=20):
+        """Newest items first."""
+        with self._lock:
+            return self._items[::-1][:limit]
+
+    def query(self, player=None, team=None, since=None, cursor=None, limit=20, source=None, player_id=None):
+        """
+        Newest-first page of items matching every given filter.
+        cursor: sequence number returned as next_cursor by the previous page.
+        Returns (items, next_cursor), next_cursor being None on the last page.
+        """
+        # Resolved before taking the lock: an unseen name costs a fuzzy index lookup
+        resolved = player_index.get_player_index().resolve(player) if player else None
+        with self._lock:
+            end = self._offset + len(self._items)
+            upper = min(cursor, end) if cursor is not None else end
+
+            candidate_sets = []
+            if player:
+                # Items written under the name, plus items linked to the player it resolves to
+                seqs = self._by_player.get(normalize_player_name(player), [])
+                if resolved is not None and resolved in self._by_player_id:
+                    seqs = sorted(set(seqs).union(self._by_player_id[resolved]))
+                candidate_sets.append(seqs)
+            if player_id is not None:
+                candidate_sets.append(self._by_player_id.get(player_id, []))
+            if team:
+                candidate_sets.append(self._by_team.get(normalize_team_abbr(team), []))
+            if source:
+                candidate_sets.append(self._by_source.get(source.lower(), []))
+            if since:
+                start = bisect.bisect_left(self._by_time, (since, -1))
+                candidate_sets.append(sorted(seq for _, seq in self._by_time[start:]))
+
+            if candidate_sets:
+                # Walk the smallest index and check membership in the others
+                candidate_sets.sort(key=len)
+                others = [set(seqs) for seqs in candidate_sets[1:]]
+                smallest = candidate_sets[0]
+                seqs = (
+                    seq for seq in reversed(smallest[:bisect.bisect_left(smallest, upper)])
+                    if all(seq in other for other in others)
+                )
+            else:
+                seqs = range(upper - 1, self._offset - 1, -1)
+
+            page_seqs = list(itertools.islice(seqs, limit + 1))
+            has_more = len(page_seqs) > limit
+            page_seqs = page_seqs[:limit]
+            page = [self._items[seq - self._offset] for seq in page_seqs]
+            return page, (page_seqs[-1] if has_more else None)
+
+
+store = NewsStore(max_items=config.NEWS_MAX_ITEMS)
+
+
+# --- Sources ---
+
+class SourceMetrics:
+    """Fetch latency and outcome counters for one news source."""
+
+    __slots__ = ('fetches', 'failures', 'not_modified', 'items', 'new_items', 'last_latency', 'avg_latency', 'last_error', 'last_fetch')
+
+    def __init__(self):
+        self.fetches = self.failures = self.not_modified = self.items = self.new_items = 0
+        self.last_latency = self.avg_latency = None
+        self.last_error = None
+        self.last_fetch = None
+
+    def record(self, latency, items=0, error=None, not_modified=False):
+        self.fetches += 1
+        self.last_latency = latency
+        # Exponentially weighted, so the average follows the source's current behaviour
+        self.avg_latency = latency if self.avg_latency is None else 0.8 * self.avg_latency + 0.2 * latency
+        self.last_fetch = datetime.datetime.now(datetime.timezone.utc)
+        self.last_error = str(error) if error else None
+        if error:
+            self.failures += 1
+        elif not_modified:
+            self.not_modified += 1
+        else:
+            self.items += items
+
+    def status(self):
+        return {
+            "fetches": self.fetches,
+            "failures": self.failures,
+            "not_modified": self.not_modified,
+            "items_parsed": self.items,
+            "new_items": self.new_items,
+            "last_latency_ms": round(self.last_latency * 1000) if self.last_latency is not None else None,
+            "avg_latency_ms": round(self.avg_latency * 1000) if self.avg_latency is not None else None,
+            "last_error": self.last_error,
+            "last_fetch": self.last_fetch.isoformat() if self.last_fetch else None,
+        }
+
+
+metrics = defaultdict(SourceMetrics)
+
+
+def source_status():
+    return [
+        {"name": source.name, "url": source.url, "type": type(source).__name__, **metrics[source.name].status()}
+        for source in news_sources.get_sources()
+    ]
+
+
+def merge_batches(batches, now=None):
+    """One newest-first list from several sources' items (undated items count as now)."""
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    merged = [item for batch in batches for item in batch]
+    merged.sort(key=lambda item: _item_time(item, now), reverse=True)
+    return merged
+
+
+def link_players(items):
+    """Adds player_ids (nba_api PLAYER_IDs resolved from the free-text player field) to each item."""
+    for item in items:
+        if "player_ids" not in item:
+            item["player_ids"] = player_index.resolve_player_ids(item.get("player"))
+    return items
+
+
+def publish_news(items):
+    """Pushes new items (newest first, as store.add returns them) to /events subscribers, oldest first."""
+    for item in reversed(items):
+        team = normalize_team_abbr(item.get("team_abbr"))
+        event_hub.hub.publish("news", item, players=item.get("player_ids") or (), teams=[team] if team else ())
+
+
+def _ingest(batches):
+    added = store.add(link_players(merge_batches(batches)))
+    for item in added:
+        metrics[item["source"]].new_items += 1
+    publish_news(added)
+    return added
+
+
+def _fetch_source(source):
+    started = time.perf_counter()
+    try:
+        # Through the disk cache: an unreachable source re-serves its last page
+        content = disk_cache.cached_call('news', source.url, source.download)
+        items = executor.call_cpu(source.parse, content)
+    except Exception as e:
+        metrics[source.name].record(time.perf_counter() - started, error=e)
+        logger.error(f"News source {source.name} failed: {e}")
+        return e
+    metrics[source.name].record(time.perf_counter() - started, items=len(items))
+    return items
+
+
+def refresh_news():
+    """
+    One pass over every registered source (see news_sources), parsed (on the CPU pool
+    when configured) and merged into the store. Returns the store so it can act as the
+    cache snapshot. Fails only when every source failed.
+    """
+    results = [_fetch_source(source) for source in news_sources.get_sources()]
+    batches = [result for result in results if not isinstance(result, Exception)]
+    if not batches and results:
+        raise results[0]
+    added = _ingest(batches)
+    logger.info(f"News refresh: {sum(map(len, batches))} items parsed, {len(added)} new")
+    return store
+
+
+async def _fetch_source_async(source):
+    started = time.perf_counter()
+    try:
+        page = await async_http.conditional_get(source.url, headers=source.headers)
+        if not page.modified:
+            metrics[source.name].record(time.perf_counter() - started, not_modified=True)
+            return []
+        items = await executor.run_cpu(source.parse, page.content)
+    except Exception as e:
+        metrics[source.name].record(time.perf_counter() - started, error=e)
+        logger.error(f"News source {source.name} failed: {e}")
+        return e
+    metrics[source.name].record(time.perf_counter() - started, items=len(items))
+    await executor.run_io(disk_cache.get_disk_cache().put, 'news', source.url, page.content)
+    return items
+
+
+async def refresh_news_async():
+    """
+    refresh_news for the event loop: every source is fetched concurrently with a
+    conditional GET over the shared async client, so unchanged feeds cost a 304 and
+    no parse. Returns the number of new items; raises only when every source failed.
+    """
+    sources = news_sources.get_sources()
+    results = await async_http.gather_limited(_fetch_source_async(source) for source in sources)
+    batches = [result for result in results if not isinstance(result, Exception)]
+    if not batches and results:
+        raise results[0]
+    # Dedup hashing and player-name resolution for every new item: keep them off the event loop
+    added = await executor.run_io(_ingest, batches)
+    if added:
+        logger.info(f"News refresh: {len(added)} new items from {len(batches)} source(s)")
+    news_cache.set(store)
+    return len(added)
+
+
+# Single-flight, stale-while-revalidate refresh: at most one scrape per interval
+news_cache = SnapshotCache(
+    refresh_news,
+    ttl=datetime.timedelta(minutes=config.NEWS_REFRESH_MINUTES),
+    name="news",
+)
+
+
+def get_latest_news(limit=20):
+    """Serves from memory; only a cold store (or an expired TTL without polling) triggers a scrape."""
+    news_cache.get()
+    return store.latest(limit)
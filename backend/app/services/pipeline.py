@@ -0,0 +1,74 @@
+import logging
+from app.routers.nba_stats import league_stats_cache
+from app.services import executor, matchup_service, news_service
+from app.services.scheduler import JOB_TIMEOUT_SECONDS, daily_at, every, refresh_cache
+from app.src.analysis import trends
+from app.src.data import espn_connector, gamelog_store
+from app.src.utils import async_http, config
+
+logger = logging.getLogger(__name__)
+
+# TTL-based jobs run a little before their cache expires, so the snapshot is replaced
+# before it goes stale and user requests never start the upstream refresh themselves
+AHEAD_OF_TTL = 0.9
+
+
+def refresh_game_logs():
+    """Syncs the night's games into the warehouse, then folds them into the trend index."""
+    refresh_cache(gamelog_store.game_logs_cache)
+    trends.get_trend_index()
+
+
+async def refresh_news():
+    """
+    News job, run on the event loop: every source is fetched concurrently with
+    conditional GETs (see news_service.refresh_news_async). Offline, or when every
+    source fails, falls back to news_service's disk-cached path.
+    """
+    if not config.OFFLINE_MODE:
+        try:
+            await news_service.refresh_news_async()
+            return
+        except Exception as e:
+            logger.warning(f"News download failed ({e}); falling back to the disk cache")
+    await executor.run_io(refresh_cache, news_service.news_cache, timeout=JOB_TIMEOUT_SECONDS)
+
+
+def refresh_league(league_id=None):
+    """Loads (or roster-syncs) an ESPN league and rebuilds its schedule tables."""
+    snapshot = espn_connector.get_league_snapshot(league_id)
+    if snapshot is None:
+        raise RuntimeError(f"Could not load League {league_id or config.LEAGUE_ID}")
+    matchup_service.get_season_table(snapshot)
+
+
+async def refresh_leagues():
+    """
+    Refreshes every configured league concurrently. espn_api is blocking, so each
+    load runs on the I/O pool (over the shared keep-alive session, see espn_connector).
+    """
+    results = await async_http.gather_limited(
+        executor.run_io(refresh_league, league_id, timeout=JOB_TIMEOUT_SECONDS) for league_id in config.LEAGUE_IDS
+    )
+    failed = [f"{league_id}: {result}" for league_id, result in zip(config.LEAGUE_IDS, results) if isinstance(result, Exception)]
+    if failed:
+        raise RuntimeError("; ".join(failed))
+
+
+def register_jobs(scheduler):
+    """The app's refresh pipeline: what is pre-warmed at startup and how often each source refreshes."""
+    scheduler.add_job("league_stats", lambda: refresh_cache(league_stats_cache), every(config.LEAGUE_STATS_TTL_MINUTES * AHEAD_OF_TTL))
+    scheduler.add_job("game_logs", refresh_game_logs, daily_at(config.GAME_LOGS_REFRESH_HOUR_UTC))
+    if config.NEWS_POLLING:
+        scheduler.add_job("news", refresh_news, every(config.NEWS_REFRESH_MINUTES * AHEAD_OF_TTL))
+    if config.LEAGUE_IDS:
+        scheduler.add_job("league", refresh_leagues, every(config.ESPN_ROSTER_REFRESH_MINUTES))
+    return scheduler
+
+
+def cache_status():
+    return [
+        league_stats_cache.status(),
+        gamelog_store.game_logs_cache.status(),
+        news_service.news_cache.status(),
+    ]
@@ -0,0 +1,170 @@
+import asyncio
+import datetime
+import logging
+import time
+from app.services import executor
+
+logger = logging.getLogger(__name__)
+
+# A failed job is retried after this long rather than waiting for its next slot
+RETRY_AFTER = datetime.timedelta(minutes=5)
+# Refreshes are long-running bulk loads, not user requests
+JOB_TIMEOUT_SECONDS = 600
+
+
+def every(minutes):
+    """Cadence: a fixed interval after the previous run."""
+    interval = datetime.timedelta(minutes=minutes)
+    return lambda last_run: last_run + interval
+
+
+def daily_at(hour_utc):
+    """Cadence: once a day at hour_utc (e.g. after the night's games are final)."""
+    def next_run(last_run):
+        last_utc = last_run.astimezone(datetime.timezone.utc)
+        run = last_utc.replace(hour=hour_utc, minute=0, second=0, microsecond=0)
+        if run <= last_utc:
+            run += datetime.timedelta(days=1)
+        return run
+    return next_run
+
+
+def refresh_cache(cache):
+    """
+    Job body for a SnapshotCache: reload it now, surfacing this reload's failure as an
+    error. A reload already in flight (a request's background refresh) is left to finish.
+    """
+    if not cache.refresh(wait=True, raise_errors=True):
+        logger.info(f"{cache.name} is already refreshing; skipping this run")
+
+
+class Job:
+    __slots__ = ('name', 'func', 'cadence', 'warm', 'last_run', 'last_duration', 'last_error', 'next_run', 'runs', 'failures', 'running')
+
+    def __init__(self, name, func, cadence, warm=True):
+        self.name = name
+        self.func = func
+        self.cadence = cadence
+        self.warm = warm # run once at startup
+        self.last_run = None
+        self.last_duration = None
+        self.last_error = None
+        self.next_run = None
+        self.runs = 0
+        self.failures = 0
+        self.running = False
+
+    def status(self):
+        return {
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "last_duration_ms": round(self.last_duration * 1000) if self.last_duration is not None else None,
+            "last_error": self.last_error,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "runs": self.runs,
+            "failures": self.failures,
+            "running": self.running,
+        }
+
+
+class Scheduler:
+    """
+    Background refresh pipeline run on the app's event loop. Each job is a blocking
+    refresh (run on the I/O pool) or a coroutine with its own cadence; jobs marked
+    warm run once at startup so the first requests find the caches loaded.
+    """
+
+    def __init__(self):
+        self.jobs = {}
+        self._task = None
+        self._wakeup = None
+        self._runs = set() # strong refs to in-flight job tasks
+        self.started_at = None
+
+    def add_job(self, name, func, cadence, warm=True):
+        self.jobs[name] = Job(name, func, cadence, warm)
+
+    def _spawn(self, job):
+        job.running = True
+        task = asyncio.ensure_future(self._run(job))
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+        return task
+
+    async def _run(self, job):
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(job.func):
+                await asyncio.wait_for(job.func(), timeout=JOB_TIMEOUT_SECONDS)
+            else:
+                await executor.run_io(job.func, timeout=JOB_TIMEOUT_SECONDS)
+            job.last_error = None
+        except Exception as e:
+            job.failures += 1
+            job.last_error = str(e)
+            logger.error(f"Scheduled job '{job.name}' failed: {e}")
+        finally:
+            job.last_duration = time.perf_counter() - started
+            job.last_run = datetime.datetime.now(datetime.timezone.utc)
+            job.next_run = job.cadence(job.last_run)
+            if job.last_error:
+                job.next_run = min(job.next_run, job.last_run + RETRY_AFTER)
+            job.runs += 1
+            job.running = False
+
+    async def warm_up(self, timeout=None):
+        """Runs every warm job concurrently; returns after they finish or `timeout` seconds."""
+        pending = [self._spawn(job) for job in self.jobs.values() if job.warm]
+        if not pending:
+            return
+        done, not_done = await asyncio.wait(pending, timeout=timeout)
+        if not_done:
+            logger.warning(f"Startup warm-up still running for {len(not_done)} job(s); continuing in the background")
+
+    async def _loop(self):
+        while True:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            for job in self.jobs.values():
+                if job.next_run is None and not job.warm:
+                    job.next_run = job.cadence(now)
+                if job.next_run is not None and job.next_run <= now and not job.running:
+                    self._spawn(job)
+
+            upcoming = [job.next_run for job in self.jobs.values() if job.next_run and not job.running]
+            delay = min(((run - now).total_seconds() for run in upcoming), default=60)
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=min(max(delay, 1), 60))
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self, warm_timeout=None):
+        """Warms the caches (bounded by warm_timeout), then starts the refresh loop."""
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._wakeup = asyncio.Event()
+        await self.warm_up(warm_timeout)
+        self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def trigger(self, name):
+        """Makes a job due now (e.g. after an admin action)."""
+        self.jobs[name].next_run = datetime.datetime.now(datetime.timezone.utc)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def status(self):
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "jobs": {name: job.status() for name, job in self.jobs.items()},
+        }
+
+
+scheduler = Scheduler()
@@ -0,0 +1,86 @@
+import numpy as np
+
+CATEGORIES = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'FG_PCT', 'FT_PCT', 'TOV']
+PCT_CATEGORIES = ['FG_PCT', 'FT_PCT']
+
+# Rating Logic (CV thresholds) - these thresholds might need tuning
+RATINGS = [("Elite", "green"), ("Stable", "blue"), ("Volatile", "yellow"), ("Wild", "red"), ("Low Vol", "gray")]
+RATING_THRESHOLDS = [0.15, 0.30, 0.50]
+LOW_VOLUME = len(RATINGS) - 1
+
+# "Consistency Grade" (A-F) based on PTS volatility (could ideally be an average of all CVs)
+GRADE_THRESHOLDS = [(0.15, "A+"), (0.25, "A"), (0.35, "B"), (0.50, "C")]
+
+
+def _grade(cv_pts):
+    for threshold, grade in GRADE_THRESHOLDS:
+        if cv_pts < threshold:
+            return grade
+    return "F"
+
+
+def summarize_consistency(gamelogs, player_ids=None, last_n=20):
+    """
+    Volatility stats for many players at once.
+
+    `gamelogs` is a league-wide game-log frame ordered newest game first. Each
+    player's last `last_n` games are aggregated in one grouped pass, then
+    mean/std/CV/rating/grade are derived for every player x category as arrays.
+    Returns {player_id: result} in the same shape as the single-player endpoint.
+    """
+    games = gamelogs
+    if player_ids is not None:
+        games = games[games['PLAYER_ID'].isin([int(pid) for pid in player_ids])]
+    if games.empty:
+        return {}
+
+    recent = games.groupby('PLAYER_ID', sort=False).head(last_n)
+    grouped = recent.groupby('PLAYER_ID')[CATEGORIES + ['MIN']]
+    means = grouped.mean()
+    # A single game has no spread; treat it as zero volatility rather than NaN
+    stds = grouped.std().fillna(0.0)
+    counts = grouped.size()
+
+    mean_values = means[CATEGORIES].to_numpy(dtype=float)
+    std_values = stds[CATEGORIES].to_numpy(dtype=float)
+
+    # Avoid division by zero
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.where(mean_values > 0.1, std_values / mean_values, 0.0)
+
+    rating_idx = np.searchsorted(RATING_THRESHOLDS, cv, side='right')
+    # Special case for percentages with low volume
+    pct_cols = [CATEGORIES.index(cat) for cat in PCT_CATEGORIES]
+    rating_idx[:, pct_cols] = np.where(mean_values[:, pct_cols] < 0.1, LOW_VOLUME, rating_idx[:, pct_cols])
+
+    std_rounded = np.round(std_values, 2).tolist()
+    mean_rounded = np.round(mean_values, 1).tolist()
+    cv_rounded = np.round(cv, 2).tolist()
+    min_rounded = np.round(means['MIN'].to_numpy(dtype=float), 1).tolist()
+    rating_idx = rating_idx.tolist()
+    pts_col = CATEGORIES.index('PTS')
+
+    results = {}
+    for row, player_id in enumerate(means.index.tolist()):
+        stats_data = {}
+        for col, cat in enumerate(CATEGORIES):
+            rating, color = RATINGS[rating_idx[row][col]]
+            stats_data[cat] = {
+                "std": std_rounded[row][col],
+                "mean": mean_rounded[row][col],
+                "cv": cv_rounded[row][col],
+                "rating": rating,
+                "color": color
+            }
+
+        results[player_id] = {
+            "player_id": player_id,
+            "games_analyzed": int(counts.loc[player_id]),
+            "consistency_grade": _grade(cv_rounded[row][pts_col]),
+            "volatility_stats": stats_data,
+            "recent_averages": {
+                "PTS": mean_rounded[row][pts_col],
+                "MIN": min_rounded[row]
+            }
+        }
+    return results
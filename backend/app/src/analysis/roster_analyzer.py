@@ -1,3 +1,29 @@
+import numpy as np
+from app.src.analysis import zscore_engine
+from app.src.data import league_model, player_index
+from app.src.utils.player_names import normalize_player_name
+from app.src.data.league_model import CENTER_MASK, FORWARD_MASK, GUARD_MASK, PlayerRecord, TeamRecord, position_mask
+
+
+def roster_position_masks(roster):
+    """Position bitmasks for a TeamRecord, a list of PlayerRecords or a list of espn_api Players."""
+    if isinstance(roster, TeamRecord):
+        return roster.position_masks
+    return np.array([
+        player.position_mask if isinstance(player, PlayerRecord) else position_mask(player.position)
+        for player in roster
+    ], dtype=np.int64)
+
+
+def position_counts(masks):
+    """(guards, forwards, centers): a multi-position player counts once in each group they cover."""
+    return (
+        int(np.count_nonzero(masks & GUARD_MASK)),
+        int(np.count_nonzero(masks & FORWARD_MASK)),
+        int(np.count_nonzero(masks & CENTER_MASK)),
+    )
+
+
 def generate_roster_insight(roster):
     """
     Analyzes a roster to generate basic strategic insights based on position counts.
@@ -5,28 +31,19 @@ def generate_roster_insight(roster):
     """
     
     # Basic Count
-    guards = 0
-    forwards = 0
-    centers = 0
-    total_players = len(roster)
-    
-    # Positional Mapping (Simple heuristic)
-    # ESPN positions can be complicated (e.g., 'PG, SG'), so we count occurrences
-    for player in roster:
-        pos = player.position
-        if 'PG' in pos or 'SG' in pos:
-            guards += 1
-        if 'SF' in pos or 'PF' in pos:
-            forwards += 1
-        if 'C' in pos:
-            centers += 1
+    # ESPN positions can be complicated (e.g., 'PG, SG'), so each position group
+    # is a bitmask test rather than an exclusive bucket
+    guards, forwards, centers = position_counts(roster_position_masks(roster))
+    return composition_insight(guards, forwards, centers)
+
+
+def composition_insight(guards, forwards, centers):
+    """Insight texts for a roster's (guards, forwards, centers) counts."""
             
     # Determine Composition
     # Note: A player like 'pg, sg' counts as 1 guard in logic above if we used elif, 
     # but here we just check mapped slots. Let's keep it simple.
     
-    insight_text = ""
-    
     insight_text = ""
     win_strategy = ""
     improvement_plan = ""
@@ -99,3 +116,125 @@ def generate_roster_insight(roster):
         "improvement_plan": improvement_plan,
         "composition_title": composition
     }
+
+
+# --- League-Wide Analysis ---
+
+# Team category totals are compared across the league; a team this many standard
+# deviations below (above) the league in a category is likely punting (built on) it.
+PUNT_THRESHOLD = -1.0
+STRENGTH_THRESHOLD = 1.0
+MAX_PUNTS = 3
+
+# Team strength sums player Z-scores, so percentages use the volume-weighted impact columns
+STRENGTH_CATEGORIES = zscore_engine.NINE_CAT
+
+
+def league_position_counts(snapshot):
+    """(teams x 3) guard/forward/center counts for every roster in one pass over all masks."""
+    masks = np.concatenate([team.position_masks for team in snapshot.teams]) if snapshot.teams \
+        else np.zeros(0, dtype=np.int64)
+    team_idx = np.repeat(np.arange(len(snapshot.teams)), [len(team.roster) for team in snapshot.teams])
+    groups = np.column_stack([(masks & group) != 0 for group in (GUARD_MASK, FORWARD_MASK, CENTER_MASK)])
+    counts = np.zeros((len(snapshot.teams), 3), dtype=np.int64)
+    np.add.at(counts, team_idx, groups.astype(np.int64))
+    return counts
+
+
+_name_rows = (None, None, None)
+
+
+def _table_rows(table):
+    """(normalized player name -> ranking table row, PLAYER_ID -> row), memoized for the current table."""
+    global _name_rows
+    cached_table, by_name, by_id = _name_rows
+    if cached_table is not table:
+        names = table.frame['PLAYER_NAME'].tolist()
+        by_name = {normalize_player_name(name): i for i, name in enumerate(names)}
+        by_id = {int(player_id): i for i, player_id in enumerate(table.frame['PLAYER_ID'].tolist())} if 'PLAYER_ID' in table.frame else {}
+        _name_rows = (table, by_name, by_id)
+    return by_name, by_id
+
+
+def league_category_strength(snapshot, table):
+    """
+    Sums rostered players' Z-scores per team and category (one scatter-add over all
+    rostered players), then standardizes each category across the league's teams.
+    Returns (totals, relative, matched): totals and relative are (teams x categories);
+    matched is players found in the ranking table per team.
+    """
+    columns = [table.categories.index(zscore_engine.IMPACT_COLUMN.get(cat, cat)) for cat in STRENGTH_CATEGORIES]
+    rows_by_name, rows_by_id = _table_rows(table)
+    names = player_index.get_player_index()
+
+    team_idx, rows = [], []
+    for i, team in enumerate(snapshot.teams):
+        for player in team.roster:
+            row = rows_by_name.get(normalize_player_name(player.name))
+            if row is None:
+                # ESPN and nba_api spell some names differently ('Herb Jones' / 'Herbert Jones')
+                row = rows_by_id.get(names.resolve(player.name))
+            if row is not None:
+                team_idx.append(i)
+                rows.append(row)
+
+    totals = np.zeros((len(snapshot.teams), len(columns)))
+    np.add.at(totals, np.array(team_idx, dtype=np.int64), table.z[np.array(rows, dtype=np.int64)][:, columns])
+    matched = np.bincount(np.array(team_idx, dtype=np.int64), minlength=len(snapshot.teams))
+
+    # TOV is already inverted in the player Z-scores
+    if len(snapshot.teams) > 1:
+        relative, _, _ = zscore_engine.standardize(totals, np.zeros(len(columns), dtype=bool))
+    else:
+        relative = np.zeros_like(totals)
+    return totals, relative, matched
+
+
+def analyze_league_rosters(league, table=None):
+    """
+    Composition insight for every team in the league at once. With a ranking table
+    (zscore_engine.RankingTable), each team also gets its category strength profile:
+    summed player Z-scores, league-relative strength, per-category rank, and the
+    categories it is likely punting or built on.
+    """
+    snapshot = league_model.get_snapshot(league)
+    counts = league_position_counts(snapshot)
+    if table is not None:
+        totals, relative, matched = league_category_strength(snapshot, table)
+        # 1 = strongest team in the category
+        ranks = (-relative).argsort(axis=0).argsort(axis=0) + 1
+
+    teams = []
+    for i, team in enumerate(snapshot.teams):
+        guards, forwards, centers = counts[i].tolist()
+        entry = {
+            "team_id": team.team_id,
+            "team_name": team.team_name,
+            "roster_size": len(team.roster),
+            "position_counts": {"guards": guards, "forwards": forwards, "centers": centers},
+            **composition_insight(guards, forwards, centers),
+        }
+        if table is not None:
+            order = np.argsort(relative[i])
+            entry["matched_players"] = int(matched[i])
+            entry["category_strength"] = {
+                cat: {
+                    "total_z": round(float(totals[i, c]), 2),
+                    "relative": round(float(relative[i, c]), 2),
+                    "rank": int(ranks[i, c]),
+                }
+                for c, cat in enumerate(STRENGTH_CATEGORIES)
+            }
+            entry["likely_punts"] = [
+                STRENGTH_CATEGORIES[c] for c in order[:MAX_PUNTS] if relative[i, c] <= PUNT_THRESHOLD
+            ]
+            entry["strengths"] = [
+                STRENGTH_CATEGORIES[c] for c in order[::-1] if relative[i, c] >= STRENGTH_THRESHOLD
+            ]
+        teams.append(entry)
+
+    return {
+        "league_id": snapshot.league_id,
+        "categories": list(STRENGTH_CATEGORIES) if table is not None else [],
+        "teams": teams,
+    }
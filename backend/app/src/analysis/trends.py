@@ -0,0 +1,216 @@
+import datetime
+import threading
+import numpy as np
+import pandas as pd
+from app.src.data import gamelog_store
+from app.src.utils import config
+
+# Per-game stats tracked for trends. USG is a box-score usage proxy
+# (FGA + 0.44 * FTA + TOV) since league game logs carry no USG%.
+COUNTING_STATS = ('MIN', 'USG', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'TOV')
+# Percentages are made / attempted over the whole window (not an average of
+# per-game percentages), so their makes and attempts are accumulated too
+PERCENTAGE_STATS = (
+    ('FG_PCT', 'FGM', 'FGA'),
+    ('FT_PCT', 'FTM', 'FTA'),
+)
+TREND_STATS = COUNTING_STATS + tuple(pct for pct, _, _ in PERCENTAGE_STATS)
+# Columns of the daily/season arrays
+SUMMED_STATS = COUNTING_STATS + tuple(col for _, makes, attempts in PERCENTAGE_STATS for col in (makes, attempts))
+WINDOWS = (7, 14, 30)
+
+
+def _usage_proxy(frame):
+    return frame['FGA'].astype(float) + 0.44 * frame['FTA'].astype(float) + frame['TOV'].astype(float)
+
+
+class TrendIndex:
+    """
+    Incrementally maintained (players x days x stats) daily totals plus running
+    season totals. New game-log rows are scattered into the arrays with np.add.at;
+    rolling windows are a slice-and-sum over the trailing days.
+    """
+
+    def __init__(self, season_start):
+        self.season_start = season_start
+        self._lock = threading.Lock()
+
+        self.player_ids = np.empty(0, dtype=np.int64)
+        self.player_names = []
+        self.team_abbrs = []
+        self._player_pos = {}
+
+        # daily[p, d, s] = stat total on day d; games[p, d] = games played that day
+        self.daily = np.zeros((0, 0, len(SUMMED_STATS)))
+        self.games = np.zeros((0, 0))
+        self.season_totals = np.zeros((0, len(SUMMED_STATS)))
+        self.season_games = np.zeros(0)
+
+        self.last_date = None
+        self.rowid = 0 # watermark into the game-log store
+
+    # --- Incremental Updates ---
+
+    def _grow(self, n_players, n_days):
+        p, d, s = self.daily.shape
+        if n_players > p or n_days > d:
+            new_p, new_d = max(n_players, p), max(n_days, d)
+            daily = np.zeros((new_p, new_d, s))
+            daily[:p, :d] = self.daily
+            games = np.zeros((new_p, new_d))
+            games[:p, :d] = self.games
+            self.daily, self.games = daily, games
+        if n_players > self.season_totals.shape[0]:
+            extra = n_players - self.season_totals.shape[0]
+            self.season_totals = np.vstack([self.season_totals, np.zeros((extra, s))])
+            self.season_games = np.concatenate([self.season_games, np.zeros(extra)])
+
+    def update(self, rows, rowid=None):
+        """Folds newly appended game-log rows into the aggregates."""
+        if rows is None or rows.empty:
+            if rowid is not None:
+                self.rowid = rowid
+            return 0
+
+        with self._lock:
+            # Map players to rows, registering new players at the end
+            new_players = rows.drop_duplicates('PLAYER_ID', keep='last')
+            for pid, name, team in new_players[['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION']].itertuples(index=False):
+                pos = self._player_pos.get(int(pid))
+                if pos is None:
+                    self._player_pos[int(pid)] = len(self.player_names)
+                    self.player_names.append(name)
+                    self.team_abbrs.append(team)
+                else:
+                    # Keep the most recent team (trades)
+                    self.team_abbrs[pos] = team
+            self.player_ids = np.array(list(self._player_pos), dtype=np.int64)
+
+            dates = pd.to_datetime(rows['GAME_DATE']).dt.date
+            day_idx = np.array([(d - self.season_start).days for d in dates])
+            player_idx = rows['PLAYER_ID'].map(self._player_pos).to_numpy()
+
+            values = np.column_stack([
+                _usage_proxy(rows).to_numpy() if stat == 'USG' else rows[stat].astype(float).to_numpy()
+                for stat in SUMMED_STATS
+            ])
+            values = np.nan_to_num(values, nan=0.0)
+
+            self._grow(len(self.player_names), int(day_idx.max()) + 1)
+            np.add.at(self.daily, (player_idx, day_idx), values)
+            np.add.at(self.games, (player_idx, day_idx), 1)
+            np.add.at(self.season_totals, player_idx, values)
+            np.add.at(self.season_games, player_idx, 1)
+
+            latest = max(dates)
+            self.last_date = latest if self.last_date is None else max(self.last_date, latest)
+            if rowid is not None:
+                self.rowid = rowid
+            return len(rows)
+
+    # --- Queries ---
+
+    def window(self, days, as_of=None):
+        """
+        Per-game averages over the trailing `days` (ending at as_of or the last game date)
+        and deltas versus season averages. Returns a DataFrame with one row per player.
+        """
+        with self._lock:
+            if self.last_date is None:
+                return pd.DataFrame()
+
+            end = (as_of or self.last_date) - self.season_start
+            end_idx = min(end.days, self.daily.shape[1] - 1) + 1
+            start_idx = max(end_idx - days, 0)
+
+            window_totals = self.daily[:, start_idx:end_idx].sum(axis=1)
+            window_games = self.games[:, start_idx:end_idx].sum(axis=1)
+            season_totals = self.season_totals.copy()
+            season_games = self.season_games.copy()
+            names = list(self.player_names)
+            teams = list(self.team_abbrs)
+            ids = self.player_ids.copy()
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            window_avg = np.where(window_games[:, None] > 0, window_totals / window_games[:, None], np.nan)
+            season_avg = np.where(season_games[:, None] > 0, season_totals / season_games[:, None], np.nan)
+
+        frame = pd.DataFrame({
+            'PLAYER_ID': ids,
+            'PLAYER_NAME': names,
+            'TEAM_ABBREVIATION': teams,
+            'GAMES': window_games.astype(int),
+            'SEASON_GAMES': season_games.astype(int),
+        })
+        for i, stat in enumerate(COUNTING_STATS):
+            frame[f'{stat}_AVG'] = window_avg[:, i]
+            frame[f'{stat}_SEASON'] = season_avg[:, i]
+            frame[f'{stat}_DELTA'] = window_avg[:, i] - season_avg[:, i]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for pct, makes, attempts in PERCENTAGE_STATS:
+                m, a = SUMMED_STATS.index(makes), SUMMED_STATS.index(attempts)
+                window_pct = np.where(window_totals[:, a] > 0, window_totals[:, m] / window_totals[:, a], np.nan)
+                season_pct = np.where(season_totals[:, a] > 0, season_totals[:, m] / season_totals[:, a], np.nan)
+                frame[f'{pct}_AVG'] = window_pct
+                frame[f'{pct}_SEASON'] = season_pct
+                frame[f'{pct}_DELTA'] = window_pct - season_pct
+        return frame
+
+
+def get_trending(index, days=7, sort_by='MIN', limit=25, min_games=2):
+    """
+    Risers and fallers for a rolling window, sorted by the change in `sort_by`
+    (per-game window average minus season average; for FG_PCT/FT_PCT, window
+    percentage minus season percentage). Risers improved and fallers declined,
+    so a player never appears in both lists.
+    """
+    if sort_by not in TREND_STATS:
+        raise ValueError(f"Unknown trend stat '{sort_by}'. Options: {', '.join(TREND_STATS)}")
+
+    frame = index.window(days)
+    if frame.empty:
+        return {"window_days": days, "as_of": None, "risers": [], "fallers": []}
+
+    delta = f'{sort_by}_DELTA'
+    frame = frame[frame['GAMES'] >= max(min_games, 1)].dropna(subset=[delta])
+    risers = frame[frame[delta] > 0].sort_values(delta, ascending=False, kind='stable')
+    fallers = frame[frame[delta] < 0].sort_values(delta, ascending=True, kind='stable')
+    as_of = index.last_date.isoformat() if index.last_date else None
+
+    return {
+        "window_days": days,
+        "as_of": as_of,
+        "sort_by": sort_by,
+        "risers": risers.head(limit).round(3).to_dict(orient='records'),
+        "fallers": fallers.head(limit).round(3).to_dict(orient='records'),
+    }
+
+
+def season_origin(season):
+    """Day 0 of the trend arrays: Sept 1 of the season's first year (e.g. '2024-25')."""
+    return datetime.date(int(season[:4]), 9, 1)
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_trend_index():
+    """
+    Process-wide TrendIndex kept in step with the game-log warehouse.
+    Only rows appended since the last call are read and folded in.
+    """
+    global _index, _index_version
+    gamelog_store.game_logs_cache.get() # Triggers a (background) sync when stale
+    version = gamelog_store.game_logs_cache.version
+
+    with _index_lock:
+        if _index is None:
+            _index = TrendIndex(season_origin(config.NBA_STATS_SEASON))
+        if _index_version != version:
+            rows, rowid = gamelog_store.get_store().read_since(_index.rowid)
+            _index.update(rows, rowid)
+            _index_version = version
+        return _index
@@ -0,0 +1,336 @@
+import numpy as np
+
+# --- Category Sets ---
+
+NINE_CAT = ('PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'TOV', 'FG_PCT', 'FT_PCT')
+EIGHT_CAT = tuple(cat for cat in NINE_CAT if cat != 'TOV')
+
+# Categories where fewer is better (Z-score is inverted)
+NEGATIVE_CATEGORIES = {'TOV'}
+
+CATEGORY_SETS = {
+    '9cat': NINE_CAT,
+    '8cat': EIGHT_CAT,
+}
+
+# ESPN default points-league scoring
+POINTS_SCORING = {
+    'PTS': 1.0,
+    'FG3M': 1.0,
+    'FGA': -1.0,
+    'FGM': 2.0,
+    'FTA': -1.0,
+    'FTM': 1.0,
+    'REB': 1.0,
+    'AST': 2.0,
+    'STL': 4.0,
+    'BLK': 4.0,
+    'TOV': -2.0,
+}
+
+LEAGUE_FORMATS = tuple(CATEGORY_SETS) + ('points',)
+
+# Percentage categories can be scored raw or as volume-weighted "impact":
+# makes above/below what a league-average shooter would hit on the same attempts.
+# (category, makes column, attempts column, impact column)
+IMPACT_CATEGORIES = (
+    ('FG_PCT', 'FGM', 'FGA', 'FG_IMPACT'),
+    ('FT_PCT', 'FTM', 'FTA', 'FT_IMPACT'),
+)
+IMPACT_COLUMN = {cat: impact for cat, _, _, impact in IMPACT_CATEGORIES}
+PCT_MODES = ('raw', 'impact')
+
+
+class RankingTable:
+    """
+    Array-backed player table built once per stats refresh.
+
+    `raw` holds every numeric column (players x columns) and `z` holds the
+    standardized category matrix (players x categories, including the FG/FT
+    impact columns), so any punt build, weighting, percentage mode or league
+    format is a single matrix product away.
+    """
+
+    __slots__ = ('frame', 'columns', 'raw', 'categories', 'z', 'means', 'stds')
+
+    def __init__(self, frame, columns, raw, categories, z, means, stds):
+        self.frame = frame
+        self.columns = columns
+        self.raw = raw
+        self.categories = categories
+        self.z = z
+        self.means = means
+        self.stds = stds
+
+    def __len__(self):
+        return self.raw.shape[0]
+
+    def column(self, name):
+        return self.raw[:, self.columns.index(name)]
+
+
+def standardize(values, negative_mask):
+    """
+    Z-scores every column of a (players x categories) matrix in one pass.
+    Matches pandas semantics: NaNs are skipped and the std uses ddof=1.
+    """
+    means = np.nanmean(values, axis=0)
+    stds = np.nanstd(values, axis=0, ddof=1)
+    safe_stds = np.where(stds > 0, stds, 1.0)
+
+    z = (values - means) / safe_stds
+    z[:, negative_mask] *= -1
+    # A missing stat contributes nothing to the total
+    return np.nan_to_num(z, nan=0.0), means, stds
+
+
+def add_impact_columns(frame):
+    """
+    Adds FG_IMPACT / FT_IMPACT: makes - league_pct * attempts, where league_pct is
+    the attempt-weighted league average. A 60% shooter on 2 FGA barely moves the
+    needle; the same percentage on 18 FGA does.
+    """
+    for _, makes, attempts, impact in IMPACT_CATEGORIES:
+        made = frame[makes].to_numpy(dtype=float)
+        tried = frame[attempts].to_numpy(dtype=float)
+        total_tried = np.nansum(tried)
+        league_pct = np.nansum(made) / total_tried if total_tried > 0 else 0.0
+        frame[impact] = made - league_pct * tried
+    return frame
+
+
+def build_ranking_table(df, categories=NINE_CAT):
+    """
+    Precomputes the raw and standardized matrices for a league-dash frame.
+    Impact columns are derived here too, once per data refresh.
+    """
+    frame = df.reset_index(drop=True)
+    if all(col in frame.columns for _, makes, attempts, _ in IMPACT_CATEGORIES for col in (makes, attempts)):
+        frame = add_impact_columns(frame)
+        categories = tuple(categories) + tuple(
+            impact for cat, _, _, impact in IMPACT_CATEGORIES if cat in categories
+        )
+
+    columns = list(frame.select_dtypes('number').columns)
+    raw = frame[columns].to_numpy(dtype=float)
+
+    category_values = raw[:, [columns.index(cat) for cat in categories]]
+    negative_mask = np.array([cat in NEGATIVE_CATEGORIES for cat in categories])
+    z, means, stds = standardize(category_values, negative_mask)
+
+    return RankingTable(frame, columns, raw, tuple(categories), z, means, stds)
+
+
+# --- Ranking Configurations ---
+
+def normalize_config(league_format='9cat', punt=(), weights=None, pct_mode='raw'):
+    """
+    Validates a ranking request and returns a hashable (format, punt, weights, pct_mode) key.
+    Raises ValueError on unknown formats, modes or categories.
+    """
+    if league_format not in LEAGUE_FORMATS:
+        raise ValueError(f"Unknown league format '{league_format}'. Options: {', '.join(LEAGUE_FORMATS)}")
+    if pct_mode not in PCT_MODES:
+        raise ValueError(f"Unknown percentage mode '{pct_mode}'. Options: {', '.join(PCT_MODES)}")
+
+    valid = POINTS_SCORING if league_format == 'points' else CATEGORY_SETS[league_format]
+    punt = tuple(sorted({cat.upper() for cat in punt or ()}))
+    weights = {cat.upper(): float(w) for cat, w in (weights or {}).items()}
+
+    for cat in list(punt) + list(weights):
+        if cat not in valid:
+            raise ValueError(f"Unknown category '{cat}' for {league_format}. Options: {', '.join(valid)}")
+
+    if league_format == 'points':
+        pct_mode = 'raw' # Points leagues have no percentage categories
+
+    return (league_format, punt, tuple(sorted(weights.items())), pct_mode)
+
+
+def _weight_vector(table, config):
+    """
+    Per-column weights for a category league: 0 for punted and out-of-format categories.
+    In impact mode a percentage category's weight moves onto its impact column.
+    """
+    league_format, punt, weights, pct_mode = config
+    active = set(CATEGORY_SETS[league_format]) - set(punt)
+    overrides = dict(weights)
+
+    column_weights = {cat: overrides.get(cat, 1.0) for cat in active}
+    if pct_mode == 'impact':
+        for cat, impact in IMPACT_COLUMN.items():
+            if cat in column_weights and impact in table.categories:
+                column_weights[impact] = column_weights.pop(cat)
+    return np.array([column_weights.get(cat, 0.0) for cat in table.categories])
+
+
+def _points_totals(table, config):
+    _, punt, weights, _ = config
+    scoring = dict(POINTS_SCORING)
+    scoring.update(dict(weights))
+    for cat in punt:
+        scoring[cat] = 0.0
+
+    cols = [c for c in scoring if c in table.columns]
+    values = np.nan_to_num(table.raw[:, [table.columns.index(c) for c in cols]], nan=0.0)
+    return values @ np.array([scoring[c] for c in cols])
+
+
+def score_many(table, configs):
+    """
+    Scores every player under many ranking configurations at once.
+    Category leagues share one (players x categories) @ (categories x configs) product.
+    Returns a (players x configs) matrix of totals in the order of `configs`.
+    """
+    totals = np.empty((len(table), len(configs)))
+
+    category_idx = [i for i, cfg in enumerate(configs) if cfg[0] != 'points']
+    if category_idx:
+        weight_matrix = np.column_stack([_weight_vector(table, configs[i]) for i in category_idx])
+        totals[:, category_idx] = table.z @ weight_matrix
+
+    for i, cfg in enumerate(configs):
+        if cfg[0] == 'points':
+            totals[:, i] = _points_totals(table, cfg)
+
+    return totals
+
+
+def rank_many(table, configs):
+    """
+    Returns a list of (order, totals) per configuration, where `order` holds
+    player row indices sorted best-first.
+    """
+    totals = score_many(table, configs)
+    results = []
+    for i in range(len(configs)):
+        order = np.argsort(-totals[:, i], kind='stable')
+        results.append((order, totals[:, i]))
+    return results
+
+
+def rank_players(table, league_format='9cat', punt=(), weights=None, pct_mode='raw'):
+    """Convenience wrapper for a single configuration."""
+    config = normalize_config(league_format, punt, weights, pct_mode)
+    return rank_many(table, [config])[0]
+
+
+def _shown_categories(table, pct_mode):
+    # FG/FT impact columns only appear in impact-mode output, so raw rankings keep their shape
+    if pct_mode == 'impact':
+        return list(table.categories)
+    return [cat for cat in table.categories if cat not in IMPACT_COLUMN.values()]
+
+
+def _shown_frame_columns(table, pct_mode):
+    if pct_mode == 'impact':
+        return list(table.frame.columns)
+    return [col for col in table.frame.columns if col not in IMPACT_COLUMN.values()]
+
+
+def to_records(table, order, totals, limit=None, pct_mode='raw'):
+    """
+    Materializes ranked rows in the legacy /rankings shape: raw columns,
+    one <CAT>_Z column per category, TOTAL_Z and RANK. Only `limit` rows are built.
+    Impact columns are included only for pct_mode='impact'.
+    """
+    rows = order if limit is None else order[:limit]
+    base = table.frame[_shown_frame_columns(table, pct_mode)].iloc[rows].to_dict(orient='records')
+    categories = _shown_categories(table, pct_mode)
+    z_cols = [f'{cat}_Z' for cat in categories]
+    z = table.z[:, [table.categories.index(cat) for cat in categories]]
+
+    for rank, (row_idx, record) in enumerate(zip(rows, base), start=1):
+        record.update(zip(z_cols, z[row_idx].tolist()))
+        record['TOTAL_Z'] = float(totals[row_idx])
+        record['RANK'] = rank
+    return base
+
+
+DIFF_FIELDS = ('PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'RANK', 'TOTAL_Z')
+
+
+def rank_changes(previous, current, min_z_change=0.01):
+    """
+    Differences between two to_records() rankings, keyed by PLAYER_ID:
+    changed (rank moved or TOTAL_Z moved by at least min_z_change, with PREV_RANK
+    and PREV_TOTAL_Z), added (newly ranked) and removed players. Rows keep DIFF_FIELDS only.
+    """
+    before = {record['PLAYER_ID']: record for record in previous}
+    changed, added = [], []
+    for record in current:
+        row = {field: record[field] for field in DIFF_FIELDS}
+        old = before.pop(record['PLAYER_ID'], None)
+        if old is None:
+            added.append(row)
+        elif old['RANK'] != record['RANK'] or abs(old['TOTAL_Z'] - record['TOTAL_Z']) >= min_z_change:
+            row['PREV_RANK'] = old['RANK']
+            row['PREV_TOTAL_Z'] = old['TOTAL_Z']
+            changed.append(row)
+    removed = [{field: record[field] for field in DIFF_FIELDS} for record in before.values()]
+    return {"changed": changed, "added": added, "removed": removed}
+
+
+# --- Columnar Output ---
+
+def output_columns(table, pct_mode='raw'):
+    """Every column a ranked row carries by default, in the legacy record order."""
+    return _shown_frame_columns(table, pct_mode) + [f'{cat}_Z' for cat in _shown_categories(table, pct_mode)] + ['TOTAL_Z', 'RANK']
+
+
+def column_vector(table, name, order, totals):
+    """One output column for every player (table row order), without building rows."""
+    if name == 'TOTAL_Z':
+        return totals
+    if name == 'RANK':
+        ranks = np.empty(len(order), dtype=np.int64)
+        ranks[order] = np.arange(1, len(order) + 1)
+        return ranks
+    if name.endswith('_Z') and name[:-2] in table.categories:
+        return table.z[:, table.categories.index(name[:-2])]
+    if name in table.frame.columns:
+        # From the frame, not the float matrix, so ID and count columns keep their dtype
+        return table.frame[name].to_numpy()
+    raise ValueError(f"Unknown column '{name}'")
+
+
+def select_rows(table, order, totals, sort=None, descending=True, offset=0, limit=None):
+    """
+    Row indices for one page of the ranking, optionally re-sorted by any output
+    column. Only the sort key is computed for every player; rows are not built.
+    """
+    rows = order
+    if sort and sort != 'RANK':
+        keys = column_vector(table, sort, order, totals)[order]
+        if keys.dtype.kind in 'fiu':
+            keys = keys.astype(float)
+            # NaN sorts last in both directions
+            keys = np.where(np.isnan(keys), np.inf, -keys if descending else keys)
+            rows = order[np.argsort(keys, kind='stable')]
+        else:
+            positions = sorted(range(len(keys)), key=lambda i: str(keys[i]), reverse=descending)
+            rows = order[np.array(positions, dtype=np.int64)]
+    elif sort == 'RANK' and descending:
+        rows = order[::-1]
+
+    stop = None if limit is None else offset + limit
+    return rows[offset:stop]
+
+
+def _json_values(values):
+    if values.dtype.kind == 'f':
+        # NaN is not valid JSON
+        return [None if v != v else v for v in values.tolist()]
+    return values.tolist()
+
+
+def to_columns(table, rows, order, totals, fields=None, pct_mode='raw'):
+    """
+    Materializes only the requested columns for the given rows:
+    {column name: [values in row order]}. Without fields, the to_records() columns.
+    """
+    names = fields or output_columns(table, pct_mode)
+    return {
+        name: _json_values(np.asarray(column_vector(table, name, order, totals))[rows])
+        for name in names
+    }
@@ -1,48 +1,281 @@
 from espn_api.basketball import League
-from app.src.utils import config
+from espn_api.basketball.constant import POSITION_MAP
+from espn_api.basketball.player import Player
+from espn_api.requests import espn_requests
+from espn_api.requests.espn_requests import ESPNInvalidLeague
+from espn_api.utils.utils import json_parsing
+from app.src.data import league_model
+from app.src.utils import config, disk_cache
+from collections import OrderedDict
+from types import SimpleNamespace
+import datetime
+import hashlib
+import http.cookiejar
+import threading
 import logging
+import requests
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# --- Shared HTTP Session ---
+# espn_api calls the module-level requests.get(); pointing its module at one
+# keep-alive session reuses connections across every league load and refresh.
+# espn_api passes each league's espn_s2/SWID with every request, so the session
+# keeps no cookies: a Set-Cookie from one user's league must never reach another's.
+
+_session = requests.Session()
+_session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=config.IO_POOL_SIZE))
+espn_requests.requests = SimpleNamespace(get=_session.get)
+
+
+def get_http_session():
+    return _session
+
+
+def _clean_cookie(value):
+    # Clean up potential whitespace or quotes from cookies
+    return value.strip().strip('"').strip("'") if value else value
+
+
+def credentials_hash(espn_s2, swid):
+    """Short hash identifying a credential pair without keeping the cookies in cache keys."""
+    if not (espn_s2 and swid):
+        return "public"
+    return hashlib.sha256(f"{espn_s2}|{swid}".encode("utf-8")).hexdigest()[:16]
+
+
+def _load_league(league_id, season, espn_s2, swid):
+    if espn_s2 and swid:
+        league = League(league_id=league_id, year=season, espn_s2=espn_s2, swid=swid)
+    else:
+        league = League(league_id=league_id, year=season)
+    # Test connection by accessing a simple property
+    _ = league.settings.name
+    return league
+
+
+def _entry_state(entry):
+    # What a roster entry would become as a Player: id, lineup slot and injury status
+    player = (entry.get("playerPoolEntry") or {}).get("player") or entry.get("player") or {}
+    injury = player.get("injuryStatus", json_parsing(entry, "injuryStatus"))
+    return (entry.get("playerId"), POSITION_MAP.get(entry.get("lineupSlotId"), ""), injury)
+
+
+def _player_state(player):
+    return (player.playerId, player.lineupSlot, player.injuryStatus)
+
+
+def refresh_rosters(league):
+    """
+    Incremental roster sync: one mRoster request, and Player objects are rebuilt
+    only for teams whose roster, lineup slots or injury statuses changed. The new
+    roster list replaces the old one in a single assignment, so request threads
+    iterating a roster never see it half-built. Returns the number of teams updated.
+    """
+    data = league.espn_request.league_get(params={"view": "mRoster"})
+    teams = {team.team_id: team for team in league.teams}
+    pro_schedule = getattr(league, "pro_schedule", None)
+    changed = 0
+    for team_data in data.get("teams", []):
+        team = teams.get(team_data.get("id"))
+        entries = (team_data.get("roster") or {}).get("entries", [])
+        if team is None or [_entry_state(entry) for entry in entries] == [_player_state(p) for p in team.roster]:
+            continue
+        team.roster = [Player(entry, league.year, pro_schedule) for entry in entries]
+        changed += 1
+    if changed:
+        league_model.invalidate_snapshot(league)
+    return changed
+
+
+class _Entry:
+    __slots__ = ("league", "loaded_at", "rosters_at", "lock")
+
+    def __init__(self):
+        self.league = None
+        self.loaded_at = None
+        self.rosters_at = None
+        self.lock = threading.Lock()
+
+
+class LeagueConnectionManager:
+    """
+    Loaded espn_api League objects kept in an LRU keyed by (league_id, season,
+    credentials hash). A league is fully reloaded after `ttl`; in between, rosters
+    are re-synced incrementally every `roster_ttl`. Loads of the same key are
+    single-flight: concurrent callers wait for one download.
+    """
+
+    def __init__(self, max_size=8, ttl=None, roster_ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl or datetime.timedelta(hours=6)
+        self.roster_ttl = roster_ttl or datetime.timedelta(minutes=5)
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        # (league_id, season) -> season that actually loaded, e.g. 2026 -> 2025
+        self._season_fallbacks = {}
+        # Bumped on every load and roster change (HTTP ETags for league routes key on it)
+        self.generation = 0
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            return entry
+
+    def _discard(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+
+    def get(self, league_id, season, espn_s2=None, swid=None):
+        """Cached League for the key, loading or refreshing it as needed. Raises on load failure."""
+        season = self._season_fallbacks.get((league_id, season), season)
+        key = (league_id, season, credentials_hash(espn_s2, swid))
+        entry = self._entry(key)
+
+        with entry.lock:
+            now = datetime.datetime.now()
+            if entry.league is None or now - entry.loaded_at > self.ttl:
+                logger.info(f"Loading League {league_id} for Season {season}")
+                try:
+                    entry.league = _load_league(league_id, season, espn_s2, swid)
+                except Exception:
+                    if entry.league is None:
+                        self._discard(key, entry)
+                        raise
+                    # Keep serving the previous load; try again after one roster interval
+                    logger.exception(f"Reload failed for League {league_id}; serving cached copy")
+                    entry.loaded_at = now - self.ttl + self.roster_ttl
+                    return entry.league
+                entry.loaded_at = entry.rosters_at = now
+                self.generation += 1
+            elif now - entry.rosters_at > self.roster_ttl:
+                try:
+                    changed = refresh_rosters(entry.league)
+                    if changed:
+                        self.generation += 1
+                        logger.info(f"League {league_id}: {changed} roster(s) updated")
+                except Exception as e:
+                    # Keep serving the loaded rosters; retry on the next call
+                    logger.error(f"Roster refresh failed for League {league_id}: {str(e)}")
+                entry.rosters_at = now
+            return entry.league
+
+    def is_due(self, now=None):
+        """True if any cached league would reload or re-sync rosters on its next get()."""
+        now = now or datetime.datetime.now()
+        with self._lock:
+            entries = list(self._entries.values())
+        return any(
+            entry.league is None or now - entry.loaded_at > self.ttl or now - entry.rosters_at > self.roster_ttl
+            for entry in entries
+        )
+
+    def remember_fallback(self, league_id, season, fallback_season):
+        with self._lock:
+            self._season_fallbacks[(league_id, season)] = fallback_season
+
+    def invalidate(self, league_id=None):
+        """Drops cached leagues (all of them, or every season/credential of one league)."""
+        with self._lock:
+            for key in list(self._entries):
+                if league_id is None or key[0] == league_id:
+                    del self._entries[key]
+
+    def status(self):
+        with self._lock:
+            return [
+                {
+                    "league_id": key[0],
+                    "season": key[1],
+                    "loaded_at": entry.loaded_at.isoformat() if entry.loaded_at else None,
+                    "rosters_at": entry.rosters_at.isoformat() if entry.rosters_at else None,
+                }
+                for key, entry in self._entries.items()
+            ]
+
+
+connections = LeagueConnectionManager(
+    max_size=config.ESPN_LEAGUE_CACHE_SIZE,
+    ttl=datetime.timedelta(minutes=config.ESPN_LEAGUE_TTL_MINUTES),
+    roster_ttl=datetime.timedelta(minutes=config.ESPN_ROSTER_REFRESH_MINUTES),
+)
+
+
 def get_league_connection(league_id=None, season=None, espn_s2=None, swid=None):
     """
     Connects to the ESPN Fantasy League.
     Uses provided credentials or falls back to environment variables from config.
+    Leagues come from the shared connection cache, so repeat calls don't re-download them.
     """
     l_id = league_id or config.LEAGUE_ID
     s_yr = season or config.SEASON
-    s2 = espn_s2 or config.ESPN_S2
-    sw = swid or config.SWID
-    
+    s2 = _clean_cookie(espn_s2 or config.ESPN_S2)
+    sw = _clean_cookie(swid or config.SWID)
+
     # Validation
     if not l_id:
         logger.error("LEAGUE_ID is missing")
         return None
 
-    logger.info(f"Attempting connection to League {l_id} for Season {s_yr}")
-    
+    l_id, s_yr = int(l_id), int(s_yr)
     try:
-        if s2 and sw:
-            # Clean up potential whitespace or quotes from cookies
-            s2 = s2.strip('"').strip("'")
-            sw = sw.strip('"').strip("'")
-            league = League(league_id=int(l_id), year=int(s_yr), espn_s2=s2, swid=sw)
-        else:
-            league = League(league_id=int(l_id), year=int(s_yr))
-        
-        # Test connection by accessing a simple property
-        _ = league.settings.name
-        return league
+        return connections.get(l_id, s_yr, s2, sw)
     except Exception as e:
         logger.error(f"ESPN Connection Error: {str(e)}")
-        # If it fails with 2026, try 2025 as a secondary fallback
-        if str(s_yr) == "2026":
+        # A 2026 league that doesn't exist yet: fall back to 2025, and remember
+        # it so later calls go straight to the 2025 entry. Auth or network errors
+        # would fail the same way for 2025, so they aren't retried.
+        if s_yr == 2026 and isinstance(e, ESPNInvalidLeague):
             try:
                 logger.info("Retrying with Season 2025...")
-                league = League(league_id=int(l_id), year=2025, espn_s2=s2, swid=sw)
-                _ = league.settings.name
+                league = connections.get(l_id, 2025, s2, sw)
+                connections.remember_fallback(l_id, 2026, 2025)
                 return league
             except Exception as retry_e:
                 logger.error(f"Retry with 2025 failed: {str(retry_e)}")
         return None
+
+
+# --- Persisted Snapshots ---
+
+# Snapshot last written to disk per cache key, so unchanged rosters aren't rewritten
+_persisted = {}
+_persisted_lock = threading.Lock()
+
+
+def get_league_snapshot(league_id=None, season=None, espn_s2=None, swid=None):
+    """
+    LeagueSnapshot for the league (see league_model), saved to the disk cache whenever
+    its rosters change. When ESPN is unreachable, or in offline mode, the last saved
+    snapshot is returned instead. None if neither is available.
+    """
+    l_id = int(league_id or config.LEAGUE_ID or 0)
+    s_yr = int(season or config.SEASON)
+    key = f"{l_id}:{s_yr}:{credentials_hash(_clean_cookie(espn_s2 or config.ESPN_S2), _clean_cookie(swid or config.SWID))}"
+
+    league = None if config.OFFLINE_MODE else get_league_connection(league_id, season, espn_s2, swid)
+    if league is not None:
+        snapshot = league_model.get_snapshot(league)
+        with _persisted_lock:
+            changed = _persisted.get(key) is not snapshot
+            _persisted[key] = snapshot
+        if changed:
+            try:
+                disk_cache.get_disk_cache().put('espn_league', key, snapshot)
+            except Exception as e:
+                logger.error(f"Could not persist league snapshot: {str(e)}")
+        return snapshot
+
+    hit = disk_cache.get_disk_cache().get('espn_league', key)
+    if hit is None:
+        return None
+    logger.warning(f"Serving League {l_id} from the snapshot saved {hit[1]:%Y-%m-%d %H:%M}")
+    return hit[0]
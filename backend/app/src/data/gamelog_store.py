@@ -0,0 +1,200 @@
+import contextlib
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+import pandas as pd
+from nba_api.stats.endpoints import leaguegamelog
+from app.src.data import nba_stats_client  # noqa: F401  (rate-limited session for nba_api)
+from app.src.utils import config
+from app.src.utils.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+# Columns kept from LeagueGameLog (player mode)
+STORE_COLUMNS = [
+    'PLAYER_ID', 'PLAYER_NAME', 'TEAM_ID', 'TEAM_ABBREVIATION', 'GAME_ID', 'GAME_DATE', 'MATCHUP', 'WL',
+    'MIN', 'FGM', 'FGA', 'FG_PCT', 'FG3M', 'FG3A', 'FG3_PCT', 'FTM', 'FTA', 'FT_PCT',
+    'OREB', 'DREB', 'REB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS', 'PLUS_MINUS',
+]
+TEXT_COLUMNS = {'PLAYER_NAME', 'TEAM_ABBREVIATION', 'GAME_ID', 'GAME_DATE', 'MATCHUP', 'WL'}
+INTEGER_COLUMNS = {'PLAYER_ID', 'TEAM_ID'}
+
+
+def fetch_league_game_logs(season, date_from=None):
+    """
+    One league-wide request for every player's game logs in a season
+    (optionally only games on/after date_from). Returns a DataFrame.
+    """
+    params = {
+        'player_or_team_abbreviation': 'P',
+        'season': season,
+    }
+    if date_from:
+        params['date_from_nullable'] = date_from.strftime('%m/%d/%Y')
+    return leaguegamelog.LeagueGameLog(**params).get_data_frames()[0]
+
+
+class GameLogStore:
+    """
+    SQLite-backed warehouse of league-wide player game logs.
+
+    The first sync bulk-loads the season in one request; later syncs only ask
+    for games on/after the latest stored date and append the new rows.
+    """
+
+    def __init__(self, path, season):
+        self.path = path
+        self.season = season
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._init_schema()
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn: # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        column_defs = []
+        for col in STORE_COLUMNS:
+            if col in TEXT_COLUMNS:
+                col_type = 'TEXT'
+            elif col in INTEGER_COLUMNS:
+                col_type = 'INTEGER'
+            else:
+                col_type = 'REAL'
+            column_defs.append(f'{col} {col_type}')
+
+        with self._lock, self._connect() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS game_logs (
+                    SEASON TEXT NOT NULL,
+                    {', '.join(column_defs)},
+                    PRIMARY KEY (SEASON, PLAYER_ID, GAME_ID)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_game_logs_date ON game_logs (SEASON, GAME_DATE)")
+
+    # --- Writes ---
+
+    def last_game_date(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(GAME_DATE) FROM game_logs WHERE SEASON = ?", (self.season,)).fetchone()
+        if not row or not row[0]:
+            return None
+        return datetime.date.fromisoformat(row[0][:10])
+
+    def append(self, frame):
+        """Inserts rows not already stored (keyed by player + game). Returns the number added."""
+        if frame is None or frame.empty:
+            return 0
+
+        rows = frame.reindex(columns=STORE_COLUMNS).copy()
+        rows['GAME_DATE'] = rows['GAME_DATE'].astype(str).str[:10]
+        rows = rows.astype(object).where(rows.notna(), None)
+        values = [(self.season, *row) for row in rows.itertuples(index=False, name=None)]
+
+        placeholders = ', '.join(['?'] * (len(STORE_COLUMNS) + 1))
+        with self._lock, self._connect() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                f"INSERT OR IGNORE INTO game_logs (SEASON, {', '.join(STORE_COLUMNS)}) VALUES ({placeholders})",
+                values,
+            )
+            return conn.total_changes - before
+
+    def sync(self, fetcher=fetch_league_game_logs):
+        """
+        Pulls new games from upstream. Re-requests the latest stored date so games
+        that finished after the previous sync on that night are picked up too.
+        """
+        last_date = self.last_game_date()
+        frame = fetcher(self.season, date_from=last_date)
+        added = self.append(frame)
+        logger.info(f"Game log sync ({self.season}) from {last_date or 'season start'}: {added} new rows")
+        return added
+
+    # --- Reads ---
+
+    def load_frame(self, player_ids=None, since=None):
+        """Reads stored game logs (optionally filtered) into a DataFrame, newest games first."""
+        query = f"SELECT {', '.join(STORE_COLUMNS)} FROM game_logs WHERE SEASON = ?"
+        params = [self.season]
+        if player_ids:
+            query += f" AND PLAYER_ID IN ({', '.join(['?'] * len(player_ids))})"
+            params.extend(int(pid) for pid in player_ids)
+        if since:
+            query += " AND GAME_DATE >= ?"
+            params.append(since.isoformat())
+        query += " ORDER BY GAME_DATE DESC, PLAYER_ID"
+
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def read_since(self, rowid=0):
+        """
+        Returns (rows appended after `rowid`, newest rowid) for incremental consumers.
+        Rows are only ever appended, so a consumer can keep its own watermark.
+        """
+        query = f"SELECT rowid AS ROW_ID, {', '.join(STORE_COLUMNS)} FROM game_logs WHERE SEASON = ? AND rowid > ? ORDER BY rowid"
+        with self._connect() as conn:
+            frame = pd.read_sql_query(query, conn, params=[self.season, rowid])
+        newest = int(frame['ROW_ID'].iloc[-1]) if not frame.empty else rowid
+        return frame.drop(columns=['ROW_ID']), newest
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide store for the configured season."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            path = os.path.join(config.DATA_DIR, 'gamelogs.sqlite3')
+            _store = GameLogStore(path, config.NBA_STATS_SEASON)
+        return _store
+
+
+def build_game_log_snapshot():
+    """Syncs new games from upstream, then loads the whole season into memory."""
+    store = get_store()
+    if config.OFFLINE_MODE:
+        return store.load_frame()
+    try:
+        store.sync()
+    except Exception as e:
+        # Upstream down: keep serving whatever is already on disk
+        logger.error(f"Game log sync failed: {e}")
+        if store.last_game_date() is None:
+            raise
+    return store.load_frame()
+
+
+# With the scheduler on, the warehouse syncs once a day (see services/pipeline.py).
+# The TTL then outlasts that interval, so user requests never start a stats.nba.com
+# sync themselves; only a missed daily run lets a request refresh it.
+GAME_LOGS_TTL = datetime.timedelta(minutes=config.GAME_LOGS_TTL_MINUTES)
+if config.SCHEDULER_ENABLED:
+    GAME_LOGS_TTL = max(GAME_LOGS_TTL, datetime.timedelta(hours=25))
+
+# In-memory copy of the warehouse, refreshed (incrementally) on a TTL
+game_logs_cache = SnapshotCache(
+    build_game_log_snapshot,
+    ttl=GAME_LOGS_TTL,
+    name="game_logs",
+)
+
+
+def get_player_games(player_id, last_n=None):
+    """A player's stored games, newest first, read from the in-memory snapshot."""
+    frame = game_logs_cache.get()
+    games = frame[frame['PLAYER_ID'] == int(player_id)]
+    return games.head(last_n) if last_n else games
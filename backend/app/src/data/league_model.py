@@ -0,0 +1,190 @@
+import hashlib
+import threading
+import weakref
+import numpy as np
+from app.src.data import schedule_index
+
+# Position bitmasks (a player can carry several: 'PG, SG' -> PG | SG)
+PG, SG, SF, PF, C = 1, 2, 4, 8, 16
+POSITION_BITS = {'PG': PG, 'SG': SG, 'SF': SF, 'PF': PF, 'C': C}
+GUARD_MASK = PG | SG
+FORWARD_MASK = SF | PF
+CENTER_MASK = C
+
+
+def position_mask(position):
+    """Bitmask for an ESPN position string, matching the analyzer's substring checks ('PG' in pos)."""
+    mask = 0
+    for name, bit in POSITION_BITS.items():
+        if name in (position or ""):
+            mask |= bit
+    return mask
+
+
+def slots_mask(slots):
+    """Bitmask of the base positions among a player's eligible lineup slots."""
+    mask = 0
+    for slot in slots or ():
+        mask |= POSITION_BITS.get(slot, 0)
+    return mask
+
+
+class PlayerRecord:
+    """Flat, picklable view of an espn_api Player: only what the analysis code reads."""
+
+    __slots__ = (
+        'player_id', 'name', 'pro_team', 'position', 'position_mask', 'eligible_mask',
+        'injury_status', 'lineup_slot', 'schedule_row',
+    )
+
+    def __init__(self, player_id, name, pro_team, position, eligible_mask, injury_status, lineup_slot, schedule_row):
+        self.player_id = player_id
+        self.name = name
+        self.pro_team = pro_team
+        self.position = position
+        self.position_mask = position_mask(position)
+        self.eligible_mask = eligible_mask
+        self.injury_status = injury_status
+        self.lineup_slot = lineup_slot
+        self.schedule_row = schedule_row # row in the snapshot's ScheduleIndex, -1 if none
+
+    def __repr__(self):
+        return f"PlayerRecord({self.name})"
+
+
+class TeamRecord:
+    """
+    Fantasy team with its roster as PlayerRecords, plus the roster's schedule rows
+    and position masks as arrays for vectorized analysis.
+    """
+
+    __slots__ = ('team_id', 'team_name', 'team_abbrev', 'roster', 'schedule_rows', 'position_masks')
+
+    def __init__(self, team_id, team_name, team_abbrev, roster):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.team_abbrev = team_abbrev
+        self.roster = tuple(roster)
+        self.schedule_rows = np.array([p.schedule_row for p in self.roster], dtype=np.int64)
+        self.position_masks = np.array([p.position_mask for p in self.roster], dtype=np.int64)
+
+    def __repr__(self):
+        return f"TeamRecord({self.team_name})"
+
+
+class LeagueSnapshot:
+    """
+    Everything the analysis code needs from a loaded league, produced once per load:
+    team records with integer IDs, the season schedule matrix their players point
+    into, and each matchup period's pairings as team IDs. Holds no espn_api objects,
+    so it pickles cheaply.
+    """
+
+    __slots__ = ('league_id', 'year', 'teams', 'team_pos', 'schedule', 'pairings', 'roster_version')
+
+    def __init__(self, league_id, year, teams, schedule, pairings):
+        self.league_id = league_id
+        self.year = year
+        self.teams = tuple(teams)
+        self.team_pos = {team.team_id: i for i, team in enumerate(self.teams)}
+        self.schedule = schedule
+        self.pairings = pairings # [[(home_id, away_id), ...] per matchup period, period 1 first]
+        self.roster_version = roster_version(self.teams)
+
+    def team(self, team_id):
+        return self.teams[self.team_pos[team_id]]
+
+    def matchup_pairs(self, matchup_period):
+        """[(home TeamRecord, away TeamRecord), ...] for a matchup period (1-based)."""
+        if not 1 <= matchup_period <= len(self.pairings):
+            return []
+        return [(self.team(home), self.team(away)) for home, away in self.pairings[matchup_period - 1]]
+
+    def roster_weights(self, team):
+        """Players per schedule row for a team's roster (see ScheduleIndex.roster_weights)."""
+        rows = team.schedule_rows
+        return np.bincount(rows[rows >= 0], minlength=len(self.schedule.team_keys))
+
+
+def roster_version(teams):
+    """Hash of every team's roster: changes whenever a player is added, dropped or traded."""
+    digest = hashlib.sha1()
+    for team in teams:
+        player_keys = sorted(f"{p.pro_team}:{p.player_id}" for p in team.roster)
+        digest.update(f"{team.team_id}|{','.join(player_keys)};".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _player_record(player, index):
+    return PlayerRecord(
+        player_id=getattr(player, 'playerId', None),
+        name=getattr(player, 'name', ""),
+        pro_team=getattr(player, 'proTeam', None),
+        position=getattr(player, 'position', "") or "",
+        eligible_mask=slots_mask(getattr(player, 'eligibleSlots', ())),
+        injury_status=getattr(player, 'injuryStatus', None),
+        lineup_slot=getattr(player, 'lineupSlot', None),
+        schedule_row=index.team_pos.get(index.player_key(player), -1),
+    )
+
+
+def build_snapshot(league):
+    """Converts a loaded espn_api League into a LeagueSnapshot."""
+    index = schedule_index.build_schedule_index(league)
+    teams = [
+        TeamRecord(
+            team_id=team.team_id,
+            team_name=team.team_name,
+            team_abbrev=getattr(team, 'team_abbrev', ""),
+            roster=[_player_record(player, index) for player in team.roster],
+        )
+        for team in league.teams
+    ]
+
+    # Matchup period p is schedule index p - 1; pairs keyed by sorted IDs to drop the mirror entry
+    n_periods = max((len(team.schedule) for team in league.teams), default=0)
+    pairings = []
+    for schedule_idx in range(n_periods):
+        pairs = {}
+        for team in league.teams:
+            if schedule_idx >= len(team.schedule):
+                continue
+            matchup = team.schedule[schedule_idx]
+            if not matchup.home_team or not matchup.away_team:
+                continue # BYE week
+            home_id, away_id = matchup.home_team.team_id, matchup.away_team.team_id
+            pairs.setdefault(tuple(sorted((home_id, away_id))), (home_id, away_id))
+        pairings.append(list(pairs.values()))
+
+    return LeagueSnapshot(
+        league_id=getattr(league, 'league_id', None),
+        year=getattr(league, 'year', None),
+        teams=teams,
+        schedule=index,
+        pairings=pairings,
+    )
+
+
+_snapshots = weakref.WeakKeyDictionary()
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(league):
+    """
+    Snapshot for a loaded league, built on first use and kept while the league lives.
+    Accepts a LeagueSnapshot as-is, so the services work on either.
+    """
+    if isinstance(league, LeagueSnapshot):
+        return league
+    with _snapshots_lock:
+        snapshot = _snapshots.get(league)
+        if snapshot is None:
+            snapshot = build_snapshot(league)
+            _snapshots[league] = snapshot
+        return snapshot
+
+
+def invalidate_snapshot(league):
+    """Drops a league's snapshot so the next lookup rebuilds it (e.g. after a roster refresh)."""
+    with _snapshots_lock:
+        _snapshots.pop(league, None)
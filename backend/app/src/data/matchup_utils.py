@@ -1,3 +1,5 @@
+from app.src.data import league_model
+
 def get_matchups_from_team_schedules(league, matchup_period):
     """
     Build matchup pairs from team schedules instead of relying on league.box_scores().
@@ -29,3 +31,11 @@ def get_matchups_from_team_schedules(league, matchup_period):
             matchups[key] = (home_team, away_team)
     
     return list(matchups.values())
+
+
+def get_matchup_pairs(league, matchup_period):
+    """
+    Same pairs as get_matchups_from_team_schedules, as TeamRecords from the league's
+    snapshot (precomputed once per load). Accepts a League or a LeagueSnapshot.
+    """
+    return league_model.get_snapshot(league).matchup_pairs(matchup_period)
@@ -0,0 +1,191 @@
+import logging
+import random
+import threading
+import time
+import requests
+from nba_api.stats.library.http import NBAStatsHTTP
+from app.src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# Throttling, timeouts and 5xx are what stats.nba.com does under load
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_BACKOFF_SECONDS = 30
+# All attempts and backoff sleeps of one request finish within this, safely inside the
+# executor timeout: otherwise the caller gets a 504 while its thread keeps retrying
+RETRY_BUDGET_SECONDS = 0.8 * config.UPSTREAM_TIMEOUT_SECONDS
+# Not worth starting an attempt with less time than this left
+MIN_ATTEMPT_SECONDS = 2
+
+
+class CircuitOpenError(RuntimeError):
+    """stats.nba.com calls are short-circuited after repeated failures; callers fall back to cached data."""
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average, with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failed calls and rejects calls for
+    `reset_timeout` seconds. Then one trial call is let through (half-open): success
+    closes the breaker, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._last_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def retry_after(self):
+        """Seconds until the breaker lets a trial call through (0 unless open)."""
+        if self._opened_at is None:
+            return 0
+        return max(0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+            self._last_error = None
+
+    def record_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            self._last_error = str(error)
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    logger.warning(f"stats.nba.com circuit opened for {self.reset_timeout:.0f}s: {error}")
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def status(self):
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_after_seconds": round(self.retry_after()),
+            "last_error": self._last_error,
+        }
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Full-jitter exponential backoff, honouring a server Retry-After when given."""
+    if retry_after is not None:
+        return min(retry_after, MAX_BACKOFF_SECONDS)
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, config.NBA_STATS_BACKOFF_SECONDS * 2 ** attempt))
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class StatsSession(requests.Session):
+    """
+    Keep-alive session shared by every nba_api endpoint. Each request passes the
+    circuit breaker, waits for a rate-limit token and is retried with jittered
+    backoff on throttling, 5xx responses and network errors, all within `budget` seconds.
+    """
+
+    def __init__(self, bucket, breaker, max_retries, budget=RETRY_BUDGET_SECONDS):
+        super().__init__()
+        self.bucket = bucket
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.budget = budget
+        self.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=config.IO_POOL_SIZE))
+
+    def request(self, method, url, **kwargs):
+        if not self.breaker.allow():
+            raise CircuitOpenError(
+                f"stats.nba.com unavailable; retrying in {self.breaker.retry_after():.0f}s "
+                f"(last error: {self.breaker.status()['last_error']})"
+            )
+        timeout = min(kwargs.get("timeout") or config.NBA_STATS_TIMEOUT_SECONDS, config.NBA_STATS_TIMEOUT_SECONDS)
+        deadline = time.monotonic() + self.budget
+
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            kwargs["timeout"] = max(min(timeout, deadline - time.monotonic()), MIN_ATTEMPT_SECONDS)
+            retry_after = None
+            try:
+                response = super().request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES:
+                    self.breaker.record_success()
+                    return response
+                retry_after = _retry_after(response)
+                error = requests.HTTPError(f"{response.status_code} from {response.url}", response=response)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except Exception as e:
+                self.breaker.record_failure(e)
+                raise
+
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, retry_after)
+                if time.monotonic() + delay + MIN_ATTEMPT_SECONDS > deadline:
+                    logger.warning(f"stats.nba.com request failed ({error}); retry budget of {self.budget:.0f}s spent")
+                    break
+                logger.warning(f"stats.nba.com request failed ({error}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+        self.breaker.record_failure(error)
+        raise error
+
+
+breaker = CircuitBreaker(config.NBA_STATS_BREAKER_FAILURES, config.NBA_STATS_BREAKER_RESET_SECONDS)
+bucket = TokenBucket(config.NBA_STATS_REQUESTS_PER_SECOND, config.NBA_STATS_BURST)
+session = StatsSession(bucket, breaker, config.NBA_STATS_MAX_RETRIES)
+
+# Every nba_api endpoint (LeagueDashPlayerStats, LeagueGameLog, ...) sends through this session
+NBAStatsHTTP.set_session(session)
+
+
+def status():
+    return {"circuit": breaker.status(), "requests_per_second": bucket.rate}
@@ -1,138 +1,251 @@
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag, UnicodeDammit
 import datetime
+import hashlib
+from urllib.parse import urlparse, parse_qs
 from app.src.utils.team_mapping import get_full_team_name
 
 URL = "https://www.nbcsports.com/fantasy/basketball/player-news"
+SOURCE = "NBC Sports"
 
-# Simple in-memory cache
-_news_cache = []
-_last_fetch = None
-CACHE_DURATION = datetime.timedelta(minutes=10)
+# lxml is much faster than the stdlib parser; fall back to BeautifulSoup if it isn't installed
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
 
-def fetch_player_news(limit=15):
+PARSE_MODES = ('lxml', 'soup', 'soup-full')
+DEFAULT_PARSE_MODE = 'lxml' if lxml_html is not None else 'soup'
+
+# Only build tree nodes for news posts (current and legacy structure),
+# skipping the page chrome, scripts and navigation entirely.
+NEWS_POST_CLASSES = ['PlayerNewsPost', 'PlayerNewsModuleList-item']
+NEWS_POST_STRAINER = SoupStrainer(['div', 'li'], class_=NEWS_POST_CLASSES)
+
+# The only elements inside a post we read from
+HEADLINE_CLASS = 'PlayerNewsPost-headline'
+FIELD_CLASSES = {
+    'PlayerNewsPost-firstName', 'PlayerNewsPost-lastName', 'PlayerNewsPost-team-abbr',
+    HEADLINE_CLASS, 'PlayerNewsPost-analysis', 'PlayerNewsPost-story', 'PlayerNewsPost-date',
+}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+# Keep-alive session for the synchronous path, shared by every news source (see
+# news_sources) so requests to the same hosts reuse one connection pool.
+# The scheduler uses async_http instead.
+session = requests.Session()
+
+def download_news_page():
+    """Network half of the scrape: returns the raw page bytes."""
+    response = session.get(URL, headers=HEADERS, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+def player_from_headline(link_texts, headline_text):
+    """
+    Older page structure has no name spans: use linked player names in the headline,
+    falling back to the leading capitalized words ("FirstName LastName did...").
+    """
+    player_names = [name for name in link_texts if name and len(name) > 2]  # Skip empty or very short links
+
+    if player_names:
+        # Multiple players: "Player1; Player2"
+        return "; ".join(player_names)
+
+    # Find consecutive capitalized words at the start
+    capitalized = []
+    for word in headline_text.split():
+        # Check if word is capitalized and not a common article/preposition
+        if word and len(word) > 1 and word[0].isupper():
+            # Remove punctuation from end
+            clean_word = word.rstrip(',:;.!?')
+            if clean_word and clean_word.lower() not in ['the', 'a', 'an', 'in', 'on', 'at']:
+                capitalized.append(clean_word)
+        else:
+            break  # Stop at first non-capitalized word
+
+    # Use first 2 words as name (typically FirstName LastName)
+    if len(capitalized) >= 2:
+        return " ".join(capitalized[:2])
+    if len(capitalized) == 1:
+        return capitalized[0]
+    return "Unknown Player"
+
+# --- Field Extraction ---
+# Each backend walks a post's subtree once and returns
+# ({field class: {"text", "attrs", "links"}}, share_url).
+
+def _fields_from_soup(item):
+    fields = {}
+    share_url = None
+    for node in item.descendants:
+        if not isinstance(node, Tag):
+            continue
+        for cls in node.get('class') or ():
+            if cls in FIELD_CLASSES and cls not in fields:
+                fields[cls] = {
+                    "text": node.get_text(strip=True),
+                    "attrs": node.attrs,
+                    "links": [a.get_text(strip=True) for a in node.find_all('a')] if cls == HEADLINE_CLASS else [],
+                }
+        if share_url is None and node.has_attr('data-share-url'):
+            share_url = node['data-share-url']
+    return fields, share_url
+
+def _lxml_text(element):
+    # Same result as BeautifulSoup's get_text(strip=True)
+    return "".join(piece.strip() for piece in element.itertext())
+
+def _fields_from_lxml(post):
+    fields = {}
+    share_url = None
+    for element in post.iterdescendants():
+        if not isinstance(element.tag, str):
+            continue # comments / processing instructions
+        for cls in (element.get('class') or '').split():
+            if cls in FIELD_CLASSES and cls not in fields:
+                fields[cls] = {
+                    "text": _lxml_text(element),
+                    "attrs": element.attrib,
+                    "links": [_lxml_text(a) for a in element.iter('a')] if cls == HEADLINE_CLASS else [],
+                }
+        if share_url is None and element.get('data-share-url') is not None:
+            share_url = element.get('data-share-url')
+    return fields, share_url
+
+def _item_id(share_url, player_name, report_text, published):
+    """
+    Stable item ID: NBC's playerNewsId from the share link when present,
+    otherwise a hash of the item's content.
+    """
+    if share_url:
+        news_id = parse_qs(urlparse(share_url).query).get('playerNewsId')
+        if news_id:
+            return news_id[0]
+    digest = hashlib.sha1(f"{SOURCE}|{player_name}|{report_text}|{published}".encode("utf-8"))
+    return digest.hexdigest()[:20]
+
+def build_news_item(fields, share_url=None):
+    """Turns a post's extracted fields (current or legacy page structure) into the common item schema."""
+    def text(cls):
+        field = fields.get(cls)
+        return field["text"] if field else ""
+
+    # 1. Player Name
+    # Structure: .PlayerNewsPost-player-info -> .PlayerNewsPost-name -> .PlayerNewsPost-firstName / .PlayerNewsPost-lastName
+    headline_text = text(HEADLINE_CLASS)
+    first_name = text('PlayerNewsPost-firstName')
+    last_name = text('PlayerNewsPost-lastName')
+    if first_name or last_name:
+        player_name = " ".join(part for part in (first_name, last_name) if part)
+    else:
+        links = fields[HEADLINE_CLASS]["links"] if HEADLINE_CLASS in fields else []
+        player_name = player_from_headline(links, headline_text)
+
+    # 2. Team
+    team_abbr = text('PlayerNewsPost-team-abbr')
+
+    # 3. Content / Analysis
+    # The text is in .PlayerNewsPost-headline; older posts carry a separate analysis/story block
+    report_text = text('PlayerNewsPost-analysis') or text('PlayerNewsPost-story') or headline_text
+
+    # 4. Timestamp
+    # Time is in .PlayerNewsPost-date data-date attribute or text
+    time_field = fields.get('PlayerNewsPost-date')
+    time_str = "Recently"
+    published = None
+    if time_field:
+        data_date = time_field["attrs"].get('data-date')
+        if data_date:
+            try:
+                dt = datetime.datetime.fromisoformat(data_date.replace("Z", "+00:00"))
+                published = dt.isoformat()
+                time_str = dt.strftime("%b %d, %I:%M %p")
+            except ValueError:
+                time_str = "Recently"
+        elif time_field["text"]:
+            time_str = time_field["text"]
+
+    return {
+        "id": _item_id(share_url, player_name, report_text, published),
+        "player": player_name,
+        "team": get_full_team_name(team_abbr) if team_abbr else "",
+        "team_abbr": team_abbr,
+        "headline": headline_text[:100] + "..." if len(headline_text) > 100 else headline_text,
+        "report": report_text, # Frontend expects 'report'
+        "date": time_str, # Frontend expects 'date'
+        "published": published, # ISO timestamp when the source provides one
+        "source": SOURCE
+    }
+
+def _find_posts_lxml(html):
+    # lxml assumes latin-1 for undeclared bytes; NBC serves UTF-8
+    if isinstance(html, bytes):
+        try:
+            html = html.decode('utf-8')
+        except UnicodeDecodeError:
+            html = UnicodeDammit(html).unicode_markup
+    if not html.strip():
+        return [], _fields_from_lxml
+    doc = lxml_html.fromstring(html)
+    # NOTE: NBC Sports structure changes often.
+    # This selector targets the 2024-2025 structure, then the older list items.
+    posts = doc.xpath('//div[contains(concat(" ", normalize-space(@class), " "), " PlayerNewsPost ")]')
+    if not posts:
+        posts = doc.xpath('//li[contains(concat(" ", normalize-space(@class), " "), " PlayerNewsModuleList-item ")]')
+    return posts, _fields_from_lxml
+
+def _find_posts_soup(html, targeted):
+    soup = BeautifulSoup(
+        html,
+        'lxml' if lxml_html is not None and targeted else 'html.parser',
+        parse_only=NEWS_POST_STRAINER if targeted else None,
+    )
+    # NOTE: NBC Sports structure changes often.
+    # This selector targets the 2024-2025 structure
+    posts = soup.find_all('div', class_='PlayerNewsPost')
+    if not posts:
+        # Try fallback older selector
+        posts = soup.find_all('li', class_='PlayerNewsModuleList-item')
+    return posts, _fields_from_soup
+
+def parse_news_page(html, limit=None, mode=None):
     """
-    Scrapes the latest NBA player news from NBC Sports (Rotoworld).
-    Returns a list of dictionaries.
+    CPU half of the scrape: turns the page HTML into news items, newest first.
+    Kept module-level (and free of globals) so it can run in a worker process.
+
+    mode: 'lxml' (default when installed) walks only the post nodes of an lxml tree;
+    'soup' is BeautifulSoup limited to post subtrees by a SoupStrainer;
+    'soup-full' builds the whole BeautifulSoup tree with html.parser (the original path).
     """
-    global _news_cache, _last_fetch
-    
-    now = datetime.datetime.now()
-    if _last_fetch and (now - _last_fetch < CACHE_DURATION):
-        print("DEBUG: Returning cached news")
-        return _news_cache[:limit]
+    mode = mode or DEFAULT_PARSE_MODE
+    if mode not in PARSE_MODES:
+        raise ValueError(f"Unknown parse mode '{mode}'. Options: {', '.join(PARSE_MODES)}")
+
+    if mode == 'lxml' and lxml_html is not None:
+        posts, extract = _find_posts_lxml(html)
+    else:
+        posts, extract = _find_posts_soup(html, targeted=(mode != 'soup-full'))
 
     news_items = []
-    
+    for post in posts[:limit]:
+        try:
+            news_items.append(build_news_item(*extract(post)))
+        except Exception:
+            # Skip individual bad items but continue
+            continue
+    return news_items
+
+def fetch_player_news(limit=15):
+    """
+    Scrapes the latest NBA player news from NBC Sports (Rotoworld), uncached.
+    The API serves news from app.services.news_service instead of calling this per request.
+    """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(URL, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # The main list of news items
-        news_list = soup.find('ul', class_='PlayerNewsModuleList-items')
-        
-        if not news_list:
-            print("Could not find news list on source website. Structure may have changed.")
-            return []
-            
-        items = news_list.find_all('li', class_='PlayerNewsModuleList-item')
-        
-        for item in items[:limit]:
-            try:
-                # Headline usually contains player name + short summary
-                headline_div = item.find('div', class_='PlayerNewsPost-headline')
-                headline_text = headline_div.get_text(strip=True) if headline_div else "No Headline"
-                
-                # Extract all player names from links in headline
-                player_names = []
-                if headline_div:
-                    player_links = headline_div.find_all('a')
-                    for link in player_links:
-                        name = link.get_text(strip=True)
-                        if name and len(name) > 2:  # Skip empty or very short links
-                            player_names.append(name)
-                
-                # Format player names
-                if len(player_names) > 1:
-                    # Multiple players: "Player1; Player2"
-                    player_name = "; ".join(player_names)
-                elif len(player_names) == 1:
-                    player_name = player_names[0]
-                else:
-                    # Fallback: try to extract full name from headline
-                    # Typically news starts with "FirstName LastName did..."
-                    # Extract first 2-3 capitalized words
-                    words = headline_text.split()
-                    
-                    # Find consecutive capitalized words at the start
-                    capitalized = []
-                    for word in words:
-                        # Check if word is capitalized and not a common article/preposition
-                        if word and len(word) > 1 and word[0].isupper():
-                            # Remove punctuation from end
-                            clean_word = word.rstrip(',:;.!?')
-                            if clean_word and clean_word.lower() not in ['the', 'a', 'an', 'in', 'on', 'at']:
-                                capitalized.append(clean_word)
-                        else:
-                            break  # Stop at first non-capitalized word
-                    
-                    # Use first 2 words as name (typically FirstName LastName)
-                    if len(capitalized) >= 2:
-                        player_name = " ".join(capitalized[:2])
-                    elif len(capitalized) == 1:
-                        player_name = capitalized[0]
-                    else:
-                        player_name = "Unknown Player"
-                
-                # Analysis/Report content
-                # Everything in 'PlayerNewsPost-content' that isn't the headline?
-                # Actually, based on structure, 'PlayerNewsPost-content' wraps everything.
-                # Let's look for specific analysis class if it exists, otherwise generic text.
-                
-                # Based on typical Rotoworld structure:
-                # .PlayerNewsPost-analysis usually holds the expert take
-                analysis_div = item.find('div', class_='PlayerNewsPost-analysis')
-                report_text = analysis_div.get_text(strip=True) if analysis_div else ""
-                
-                # If analysis is empty, might be just a 'report'
-                if not report_text:
-                    # Sometimes simple news only has 'PlayerNewsPost-story'
-                    story_div = item.find('div', class_='PlayerNewsPost-story')
-                    if story_div:
-                        report_text = story_div.get_text(strip=True)
-
-                # Date/Time
-                date_div = item.find('div', class_='PlayerNewsPost-date')
-                date_text = date_div.get_text(strip=True) if date_div else "Recent"
-
-                # Team info
-                team_div = item.find('div', class_='PlayerNewsPost-team-abbr')
-                team_abbr = team_div.get_text(strip=True) if team_div else ""
-                team_full_name = get_full_team_name(team_abbr) if team_abbr else ""
-
-                news_items.append({
-                    "player": player_name,
-                    "team": team_full_name,
-                    "headline": headline_text,
-                    "report": report_text,
-                    "date": date_text
-                })
-                
-            except Exception as e:
-                # Skip individual bad items but continue
-                continue
-                
+        return parse_news_page(download_news_page(), limit)
     except Exception as e:
         print(f"Failed to fetch news: {e}")
         return []
-        
-    if news_items:
-        _news_cache = news_items
-        _last_fetch = now
-        
-    return news_items
@@ -0,0 +1,138 @@
+import abc
+import datetime
+import email.utils
+import hashlib
+import xml.etree.ElementTree as ElementTree
+from bs4 import BeautifulSoup
+from app.src.data import news_aggregator
+from app.src.utils import config
+from app.src.utils.team_mapping import get_full_team_name
+
+# Every source's parse() returns items in news_aggregator's schema:
+# id, player, team, team_abbr, headline, report, date, published, source
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class NewsSource(abc.ABC):
+    """
+    A news feed: where to download it and how to turn the body into items.
+    parse() must be picklable (module-level class, plain attributes) so it can run
+    in the CPU process pool.
+    """
+
+    name = None
+    url = None
+    headers = news_aggregator.HEADERS
+
+    @abc.abstractmethod
+    def parse(self, content):
+        """Turns a downloaded body into a list of items."""
+
+    def download(self):
+        """Blocking download for the synchronous (cold-start) refresh path."""
+        response = news_aggregator.session.get(self.url, headers=self.headers, timeout=10)
+        response.raise_for_status()
+        return response.content
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+
+class NBCSportsSource(NewsSource):
+    """NBC Sports (Rotoworld) player news page."""
+
+    name = news_aggregator.SOURCE
+    url = news_aggregator.URL
+
+    def parse(self, content):
+        return news_aggregator.parse_news_page(content)
+
+    def download(self):
+        return news_aggregator.download_news_page()
+
+
+def _text(element, *tags):
+    for tag in tags:
+        child = element.find(tag)
+        if child is not None and (child.text or child.get("href")):
+            return (child.text or child.get("href")).strip()
+    return ""
+
+
+def _published(value):
+    """RFC 822 (RSS) or ISO 8601 (Atom) date to an ISO string, None if unparseable."""
+    if not value:
+        return None
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.isoformat()
+
+
+class RSSSource(NewsSource):
+    """An RSS 2.0 or Atom feed. Player names are taken from the start of the title."""
+
+    def __init__(self, name, url, team_abbr=""):
+        self.name = name
+        self.url = url
+        self.team_abbr = team_abbr # for team-specific feeds
+
+    def parse(self, content):
+        root = ElementTree.fromstring(content)
+        entries = root.iter("item") if root.find(f"{ATOM}entry") is None else root.iter(f"{ATOM}entry")
+        items = []
+        for entry in entries:
+            title = _text(entry, "title", f"{ATOM}title")
+            if not title:
+                continue
+            summary = _text(entry, "description", f"{ATOM}summary", f"{ATOM}content")
+            report = BeautifulSoup(summary, "html.parser").get_text(" ", strip=True) if summary else title
+            published = _published(_text(entry, "pubDate", f"{ATOM}published", f"{ATOM}updated"))
+            guid = _text(entry, "guid", f"{ATOM}id", "link", f"{ATOM}link") or title
+            items.append({
+                "id": f"{self.name}:{hashlib.sha1(guid.encode('utf-8')).hexdigest()[:16]}",
+                "player": news_aggregator.player_from_headline([], title),
+                "team": get_full_team_name(self.team_abbr) if self.team_abbr else "",
+                "team_abbr": self.team_abbr,
+                "headline": title[:100] + "..." if len(title) > 100 else title,
+                "report": report,
+                "date": datetime.datetime.fromisoformat(published).strftime("%b %d, %I:%M %p") if published else "Recently",
+                "published": published,
+                "source": self.name,
+            })
+        return items
+
+
+# --- Registry ---
+
+_sources = {}
+
+
+def register_source(source):
+    """Adds (or replaces) a source by name."""
+    _sources[source.name] = source
+    return source
+
+
+def get_sources():
+    return list(_sources.values())
+
+
+def _configured_feeds(value):
+    # NEWS_RSS_FEEDS: "Name|url;Name|url[|TEAM]"
+    for entry in (value or "").split(";"):
+        parts = [part.strip() for part in entry.split("|")]
+        if len(parts) >= 2 and parts[0] and parts[1]:
+            yield RSSSource(parts[0], parts[1], parts[2] if len(parts) > 2 else "")
+
+
+register_source(NBCSportsSource())
+for feed in _configured_feeds(config.NEWS_RSS_FEEDS):
+    register_source(feed)
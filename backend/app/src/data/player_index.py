@@ -0,0 +1,176 @@
+import re
+import threading
+from collections import OrderedDict, defaultdict
+import numpy as np
+from nba_api.stats.static import players as static_players
+from app.src.utils.player_names import normalize_player_name
+
+# Generational suffixes dropped from lookup keys ('Jaren Jackson Jr.' == 'Jaren Jackson')
+SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+# Formal first name -> short forms used by news sites and ESPN (and the reverse is indexed too)
+NICKNAMES = {
+    'alexander': ('alex',),
+    'cameron': ('cam',),
+    'carlton': ('bub',),
+    'christopher': ('chris',),
+    'daniel': ('dan', 'danny'),
+    'herbert': ('herb',),
+    'joshua': ('josh',),
+    'kenyon': ('kj',),
+    'matthew': ('matt',),
+    'michael': ('mike',),
+    'mohamed': ('mo',),
+    'moritz': ('moe',),
+    'nicholas': ('nick', 'nic'),
+    'nicolas': ('nic', 'nick'),
+    'robert': ('rob', 'bobby'),
+    'stephen': ('steph',),
+    'sviatoslav': ('svi',),
+    'william': ('will', 'bill'),
+}
+_ALIASES = defaultdict(set)
+for _formal, _short_forms in NICKNAMES.items():
+    for _short in _short_forms:
+        _ALIASES[_formal].add(_short)
+        _ALIASES[_short].add(_formal)
+
+# Fuzzy matches below this trigram Dice similarity are rejected
+MIN_SIMILARITY = 0.6
+# Resolved names kept for repeat lookups (news re-mentions the same players constantly)
+CACHE_SIZE = 20000
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def name_key(name):
+    """Lookup key: normalized, punctuation and hyphens dropped, suffix removed ('Gary Trent Jr.' -> 'gary trent')."""
+    words = _NON_ALNUM.sub(" ", normalize_player_name(name).replace("'", "")).split()
+    while len(words) > 1 and words[-1] in SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def name_variants(name):
+    """Every key a player may be written as: the plain key, nickname first names, and joined hyphenated names."""
+    key = name_key(name)
+    if not key:
+        return set()
+    first, _, rest = key.partition(" ")
+    variants = {key}
+    for alias in _ALIASES.get(first, ()):
+        variants.add(f"{alias} {rest}".strip())
+    if "-" in normalize_player_name(name):
+        variants.add(name_key(normalize_player_name(name).replace("-", "")))
+    return variants
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerNameIndex:
+    """
+    Name -> PLAYER_ID index over nba_api's static player list.
+
+    Exact lookups (with suffix, accent, punctuation and nickname variants) are one
+    dict hit; single surnames resolve when unambiguous among active players; anything
+    else falls back to a trigram index scored with numpy. Active players win ties.
+    """
+
+    def __init__(self, player_list):
+        # Active players first, so ambiguous keys resolve to a current player
+        self.players = sorted(player_list, key=lambda p: not p.get('is_active'))
+        self.by_id = {p['id']: p for p in self.players}
+        self.ids = np.array([p['id'] for p in self.players], dtype=np.int64)
+        self.active = np.array([bool(p.get('is_active')) for p in self.players])
+
+        self.exact = {}
+        last_names = defaultdict(list)
+        for row, player in enumerate(self.players):
+            for key in name_variants(player['full_name']):
+                self.exact.setdefault(key, row)
+            last = name_key(player.get('last_name') or "")
+            if last and player.get('is_active'):
+                last_names[last].append(row)
+        # Surname-only mentions ('Jokic') are only safe when one active player has it
+        self.last_names = {last: rows[0] for last, rows in last_names.items() if len(rows) == 1}
+
+        postings = defaultdict(list)
+        self.gram_counts = np.zeros(len(self.players), dtype=np.int64)
+        for row, player in enumerate(self.players):
+            grams = trigrams(name_key(player['full_name']))
+            self.gram_counts[row] = len(grams)
+            for gram in grams:
+                postings[gram].append(row)
+        self.postings = {gram: np.array(rows, dtype=np.int64) for gram, rows in postings.items()}
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fuzzy(self, key):
+        grams = trigrams(key)
+        hits = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not hits:
+            return None, 0.0
+        shared = np.bincount(np.concatenate(hits), minlength=len(self.players))
+        dice = 2 * shared / (len(grams) + self.gram_counts)
+        dice = dice + self.active * 1e-6 # tie-break toward active players
+        row = int(np.argmax(dice))
+        return row, float(dice[row])
+
+    def match(self, name):
+        """(PLAYER_ID, similarity) for a free-text name; (None, 0.0) if nothing is close enough."""
+        with self._lock:
+            if name in self._cache:
+                self._cache.move_to_end(name)
+                return self._cache[name]
+
+        key = name_key(name)
+        row, score = self.exact.get(key), 1.0
+        if row is None and " " not in key:
+            # A lone surname is either unique among active players or unresolvable
+            row = self.last_names.get(key)
+        elif row is None:
+            row, score = self._fuzzy(key)
+            if score < MIN_SIMILARITY:
+                row = None
+        result = (int(self.ids[row]), round(score, 3)) if row is not None else (None, 0.0)
+
+        with self._lock:
+            self._cache[name] = result
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def resolve(self, name):
+        """PLAYER_ID for a name, or None."""
+        return self.match(name)[0]
+
+    def resolve_many(self, names):
+        """{name: PLAYER_ID or None} for many names; each distinct name is looked up once."""
+        return {name: self.resolve(name) for name in dict.fromkeys(names)}
+
+    def player(self, player_id):
+        return self.by_id.get(player_id)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_player_index():
+    """Process-wide index, built on first use (about 0.1s for ~5,000 players)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PlayerNameIndex(static_players.get_players())
+        return _index
+
+
+def resolve_player_ids(player_field):
+    """PLAYER_IDs for a news item's player field ('A; B' for multi-player items), unresolved names skipped."""
+    names = [name.strip() for name in (player_field or "").split(";") if name.strip()]
+    resolved = get_player_index().resolve_many(names)
+    return [resolved[name] for name in names if resolved[name] is not None]
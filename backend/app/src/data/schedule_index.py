@@ -0,0 +1,114 @@
+import datetime
+import numpy as np
+
+try:
+    from espn_api.basketball.constant import PRO_TEAM_MAP
+except ImportError:
+    PRO_TEAM_MAP = {}
+
+
+def _as_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+class ScheduleIndex:
+    """
+    Season schedule as a NumPy (NBA team x season day) game matrix.
+
+    Built with each league snapshot (see league_model). A roster's game counts over any date range are a
+    bincount of its players' team rows times a column slice of the matrix, instead
+    of walking every player's season schedule dict.
+    """
+
+    def __init__(self, team_dates):
+        """team_dates: {team key: iterable of game dates}"""
+        all_dates = [d for dates in team_dates.values() for d in dates]
+        self.start_date = min(all_dates) if all_dates else datetime.date.today()
+        n_days = ((max(all_dates) - self.start_date).days + 1) if all_dates else 0
+
+        self.team_keys = list(team_dates)
+        self.team_pos = {key: i for i, key in enumerate(self.team_keys)}
+        self.games = np.zeros((len(self.team_keys), n_days), dtype=np.int32)
+        for key, dates in team_dates.items():
+            cols = [(d - self.start_date).days for d in set(dates)]
+            self.games[self.team_pos[key], cols] = 1
+
+    @property
+    def n_days(self):
+        return self.games.shape[1]
+
+    # --- Roster Mapping ---
+
+    @staticmethod
+    def player_key(player):
+        """Row key for a player: their NBA team, or a private row when the team is unknown."""
+        team = getattr(player, 'proTeam', None)
+        if team and team != 'FA':
+            return team
+        return f"player:{getattr(player, 'playerId', id(player))}"
+
+    def team_indices(self, roster):
+        """Matrix rows for a roster's players (players without a schedule are skipped)."""
+        rows = [self.team_pos.get(self.player_key(player)) for player in roster]
+        return np.array([r for r in rows if r is not None], dtype=np.int64)
+
+    def roster_weights(self, roster):
+        """How many roster players each NBA team row contributes."""
+        return np.bincount(self.team_indices(roster), minlength=len(self.team_keys))
+
+    # --- Queries ---
+
+    def column_range(self, start_date, end_date):
+        """Clamped [start, stop) column slice for an inclusive date range."""
+        start = max((start_date - self.start_date).days, 0)
+        stop = min((end_date - self.start_date).days + 1, self.n_days)
+        return start, max(stop, start)
+
+    def daily_matrix(self, weights, start_date, end_date):
+        """
+        Games per day for many rosters at once: weights is (rosters x NBA team rows)
+        as produced by roster_weights(). Returns (rosters x days) over the inclusive range,
+        zero-padded where the range falls outside the schedule.
+        """
+        weights = np.atleast_2d(weights)
+        n_days = (end_date - start_date).days + 1
+        counts = np.zeros((weights.shape[0], max(n_days, 0)), dtype=np.int64)
+        start, stop = self.column_range(start_date, end_date)
+        if stop > start:
+            offset = start - (start_date - self.start_date).days
+            counts[:, offset:offset + (stop - start)] = weights @ self.games[:, start:stop]
+        return counts
+
+
+def build_schedule_index(league):
+    """
+    Builds the game matrix from the league's pro schedule (all NBA teams), adding a
+    row from the player's own schedule for any rostered player not covered by it.
+    """
+    team_dates = {}
+
+    pro_schedule = getattr(league, 'pro_schedule', None) or {}
+    for pro_team_id, games_by_period in pro_schedule.items():
+        key = PRO_TEAM_MAP.get(pro_team_id)
+        if not key or key == 'FA':
+            continue
+        dates = []
+        for games in games_by_period.values():
+            if games:
+                # Same conversion espn_api applies when building player.schedule
+                dates.append(datetime.datetime.fromtimestamp(games[0]['date'] / 1000.0).date())
+        team_dates[key] = dates
+
+    for team in getattr(league, 'teams', []):
+        for player in team.roster:
+            key = ScheduleIndex.player_key(player)
+            if key in team_dates or not getattr(player, 'schedule', None):
+                continue
+            team_dates[key] = [
+                _as_date(game.get('date')) for game in player.schedule.values() if game.get('date')
+            ]
+
+    return ScheduleIndex(team_dates)
+
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import httpx
+from app.src.utils import config
+
+# One pooled, keep-alive client per event loop (the app has one; tests may start several)
+_client = None
+_client_loop = None
+
+
+def get_client():
+    """Shared AsyncClient for the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(config.UPSTREAM_TIMEOUT_SECONDS, connect=10),
+            limits=httpx.Limits(max_connections=config.IO_POOL_SIZE, max_keepalive_connections=config.IO_POOL_SIZE),
+            follow_redirects=True,
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close():
+    """Closes the shared client's connections on application shutdown."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+class Page:
+    __slots__ = ('url', 'content', 'modified')
+
+    def __init__(self, url, content, modified):
+        self.url = url
+        self.content = content
+        self.modified = modified # False when the source answered 304 Not Modified
+
+
+class _Validators:
+    __slots__ = ('etag', 'last_modified', 'content')
+
+    def __init__(self, etag, last_modified, content):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+
+
+# url -> validators and body of the last 200 response
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+async def conditional_get(url, headers=None):
+    """
+    GET with If-None-Match / If-Modified-Since from the previous response to the
+    same URL. On 304 the previous body is returned with modified=False, so callers
+    can skip re-parsing an unchanged page. Raises httpx.HTTPStatusError on errors.
+    """
+    request_headers = dict(headers or {})
+    with _validators_lock:
+        cached = _validators.get(url)
+    if cached is not None:
+        if cached.etag:
+            request_headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            request_headers["If-Modified-Since"] = cached.last_modified
+
+    response = await get_client().get(url, headers=request_headers)
+    if response.status_code == 304 and cached is not None:
+        return Page(url, cached.content, modified=False)
+    response.raise_for_status()
+
+    etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+    if etag or last_modified:
+        with _validators_lock:
+            _validators[url] = _Validators(etag, last_modified, response.content)
+    return Page(url, response.content, modified=True)
+
+
+async def gather_limited(coros, limit=None):
+    """
+    Runs coroutines concurrently, at most `limit` at a time (default IO_POOL_SIZE).
+    Returns results in order; a failed coroutine's slot holds its exception.
+    """
+    semaphore = asyncio.Semaphore(limit or config.IO_POOL_SIZE)
+
+    async def bounded(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(bounded(coro) for coro in coros), return_exceptions=True)
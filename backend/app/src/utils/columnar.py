@@ -0,0 +1,66 @@
+# Binary encoders for columnar payloads ({column name: [values]}).
+# Both libraries are optional; formats whose encoder isn't installed are unavailable.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+MEDIA_TYPES = {
+    'records': 'application/json',
+    'columns': 'application/json',
+    'msgpack': 'application/msgpack',
+    'arrow': 'application/vnd.apache.arrow.stream',
+}
+
+# Accept header values that select a binary format
+ACCEPT_FORMATS = {
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.apache.arrow.stream': 'arrow',
+}
+
+
+def available_formats():
+    formats = ['records', 'columns']
+    if msgpack is not None:
+        formats.append('msgpack')
+    if pa is not None:
+        formats.append('arrow')
+    return formats
+
+
+def negotiate_format(requested, accept):
+    """
+    Output format from an explicit ?format= value, else the Accept header, else 'records'.
+    Raises ValueError for unknown or unavailable formats.
+    """
+    if requested:
+        if requested not in MEDIA_TYPES:
+            raise ValueError(f"Unknown format '{requested}'. Options: {', '.join(MEDIA_TYPES)}")
+        fmt = requested
+    else:
+        media = [part.split(';')[0].strip().lower() for part in (accept or "").split(',')]
+        fmt = next((ACCEPT_FORMATS[m] for m in media if m in ACCEPT_FORMATS), 'records')
+
+    if fmt not in available_formats():
+        raise ValueError(f"Format '{fmt}' is not available on this server. Options: {', '.join(available_formats())}")
+    return fmt
+
+
+def encode_msgpack(columns, meta):
+    return msgpack.packb({**meta, "columns": list(columns), "data": columns}, use_bin_type=True)
+
+
+def encode_arrow(columns, meta):
+    """Arrow IPC stream of one record batch; paging metadata goes in the schema metadata."""
+    batch = pa.record_batch(list(columns.values()), names=list(columns))
+    batch = batch.replace_schema_metadata({key: str(value) for key, value in meta.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
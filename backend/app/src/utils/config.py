@@ -20,8 +20,67 @@ def get_config(key, default=None):
     return os.getenv(key, default)
 
 LEAGUE_ID = get_config("LEAGUE_ID")
+# Leagues the API serves and the scheduler keeps warm (comma-separated), loaded concurrently; defaults to LEAGUE_ID
+LEAGUE_IDS = [league_id.strip() for league_id in get_config("LEAGUE_IDS", LEAGUE_ID or "").split(",") if league_id.strip()]
 SEASON = int(get_config("Season", 2025)) # Fallback to 2025
 ESPN_S2 = get_config("ESPN_S2")
 SWID = get_config("SWID")
 
+# NBA stats (nba_api) settings
+NBA_STATS_SEASON = get_config("NBA_STATS_SEASON", "2024-25")
+LEAGUE_STATS_TTL_MINUTES = int(get_config("LEAGUE_STATS_TTL_MINUTES", 60))
+GAME_LOGS_TTL_MINUTES = int(get_config("GAME_LOGS_TTL_MINUTES", 180))
+
+# stats.nba.com client (see app/src/data/nba_stats_client.py): rate limit, retries, circuit breaker
+NBA_STATS_REQUESTS_PER_SECOND = float(get_config("NBA_STATS_REQUESTS_PER_SECOND", 1))
+NBA_STATS_BURST = int(get_config("NBA_STATS_BURST", 3))
+NBA_STATS_TIMEOUT_SECONDS = float(get_config("NBA_STATS_TIMEOUT_SECONDS", 30))
+NBA_STATS_MAX_RETRIES = int(get_config("NBA_STATS_MAX_RETRIES", 3))
+NBA_STATS_BACKOFF_SECONDS = float(get_config("NBA_STATS_BACKOFF_SECONDS", 1)) # doubles per retry, with jitter
+NBA_STATS_BREAKER_FAILURES = int(get_config("NBA_STATS_BREAKER_FAILURES", 3))
+NBA_STATS_BREAKER_RESET_SECONDS = float(get_config("NBA_STATS_BREAKER_RESET_SECONDS", 300))
+
+# Local data directory (game-log warehouse etc.), defaults to backend/data
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DATA_DIR = get_config("DATA_DIR", os.path.join(BACKEND_DIR, "data"))
+
+# News ingestion (see app/services/news_service.py)
+NEWS_REFRESH_MINUTES = float(get_config("NEWS_REFRESH_MINUTES", 10))
+NEWS_POLLING = get_config("NEWS_POLLING", "1") == "1"
+NEWS_MAX_ITEMS = int(get_config("NEWS_MAX_ITEMS", 2000))
+# Extra RSS/Atom sources next to NBC Sports: "Name|url;Name|url|TEAM" (see app/src/data/news_sources.py)
+NEWS_RSS_FEEDS = get_config("NEWS_RSS_FEEDS", "")
+
+# Execution pools for blocking upstream calls (see app/services/executor.py)
+IO_POOL_SIZE = int(get_config("IO_POOL_SIZE", 16))
+CPU_POOL_SIZE = int(get_config("CPU_POOL_SIZE", 0)) # 0 = run CPU work on the I/O threads
+UPSTREAM_TIMEOUT_SECONDS = float(get_config("UPSTREAM_TIMEOUT_SECONDS", 30))
+
+# ESPN league connections (see app/src/data/espn_connector.py)
+ESPN_LEAGUE_CACHE_SIZE = int(get_config("ESPN_LEAGUE_CACHE_SIZE", 8))
+ESPN_LEAGUE_TTL_MINUTES = float(get_config("ESPN_LEAGUE_TTL_MINUTES", 360)) # full reload
+ESPN_ROSTER_REFRESH_MINUTES = float(get_config("ESPN_ROSTER_REFRESH_MINUTES", 5))
+
+# Persistent upstream cache (see app/src/utils/disk_cache.py). OFFLINE_MODE=1 serves
+# last-known data without contacting stats.nba.com, ESPN or NBC Sports.
+DISK_CACHE_MAX_MB = float(get_config("DISK_CACHE_MAX_MB", 256))
+OFFLINE_MODE = get_config("OFFLINE_MODE", "0") == "1"
+
+# Background refresh pipeline (see app/services/scheduler.py)
+SCHEDULER_ENABLED = get_config("SCHEDULER_ENABLED", "1") == "1"
+GAME_LOGS_REFRESH_HOUR_UTC = int(get_config("GAME_LOGS_REFRESH_HOUR_UTC", 10)) # after the night's games are final
+STARTUP_WARM_TIMEOUT_SECONDS = float(get_config("STARTUP_WARM_TIMEOUT_SECONDS", 60))
+
+# Responses at least this large are compressed (brotli when brotli-asgi is installed, else gzip)
+COMPRESSION_MIN_BYTES = int(get_config("COMPRESSION_MIN_BYTES", 1024))
+
+# Cache-Control/ETag headers and 304 responses (see app/src/utils/http_cache.py)
+HTTP_CACHE_ENABLED = get_config("HTTP_CACHE_ENABLED", "1") == "1"
+
+# Server-sent event stream of news and ranking changes (see app/services/event_hub.py)
+EVENTS_QUEUE_SIZE = int(get_config("EVENTS_QUEUE_SIZE", 100)) # per client; a client further behind is told to resync
+EVENTS_HISTORY_SIZE = int(get_config("EVENTS_HISTORY_SIZE", 500)) # replayed to clients reconnecting with Last-Event-ID
+EVENTS_KEEPALIVE_SECONDS = float(get_config("EVENTS_KEEPALIVE_SECONDS", 15))
+EVENTS_MAX_SUBSCRIBERS = int(get_config("EVENTS_MAX_SUBSCRIBERS", 5000))
+
 print(f"DEBUG: Config Loaded - League: {LEAGUE_ID}, Season: {SEASON}")
@@ -0,0 +1,193 @@
+import contextlib
+import datetime
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from app.src.utils import config
+
+logger = logging.getLogger(__name__)
+
+# How old a disk copy may be and still be served instead of calling upstream
+# on a process's first request (warm start). Older copies are only served
+# as a fallback when upstream fails, or in offline mode.
+SOURCE_TTLS = {
+    'nba_stats': datetime.timedelta(minutes=config.LEAGUE_STATS_TTL_MINUTES),
+    'espn_league': datetime.timedelta(minutes=config.ESPN_LEAGUE_TTL_MINUTES),
+    'news': datetime.timedelta(minutes=config.NEWS_REFRESH_MINUTES),
+}
+
+
+class OfflineCacheMiss(LookupError):
+    """Offline mode (or a failed upstream call) with nothing cached to fall back on."""
+
+
+class DiskCache:
+    """
+    Persistent upstream-response cache: one SQLite table of zlib-compressed pickles
+    keyed by (source, key). Total size is bounded; the least recently read entries
+    are evicted first.
+    """
+
+    def __init__(self, path, max_bytes):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    source TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (source, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn: # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, source, key):
+        """Returns (value, stored_at) or None."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, stored_at FROM entries WHERE source = ? AND key = ?", (source, key)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE source = ? AND key = ?", (time.time(), source, key)
+            )
+        try:
+            value = pickle.loads(zlib.decompress(row[0]))
+        except Exception as e:
+            logger.error(f"Dropping unreadable cache entry {source}/{key}: {e}")
+            self.delete(source, key)
+            return None
+        return value, datetime.datetime.fromtimestamp(row[1])
+
+    def put(self, source, key, value):
+        blob = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        if len(blob) > self.max_bytes:
+            logger.warning(f"Not caching {source}/{key}: {len(blob)} bytes exceeds the cache size")
+            return
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (source, key, value, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (source, key, sqlite3.Binary(blob), len(blob), now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for source, key, size in conn.execute(
+            "SELECT source, key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            conn.execute("DELETE FROM entries WHERE source = ? AND key = ?", (source, key))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, source, key):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE source = ? AND key = ?", (source, key))
+
+    def stats(self):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT source, COUNT(*), COALESCE(SUM(size), 0), MAX(stored_at) FROM entries GROUP BY source"
+            ).fetchall()
+        return {
+            "path": self.path,
+            "max_bytes": self.max_bytes,
+            "bytes": sum(row[2] for row in rows),
+            "sources": {
+                source: {
+                    "entries": count,
+                    "bytes": size,
+                    "newest": datetime.datetime.fromtimestamp(newest).isoformat() if newest else None,
+                }
+                for source, count, size, newest in rows
+            },
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# (source, key) pairs already served once by this process. Callers run on the
+# I/O pool, so the check-and-add is locked: only one of them takes the warm-start path.
+_warm = set()
+_warm_lock = threading.Lock()
+
+
+def get_disk_cache():
+    """Process-wide cache at DATA_DIR/cache.sqlite3."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = os.path.join(config.DATA_DIR, 'cache.sqlite3')
+            _cache = DiskCache(path, max_bytes=int(config.DISK_CACHE_MAX_MB * 1024 * 1024))
+        return _cache
+
+
+def cached_call(source, key, loader):
+    """
+    Calls an upstream loader through the disk cache.
+
+    - Offline mode: never calls upstream; serves the stored copy, whatever its age.
+    - First call for this key in the process: serves the stored copy if it is within
+      the source's TTL, so restarts don't re-download everything.
+    - Otherwise calls upstream and stores the result (the in-memory caches above
+      this decide how often that happens). If upstream fails, the last-known copy
+      is served instead.
+    """
+    cache = get_disk_cache()
+
+    if config.OFFLINE_MODE:
+        hit = cache.get(source, key)
+        if hit is None:
+            raise OfflineCacheMiss(f"Offline mode: no cached {source} data for {key}")
+        return hit[0]
+
+    with _warm_lock:
+        first_call = (source, key) not in _warm
+        _warm.add((source, key))
+    if first_call:
+        hit = cache.get(source, key)
+        ttl = SOURCE_TTLS.get(source)
+        if hit is not None and ttl is not None and datetime.datetime.now() - hit[1] <= ttl:
+            logger.info(f"Serving {source}/{key} from disk cache (stored {hit[1]:%Y-%m-%d %H:%M})")
+            return hit[0]
+
+    try:
+        value = loader()
+    except Exception as e:
+        hit = cache.get(source, key)
+        if hit is None:
+            raise
+        logger.warning(f"{source} upstream failed ({e}); serving last-known copy from {hit[1]:%Y-%m-%d %H:%M}")
+        return hit[0]
+
+    try:
+        cache.put(source, key, value)
+    except Exception as e:
+        # Caching is best-effort; never fail the request over it
+        logger.error(f"Could not write {source}/{key} to disk cache: {e}")
+    return value
@@ -0,0 +1,112 @@
+import asyncio
+import datetime
+import decimal
+import functools
+import json
+import math
+import numpy as np
+import pandas as pd
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute
+from fastapi.responses import JSONResponse, Response
+
+# orjson is several times faster than the stdlib and serializes NumPy arrays
+# natively; fall back to json (with the same type handling) if it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(obj):
+    """Types neither serializer handles natively: NumPy/pandas values, dates, sets, models."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict(orient='records')
+    if isinstance(obj, pd.Series):
+        return obj.tolist()
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, 'model_dump'):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _clean_floats(value):
+    # stdlib fallback only: NaN/inf are not valid JSON, orjson writes them as null
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _clean_floats(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean_floats(item) for item in value]
+    try:
+        return _clean_floats(_default(value))
+    except TypeError:
+        return value
+
+
+def dumps(content):
+    """Serializes API content to JSON bytes; NaN and infinities become null."""
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(
+        _clean_floats(content), default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps() (orjson when installed)."""
+
+    def render(self, content):
+        return dumps(content)
+
+
+def _as_response(result, status_code):
+    if isinstance(result, Response):
+        return result
+    return FastJSONResponse(result, status_code=status_code or 200)
+
+
+class FastJSONRoute(APIRoute):
+    """
+    Route class that hands an endpoint's return value straight to FastJSONResponse,
+    skipping FastAPI's per-value jsonable_encoder pass (the slow part for large
+    list-of-dict payloads). Endpoints with a response_model or return annotation
+    keep FastAPI's validation path.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        response_model = kwargs.get('response_model')
+        has_model = response_model is not None and not isinstance(response_model, DefaultPlaceholder)
+        annotated = endpoint.__annotations__.get('return') is not None
+        wrapped = getattr(endpoint, '_fast_json', False) # routes are re-created by include_router
+        if not has_model and not annotated and not wrapped:
+            endpoint = _direct_json(endpoint, kwargs.get('status_code'))
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _direct_json(endpoint, status_code):
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            return _as_response(await endpoint(*args, **kwargs), status_code)
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            return _as_response(endpoint(*args, **kwargs), status_code)
+    wrapper._fast_json = True
+    return wrapper
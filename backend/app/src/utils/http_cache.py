@@ -0,0 +1,168 @@
+import hashlib
+import time
+from urllib.parse import parse_qsl
+from starlette.datastructures import Headers, MutableHeaders
+
+# ETags carry the process start time: snapshot versions restart at 0 with the
+# process, so a version number alone could match a tag issued before a restart.
+_BOOT = format(int(time.time()), "x")
+
+
+def cache_version(*caches):
+    """Version token for SnapshotCaches (see snapshot_cache.py); None until all are loaded."""
+    parts = []
+    for cache in caches:
+        if cache.version == 0:
+            return None
+        parts.append(str(cache.version))
+    return ".".join(parts)
+
+
+def caches_fresh(*caches):
+    """False once any cache is past its TTL: the next read starts its background refresh."""
+    return not any(cache.is_stale() for cache in caches)
+
+
+class CacheRule:
+    """
+    Caching policy for every GET route under `prefix`.
+
+    - version(): token for the data the route serves (None: no ETag). Responses get
+      a weak ETag of the token plus the request's query and `vary` headers.
+    - fresh(): whether a matching If-None-Match may be answered with 304 before the
+      route runs. While False, the route still runs (so reads trigger refreshes)
+      and the 304 is decided from its result.
+    - max_age=None sends Cache-Control: no-store.
+    """
+
+    __slots__ = ('prefix', 'max_age', 'stale_while_revalidate', 'private', 'version', 'fresh', 'vary')
+
+    def __init__(self, prefix, max_age=None, stale_while_revalidate=0, private=False, version=None, fresh=None, vary=()):
+        self.prefix = prefix
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.private = private
+        self.version = version or (lambda: None)
+        self.fresh = fresh or (lambda: True)
+        self.vary = tuple(vary)
+
+    def cache_control(self):
+        if self.max_age is None:
+            return "no-store"
+        value = f"{'private' if self.private else 'public'}, max-age={self.max_age}"
+        if self.stale_while_revalidate:
+            value += f", stale-while-revalidate={self.stale_while_revalidate}"
+        return value
+
+    def headers(self, etag=None):
+        headers = {"Cache-Control": self.cache_control()}
+        if etag:
+            headers["ETag"] = etag
+        if self.vary:
+            headers["Vary"] = ", ".join(self.vary)
+        return headers
+
+
+def _request_key(scope, headers, vary):
+    query = sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True))
+    key = scope["path"] + "?" + "&".join(f"{k}={v}" for k, v in query)
+    key += "".join(f"|{name}={headers.get(name, '')}" for name in vary)
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+def _etag(version, key):
+    return f'W/"{_BOOT}-{version}-{key}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class HTTPCacheMiddleware:
+    """
+    Adds Cache-Control and ETag headers to GET/HEAD responses per CacheRule, and
+    answers If-None-Match with 304. Routes that set their own ETag keep it.
+    Add it inside CORS, so 304s still carry the CORS headers.
+    """
+
+    def __init__(self, app, rules=()):
+        self.app = app
+        self.rules = sorted(rules, key=lambda rule: len(rule.prefix), reverse=True) # longest prefix wins
+
+    def _rule(self, path):
+        for rule in self.rules:
+            if path.startswith(rule.prefix):
+                return rule
+        return None
+
+    async def __call__(self, scope, receive, send):
+        rule = self._rule(scope["path"]) if scope["type"] == "http" and scope["method"] in ("GET", "HEAD") else None
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        if_none_match = request_headers.get("if-none-match")
+        key = _request_key(scope, request_headers, rule.vary)
+        version = rule.version()
+
+        if if_none_match and version is not None and rule.fresh():
+            etag = _etag(version, key)
+            if etag_matches(if_none_match, etag):
+                await self._send_not_modified(send, rule, etag)
+                return
+
+        not_modified = False
+
+        async def send_with_headers(message):
+            nonlocal not_modified
+            if message["type"] == "http.response.start":
+                if message["status"] != 200:
+                    await send(message)
+                    return
+                headers = MutableHeaders(scope=message)
+                etag = headers.get("etag")
+                # Don't tag the response if a refresh landed while the route ran
+                current = rule.version()
+                if etag is None and current is not None and version in (None, current):
+                    etag = _etag(current, key)
+                    headers["ETag"] = etag
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = rule.cache_control()
+                for name in rule.vary:
+                    headers.add_vary_header(name)
+                if etag_matches(if_none_match, etag):
+                    not_modified = True
+                    await self._send_not_modified(send, rule, etag, body=False)
+                    return
+                await send(message)
+            elif not_modified:
+                if not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+    @staticmethod
+    async def _send_not_modified(send, rule, etag, body=True):
+        headers = rule.headers(etag)
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()],
+        })
+        if body:
+            await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,8 @@
+import unicodedata
+
+
+def normalize_player_name(name):
+    """Lowercase, accent-free, single-spaced key for player lookups ('Nikola Jokić' -> 'nikola jokic')."""
+    decomposed = unicodedata.normalize('NFKD', name or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().replace(".", "").split())
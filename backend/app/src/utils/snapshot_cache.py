@@ -0,0 +1,199 @@
+import datetime
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotCache:
+    """
+    Process-wide holder for one expensive upstream snapshot (e.g. the league-dash frame).
+
+    - First call loads synchronously; concurrent callers wait on the same load (single-flight).
+    - Once the TTL expires, callers get the stale snapshot immediately while one
+      background thread fetches the replacement (stale-while-revalidate).
+    - If a refresh fails, the previous snapshot keeps being served, and the next
+      background refresh waits retry_after (doubling per consecutive failure, up to
+      the TTL) so an upstream outage isn't hit once per request.
+    """
+
+    def __init__(self, loader, ttl, name="snapshot", retry_after=datetime.timedelta(minutes=1)):
+        self._loader = loader
+        self._ttl = ttl
+        self._name = name
+        self._retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._load_done = threading.Condition(self._lock)
+        self._loading = False
+
+        self._value = None
+        self._loaded_at = None
+        self._version = 0
+        self._last_error = None
+        self._failures = 0
+        self._retry_at = None # no background refresh before this after a failed one
+        self._listeners = []
+
+    # --- Introspection ---
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def version(self):
+        """Increments every time a new snapshot is stored."""
+        return self._version
+
+    @property
+    def loaded_at(self):
+        return self._loaded_at
+
+    def is_stale(self, now=None):
+        if self._loaded_at is None:
+            return True
+        now = now or datetime.datetime.now()
+        return now - self._loaded_at >= self._ttl
+
+    def backing_off(self, now=None):
+        """True while a failed refresh's retry delay is running."""
+        if self._retry_at is None:
+            return False
+        return (now or datetime.datetime.now()) < self._retry_at
+
+    def status(self):
+        return {
+            "name": self._name,
+            "version": self._version,
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "stale": self.is_stale(),
+            "refreshing": self._loading,
+            "last_error": self._last_error,
+            "retry_at": self._retry_at.isoformat() if self._retry_at else None,
+        }
+
+    # --- Access ---
+
+    def get(self):
+        """
+        Returns the current snapshot, loading it if none exists yet.
+        Raises the loader's exception only when there is nothing to fall back on
+        (and, until the retry delay passes, without calling the loader again).
+        """
+        with self._lock:
+            if self._value is not None:
+                if self.is_stale() and not self._loading and not self.backing_off():
+                    self._start_background_refresh()
+                return self._value
+
+            # Nothing cached yet: either join the in-flight load or start one.
+            if self._loading:
+                while self._loading:
+                    self._load_done.wait()
+                if self._value is not None:
+                    return self._value
+                raise RuntimeError(f"{self._name} load failed: {self._last_error}")
+            if self.backing_off():
+                raise RuntimeError(f"{self._name} load failed: {self._last_error}")
+
+            self._loading = True
+
+        # Cold load runs on the caller's thread; other callers block above.
+        self._run_loader()
+        with self._lock:
+            if self._value is None:
+                raise RuntimeError(f"{self._name} load failed: {self._last_error}")
+            return self._value
+
+    def peek(self):
+        """Returns whatever is cached (possibly None) without triggering a load."""
+        return self._value
+
+    def refresh(self, wait=True, raise_errors=False):
+        """
+        Forces a reload. With wait=False the reload runs on a background thread.
+        Returns False if a reload was already in flight. With raise_errors, a failed
+        reload raises this run's exception (the previous snapshot is still kept).
+        """
+        with self._lock:
+            if self._loading:
+                return False
+            if not wait:
+                self._start_background_refresh()
+                return True
+            self._loading = True
+        error = self._run_loader()
+        if raise_errors and error is not None:
+            raise error
+        return True
+
+    def set(self, value):
+        """Stores a snapshot loaded outside the cache (e.g. by an async refresh job)."""
+        with self._lock:
+            previous = self._value
+            self._value = value
+            self._loaded_at = datetime.datetime.now()
+            self._version += 1
+            self._last_error = None
+            self._failures = 0
+            self._retry_at = None
+        self._notify(previous, value)
+
+    def add_listener(self, callback):
+        """
+        Calls callback(previous, snapshot) every time a new snapshot is stored, on the
+        thread that stored it. previous is None for the first load.
+        """
+        self._listeners.append(callback)
+
+    def invalidate(self):
+        """Marks the snapshot stale so the next get() triggers a refresh."""
+        with self._lock:
+            self._loaded_at = None
+
+    # --- Internals ---
+
+    def _start_background_refresh(self):
+        # Caller holds self._lock
+        self._loading = True
+        thread = threading.Thread(target=self._run_loader, name=f"{self._name}-refresh", daemon=True)
+        thread.start()
+
+    def _run_loader(self):
+        value = None
+        error = None
+        try:
+            value = self._loader()
+        except Exception as e:
+            error = e
+            logger.error(f"{self._name} refresh failed: {e}")
+
+        stored = False
+        with self._lock:
+            previous = self._value
+            if error is None and value is not None:
+                self._value = value
+                self._loaded_at = datetime.datetime.now()
+                self._version += 1
+                self._last_error = None
+                self._failures = 0
+                self._retry_at = None
+                stored = True
+            elif error is not None:
+                self._last_error = str(error)
+                self._failures += 1
+                delay = min(self._retry_after * 2 ** min(self._failures - 1, 10), max(self._ttl, self._retry_after))
+                self._retry_at = datetime.datetime.now() + delay
+            self._loading = False
+            self._load_done.notify_all()
+        if stored:
+            self._notify(previous, value)
+        return error
+
+    def _notify(self, previous, value):
+        for callback in self._listeners:
+            try:
+                callback(previous, value)
+            except Exception as e:
+                logger.error(f"{self._name} listener failed: {e}")
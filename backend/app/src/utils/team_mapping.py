@@ -32,6 +32,22 @@ NBA_TEAMS = {
     "WAS": "Washington Wizards"
 }
 
+# Alternate abbreviations used by some sources (NBC Sports, ESPN)
+TEAM_ALIASES = {
+    "NO": "NOP",
+    "PHO": "PHX",
+    "GS": "GSW",
+    "SA": "SAS",
+    "NY": "NYK",
+    "UTAH": "UTA",
+    "WSH": "WAS",
+}
+
+def normalize_team_abbr(abbreviation):
+    """Maps alternate abbreviations (e.g. 'PHO') to the canonical NBA one ('PHX')."""
+    abbr = (abbreviation or "").upper()
+    return TEAM_ALIASES.get(abbr, abbr)
+
 def get_full_team_name(abbreviation):
     """Convert team abbreviation to full name."""
-    return NBA_TEAMS.get(abbreviation, abbreviation)
+    return NBA_TEAMS.get(normalize_team_abbr(abbreviation), abbreviation)
@@ -0,0 +1,87 @@
+"""
+Benchmark for the NBC Sports news parser.
+
+Builds a realistic page from the saved fixture post (debug_item.html at the repo root)
+surrounded by page chrome, then compares the original full BeautifulSoup parse
+('soup-full') against the SoupStrainer-limited parse ('soup') and the lxml path ('lxml').
+
+Usage (from backend/):
+    python benchmarks/bench_news_parser.py [--posts 60] [--runs 20] [--page saved_page.html]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.src.data import news_aggregator  # noqa: E402
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FIXTURE = os.path.join(REPO_ROOT, "debug_item.html")
+
+CHROME_BLOCK = (
+    '<div class="Nav"><ul>' + ''.join(f'<li class="Nav-item"><a href="/nav/{i}">Link {i}</a></li>' for i in range(40)) + '</ul></div>'
+    '<script>' + 'var x = 1;' * 400 + '</script>'
+    '<style>' + '.a{color:red}' * 400 + '</style>'
+)
+
+
+def build_page(posts):
+    with open(FIXTURE, encoding="utf-8") as f:
+        post = f.read()
+    body = "".join(
+        post.replace("playerNewsId=0000019b-58bb-d968-a19b-58fb23890000", f"playerNewsId=fixture-{i}")
+        for i in range(posts)
+    )
+    return f"<html><head>{CHROME_BLOCK}</head><body>{CHROME_BLOCK}<main>{body}</main>{CHROME_BLOCK}</body></html>".encode("utf-8")
+
+
+def measure(html, mode, runs):
+    # Timing
+    start = time.perf_counter()
+    for _ in range(runs):
+        items = news_aggregator.parse_news_page(html, mode=mode)
+    elapsed_ms = (time.perf_counter() - start) / runs * 1000
+
+    # Peak memory of a single parse
+    tracemalloc.start()
+    news_aggregator.parse_news_page(html, mode=mode)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, elapsed_ms, peak / 1024
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--posts", type=int, default=60, help="news posts in the synthetic page")
+    arg_parser.add_argument("--runs", type=int, default=20)
+    arg_parser.add_argument("--page", help="parse a saved full page instead of the synthetic one")
+    args = arg_parser.parse_args()
+
+    if args.page:
+        with open(args.page, "rb") as f:
+            html = f.read()
+    else:
+        html = build_page(args.posts)
+
+    modes = ["soup-full", "soup"]
+    if news_aggregator.lxml_html is not None:
+        modes.append("lxml")
+
+    print(f"Page size: {len(html) / 1024:.0f} KiB, runs: {args.runs}")
+    print(f"{'mode':<10} {'items':>5} {'ms/parse':>9} {'peak KiB':>9} {'speedup':>8}")
+
+    baseline_items = baseline_ms = None
+    for mode in modes:
+        items, ms, peak = measure(html, mode, args.runs)
+        if baseline_items is None:
+            baseline_items, baseline_ms = items, ms
+        elif items != baseline_items:
+            print(f"WARNING: '{mode}' output differs from 'soup-full'")
+        print(f"{mode:<10} {len(items):>5} {ms:>9.2f} {peak:>9.0f} {baseline_ms / ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
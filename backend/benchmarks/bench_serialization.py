@@ -0,0 +1,148 @@
+"""
+Benchmark for JSON response serialization.
+
+Builds synthetic payloads shaped like the heaviest endpoints (full /nba/rankings,
+the consistency batch, a season outlook and the news feed) and compares FastAPI's
+default path ('default': jsonable_encoder + json.dumps) with app.src.utils.fast_json
+('fast': orjson when installed). No network access is needed.
+
+Usage (from backend/):
+    python benchmarks/bench_serialization.py [--players 550] [--runs 20]
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from app.src.analysis import zscore_engine  # noqa: E402
+from app.src.utils import fast_json  # noqa: E402
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM']
+
+
+def league_dash_frame(players, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'PLAYER_ID': np.arange(1_600_000, 1_600_000 + players),
+        'PLAYER_NAME': [f'Player {i}' for i in range(players)],
+        'TEAM_ABBREVIATION': rng.choice(TEAMS, players),
+        'GP': rng.integers(1, 60, players),
+        'MIN': rng.uniform(5, 38, players),
+    })
+    frame['FGA'] = rng.uniform(1, 20, players)
+    frame['FGM'] = frame['FGA'] * rng.uniform(0.35, 0.65, players)
+    frame['FG_PCT'] = frame['FGM'] / frame['FGA']
+    frame['FTA'] = rng.uniform(0, 8, players)
+    frame['FTM'] = frame['FTA'] * rng.uniform(0.5, 0.95, players)
+    frame['FT_PCT'] = np.where(frame['FTA'] > 1, frame['FTM'] / frame['FTA'], np.nan) # no attempts -> NaN
+    for col, high in [('FG3M', 4), ('PTS', 30), ('REB', 12), ('AST', 10), ('STL', 2), ('BLK', 2.5), ('TOV', 4)]:
+        frame[col] = rng.uniform(0, high, players)
+    return frame
+
+
+def rankings_payload(players):
+    table = zscore_engine.build_ranking_table(league_dash_frame(players))
+    order, totals = zscore_engine.rank_players(table)
+    return zscore_engine.to_records(table, order, totals)
+
+
+def consistency_payload(players, seed=1):
+    rng = np.random.default_rng(seed)
+    cats = ['PTS', 'REB', 'AST', 'STL', 'BLK', 'FG3M', 'TOV', 'FG_PCT', 'FT_PCT']
+    return {
+        str(1_600_000 + i): {
+            "games": int(rng.integers(5, 60)),
+            "categories": {
+                cat: {"mean": rng.uniform(0, 20), "std": rng.uniform(0, 5), "cv": rng.uniform(0, 1)}
+                for cat in cats
+            },
+            "score": np.float64(rng.uniform(0, 100)),
+        }
+        for i in range(players)
+    }
+
+
+def season_outlook_payload(teams=12, periods=20, seed=2):
+    rng = np.random.default_rng(seed)
+    totals = rng.integers(20, 60, (teams, periods))
+    return {
+        "period_ids": list(range(1, periods + 1)),
+        "periods": [
+            {"period": p + 1, "start": (datetime.date(2025, 10, 21) + datetime.timedelta(weeks=p)).isoformat(),
+             "end": (datetime.date(2025, 10, 27) + datetime.timedelta(weeks=p)).isoformat()}
+            for p in range(periods)
+        ],
+        "teams": [
+            {"id": t + 1, "name": f"Team {t + 1}", "period_totals": totals[t], "season_total": totals[t].sum()}
+            for t in range(teams)
+        ],
+    }
+
+
+def news_payload(items=300):
+    return [
+        {
+            "id": f"news-{i}",
+            "player": f"Player {i % 200}",
+            "headline": f"Player {i % 200} scores {20 + i % 30} points in win",
+            "content": "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 6,
+            "timestamp": (datetime.datetime(2025, 11, 1) - datetime.timedelta(minutes=17 * i)).isoformat(),
+            "source": "NBC Sports",
+        }
+        for i in range(items)
+    ]
+
+
+def default_dumps(content):
+    # What a plain FastAPI endpoint does; allow_nan=True so NaN payloads don't abort the comparison
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def measure(dumps, content, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        body = dumps(content)
+    return body, (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--players", type=int, default=550, help="players in the rankings/consistency payloads")
+    arg_parser.add_argument("--runs", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    payloads = {
+        "/nba/rankings": rankings_payload(args.players),
+        "/nba/consistency/batch": consistency_payload(args.players),
+        "/matchup/season": season_outlook_payload(),
+        "/news": news_payload(),
+    }
+
+    print(f"Serializer: {'orjson' if fast_json.orjson is not None else 'json (orjson not installed)'}, runs: {args.runs}")
+    print(f"{'endpoint':<24} {'default ms':>10} {'fast ms':>8} {'speedup':>8} {'KiB':>6} {'gzip KiB':>9}")
+    for endpoint, content in payloads.items():
+        # jsonable_encoder rejects NumPy arrays (the season outlook), so the default path fails there
+        try:
+            _, default_ms = measure(default_dumps, content, args.runs)
+            default_col = f"{default_ms:>10.2f}"
+        except (TypeError, ValueError):
+            default_ms, default_col = None, f"{'fails':>10}"
+        body, fast_ms = measure(fast_json.dumps, content, args.runs)
+        speedup = f"{default_ms / fast_ms:>7.1f}x" if default_ms else f"{'-':>8}"
+        print(
+            f"{endpoint:<24} {default_col} {fast_ms:>8.2f} {speedup} "
+            f"{len(body) / 1024:>6.0f} {len(gzip.compress(body, 6)) / 1024:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import datetime
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+# Import the app from backend/ without the background scheduler or the repo's data dir
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SCHEDULER_ENABLED", "0")
+os.environ.setdefault("OFFLINE_MODE", "1")
+
+
+def league_frame(n=60, seed=0):
+    """A league-dash shaped frame (LEAGUE_DASH_COLS) with random per-game stats."""
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'PLAYER_ID': np.arange(1000, 1000 + n),
+        'PLAYER_NAME': [f'Player {i}' for i in range(n)],
+        'TEAM_ABBREVIATION': rng.choice(['LAL', 'BOS', 'MIA'], n),
+        'MIN': rng.uniform(5, 38, n),
+    })
+    frame['FGA'] = rng.uniform(1, 20, n)
+    frame['FGM'] = frame['FGA'] * rng.uniform(0.35, 0.65, n)
+    frame['FG_PCT'] = frame['FGM'] / frame['FGA']
+    frame['FTA'] = rng.uniform(0.5, 8, n)
+    frame['FTM'] = frame['FTA'] * rng.uniform(0.5, 0.95, n)
+    frame['FT_PCT'] = frame['FTM'] / frame['FTA']
+    for cat, high in [('FG3M', 4), ('PTS', 30), ('REB', 12), ('AST', 10), ('STL', 2), ('BLK', 2.5), ('TOV', 4)]:
+        frame[cat] = rng.uniform(0, high, n)
+    return frame[['PLAYER_ID', 'PLAYER_NAME', 'TEAM_ABBREVIATION', 'MIN', 'FGM', 'FGA', 'FG_PCT', 'FTM', 'FTA',
+                  'FT_PCT', 'FG3M', 'PTS', 'REB', 'AST', 'STL', 'BLK', 'TOV']]
+
+
+@pytest.fixture
+def ranking_table():
+    from app.src.analysis import zscore_engine
+    return zscore_engine.build_ranking_table(league_frame())
+
+
+# --- Fake espn_api league ---
+
+SEASON_START = datetime.date(2025, 10, 21) # matchup_calendar's 2026 season start
+PRO_TEAMS = {1: 'ATL', 2: 'BOS', 4: 'CHI', 13: 'LAL'} # espn_api PRO_TEAM_MAP ids
+
+
+def pro_game_dates(pro_team_id, days=180):
+    """A deterministic schedule: each team plays every 2nd or 3rd day from the season start."""
+    step = 2 + pro_team_id % 2
+    return [SEASON_START + datetime.timedelta(days=day) for day in range(pro_team_id % step, days, step)]
+
+
+class FakePlayer:
+    def __init__(self, player_id, name, pro_team, position='PG', slots=('PG', 'G'), injury='ACTIVE', lineup='PG', schedule=None):
+        self.playerId = player_id
+        self.name = name
+        self.proTeam = pro_team
+        self.position = position
+        self.eligibleSlots = list(slots)
+        self.injuryStatus = injury
+        self.lineupSlot = lineup
+        self.schedule = schedule or {}
+
+
+class FakeTeam:
+    def __init__(self, team_id, roster):
+        self.team_id = team_id
+        self.team_name = f'Team {team_id}'
+        self.team_abbrev = f'T{team_id}'
+        self.roster = roster
+        self.schedule = []
+
+
+class FakeMatchup:
+    def __init__(self, home_team, away_team):
+        self.home_team = home_team
+        self.away_team = away_team
+
+
+class FakeLeague:
+    """The parts of an espn_api basketball League that league_model reads."""
+
+    def __init__(self, league_id=1, year=2026, periods=24):
+        self.league_id = league_id
+        self.year = year
+        self.pro_schedule = {
+            pro_team_id: {
+                str(i): [{'date': datetime.datetime.combine(day, datetime.time(19)).timestamp() * 1000}]
+                for i, day in enumerate(pro_game_dates(pro_team_id))
+            }
+            for pro_team_id in PRO_TEAMS
+        }
+        # A player whose NBA team is missing from pro_schedule keeps their own schedule
+        own_schedule = {str(i): {'date': datetime.datetime.combine(day, datetime.time(19))} for i, day in enumerate(pro_game_dates(7))}
+        self.teams = [
+            FakeTeam(1, [
+                FakePlayer(101, 'Guard One', 'ATL', 'PG', ('PG', 'SG', 'G')),
+                FakePlayer(102, 'Wing One', 'BOS', 'SF', ('SF', 'F')),
+                FakePlayer(103, 'Big One', 'LAL', 'C', ('C',)),
+            ]),
+            FakeTeam(2, [
+                FakePlayer(201, 'Guard Two', 'BOS', 'SG', ('SG', 'G')),
+                FakePlayer(202, 'Forward Two', 'CHI', 'PF', ('PF', 'F', 'C')),
+                FakePlayer(203, 'Traded Two', 'DEN', 'SF', ('SF',), schedule=own_schedule),
+            ]),
+            FakeTeam(3, [
+                FakePlayer(301, 'Guard Three', 'CHI', 'PG', ('PG',)),
+                FakePlayer(302, 'Free Agent', 'FA', 'C', ('C',), injury='OUT'),
+            ]),
+            FakeTeam(4, [FakePlayer(401, 'Center Four', 'LAL', 'C', ('C',))]),
+        ]
+        one, two, three, four = self.teams
+        for period in range(periods):
+            # 1 v 2 and 3 v 4, swapping home sides every other week; team 4 has a bye in week 3
+            pairs = [(one, two), (three, four)] if period % 2 == 0 else [(two, one), (four, three)]
+            if period == 2:
+                pairs = [(one, two), (three, None)]
+            for home, away in pairs:
+                for team in (home, away):
+                    if team is not None:
+                        team.schedule.append(FakeMatchup(home, away))
+            if period == 2:
+                four.schedule.append(FakeMatchup(four, None))
+
+
+def naive_games(league, team_id, start, end):
+    """Reference count: every rostered player's games in [start, end], walked one by one."""
+    team = next(team for team in league.teams if team.team_id == team_id)
+    dates = {abbr: pro_game_dates(pro_id) for pro_id, abbr in PRO_TEAMS.items()}
+    total = 0
+    for player in team.roster:
+        if player.schedule:
+            games = [game['date'].date() for game in player.schedule.values()]
+        else:
+            games = dates.get(player.proTeam, [])
+        total += sum(start <= day <= end for day in games)
+    return total
+
+
+@pytest.fixture
+def fake_league():
+    return FakeLeague()
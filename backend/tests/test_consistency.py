@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import nba_stats
+from app.src.analysis import consistency
+from app.src.data import gamelog_store
+
+
+def game_logs(n_players=5, n_games=25, seed=0):
+    """League-wide game logs, newest game first (the warehouse's order)."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for game in range(n_games):
+        for player_id in range(1, n_players + 1):
+            row = {'PLAYER_ID': player_id, 'GAME_DATE': f'2025-03-{31 - game:02d}', 'MIN': rng.uniform(20, 38)}
+            for cat in consistency.CATEGORIES:
+                row[cat] = rng.uniform(0.3, 0.6) if cat in consistency.PCT_CATEGORIES else rng.uniform(0, 30 / player_id)
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def reference(games, player_id, last_n):
+    """The per-player computation the grouped pass replaced: one player, one category at a time."""
+    recent = games[games['PLAYER_ID'] == player_id].head(last_n)
+    stats = {}
+    for cat in consistency.CATEGORIES:
+        mean, std = recent[cat].mean(), recent[cat].std()
+        stats[cat] = (round(std, 2), round(mean, 1), round(std / mean, 2) if mean > 0.1 else 0.0)
+    return stats
+
+
+def test_grouped_pass_matches_per_player_computation():
+    games = game_logs()
+    results = consistency.summarize_consistency(games, last_n=10)
+    assert sorted(results) == [1, 2, 3, 4, 5]
+    for player_id, result in results.items():
+        assert result['games_analyzed'] == 10
+        for cat, (std, mean, cv) in reference(games, player_id, 10).items():
+            stats = result['volatility_stats'][cat]
+            assert stats['std'] == pytest.approx(std)
+            assert stats['mean'] == pytest.approx(mean)
+            assert stats['cv'] == pytest.approx(cv)
+
+
+def test_ratings_grades_and_edge_cases():
+    games = pd.DataFrame([
+        {'PLAYER_ID': 1, 'MIN': 30, **dict.fromkeys(consistency.CATEGORIES, 10.0), 'FT_PCT': 0.0},
+        {'PLAYER_ID': 1, 'MIN': 32, **dict.fromkeys(consistency.CATEGORIES, 10.0), 'FT_PCT': 0.0},
+        {'PLAYER_ID': 2, 'MIN': 20, **dict.fromkeys(consistency.CATEGORIES, 5.0)},
+    ])
+    results = consistency.summarize_consistency(games)
+    steady = results[1]
+    assert steady['consistency_grade'] == 'A+'
+    assert steady['volatility_stats']['PTS']['rating'] == 'Elite'
+    assert steady['volatility_stats']['FT_PCT']['rating'] == 'Low Vol' # no free throws
+    assert steady['recent_averages'] == {'PTS': 10.0, 'MIN': 31.0}
+    # One game: zero spread rather than NaN
+    assert results[2]['games_analyzed'] == 1
+    assert results[2]['volatility_stats']['PTS']['std'] == 0.0
+
+    wild = pd.DataFrame([{'PLAYER_ID': 3, 'MIN': 30, **dict.fromkeys(consistency.CATEGORIES, pts)} for pts in (2.0, 40.0)])
+    result = consistency.summarize_consistency(wild)[3]
+    assert result['consistency_grade'] == 'F'
+    assert result['volatility_stats']['PTS']['rating'] == 'Wild'
+
+
+def test_player_filter():
+    games = game_logs()
+    assert sorted(consistency.summarize_consistency(games, player_ids=[2, 4, 99])) == [2, 4]
+    assert consistency.summarize_consistency(games, player_ids=[99]) == {}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    games = game_logs()
+    monkeypatch.setattr(gamelog_store.game_logs_cache, "get", lambda: games)
+    app = FastAPI()
+    app.include_router(nba_stats.router, prefix="/nba")
+    return TestClient(app)
+
+
+def test_batch_endpoint(client):
+    response = client.post("/nba/consistency/batch", json={"player_ids": [1, 3, 42], "last_n": 5})
+    assert response.status_code == 200
+    body = response.json()
+    assert body['games_window'] == 5
+    assert sorted(body['players']) == ['1', '3']
+    assert body['players']['1']['games_analyzed'] == 5
+    assert body['missing'] == [42]
+
+    everyone = client.post("/nba/consistency/batch", json={"player_ids": "all"}).json()
+    assert len(everyone['players']) == 5 and everyone['missing'] == []
+
+    # The batch and single-player endpoints agree
+    single = client.get("/nba/player/3/consistency").json()
+    assert single == everyone['players']['3']
+
+    assert client.post("/nba/consistency/batch", json={"last_n": 1}).status_code == 400
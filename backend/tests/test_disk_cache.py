@@ -0,0 +1,49 @@
+import threading
+import pytest
+from app.src.utils import config, disk_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "OFFLINE_MODE", False)
+    monkeypatch.setattr(disk_cache, "_cache", disk_cache.DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=1 << 20))
+    monkeypatch.setattr(disk_cache, "_warm", set())
+    return disk_cache._cache
+
+
+def test_first_call_is_served_from_disk_then_upstream(cache):
+    cache.put("nba_stats", "k", "stored")
+    calls = []
+    loader = lambda: calls.append(1) or "fresh"
+    assert disk_cache.cached_call("nba_stats", "k", loader) == "stored"
+    assert disk_cache.cached_call("nba_stats", "k", loader) == "fresh"
+    assert cache.get("nba_stats", "k")[0] == "fresh"
+    assert len(calls) == 1
+
+
+def test_failed_upstream_serves_last_known_copy(cache):
+    cache.put("unknown_source", "k", "stored") # no TTL: never a warm-start hit
+
+    def failing():
+        raise RuntimeError("down")
+
+    assert disk_cache.cached_call("unknown_source", "k", failing) == "stored"
+    with pytest.raises(RuntimeError):
+        disk_cache.cached_call("unknown_source", "missing", failing)
+
+
+def test_concurrent_first_calls_take_the_warm_start_once(cache):
+    cache.put("nba_stats", "k", "stored")
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(disk_cache.cached_call("nba_stats", "k", lambda: "fresh"))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ["fresh"] * 7 + ["stored"]
@@ -0,0 +1,178 @@
+import datetime
+import pytest
+from espn_api.basketball.player import Player
+from espn_api.requests.espn_requests import ESPNInvalidLeague
+from app.src.data import espn_connector, league_model
+from app.src.data.espn_connector import LeagueConnectionManager
+
+
+class Loads:
+    """Stands in for _load_league: records each download, optionally failing."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail = None
+
+    def __call__(self, league_id, season, espn_s2, swid):
+        self.calls.append((league_id, season, espn_s2))
+        if self.fail is not None:
+            raise self.fail(f"League {league_id} ({season})")
+        return object()
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    loads = Loads()
+    monkeypatch.setattr(espn_connector, "_load_league", loads)
+    return loads
+
+
+@pytest.fixture
+def roster_syncs(monkeypatch):
+    syncs = []
+    monkeypatch.setattr(espn_connector, "refresh_rosters", lambda league: syncs.append(league) or 1)
+    return syncs
+
+
+def age(manager, seconds):
+    """Moves every cached entry `seconds` into the past."""
+    for entry in manager._entries.values():
+        entry.loaded_at -= datetime.timedelta(seconds=seconds)
+        entry.rosters_at -= datetime.timedelta(seconds=seconds)
+
+
+def test_leagues_are_loaded_once_per_key(loads, roster_syncs):
+    manager = LeagueConnectionManager(max_size=4)
+    league = manager.get(1, 2026, "s2", "swid")
+    assert manager.get(1, 2026, "s2", "swid") is league
+    assert len(loads.calls) == 1
+
+    # Other credentials or seasons are separate entries
+    assert manager.get(1, 2026, "other", "swid") is not league
+    assert manager.get(1, 2025, "s2", "swid") is not league
+    assert len(loads.calls) == 3
+    assert roster_syncs == []
+
+
+def test_lru_evicts_the_least_recently_used(loads, roster_syncs):
+    manager = LeagueConnectionManager(max_size=2)
+    manager.get(1, 2026)
+    manager.get(2, 2026)
+    manager.get(1, 2026) # 1 is now most recent
+    manager.get(3, 2026) # evicts 2
+    assert [key[0] for key in manager._entries] == [1, 3]
+    manager.get(2, 2026)
+    assert [call[0] for call in loads.calls] == [1, 2, 3, 2]
+
+
+def test_rosters_resync_between_full_reloads(loads, roster_syncs):
+    manager = LeagueConnectionManager(ttl=datetime.timedelta(hours=6), roster_ttl=datetime.timedelta(minutes=5))
+    league = manager.get(1, 2026)
+    generation = manager.generation
+
+    age(manager, 6 * 60)
+    assert manager.get(1, 2026) is league
+    assert roster_syncs == [league]
+    assert manager.generation == generation + 1
+    assert manager.get(1, 2026) is league and len(roster_syncs) == 1 # synced just now
+
+    age(manager, 7 * 3600)
+    assert manager.is_due()
+    assert manager.get(1, 2026) is not league
+    assert len(loads.calls) == 2
+
+
+def test_failed_reload_keeps_serving_the_cached_league(loads, roster_syncs):
+    manager = LeagueConnectionManager(ttl=datetime.timedelta(hours=6), roster_ttl=datetime.timedelta(minutes=5))
+    league = manager.get(1, 2026)
+    age(manager, 7 * 3600)
+    loads.fail = RuntimeError
+    assert manager.get(1, 2026) is league
+    # Not retried on every call: the next attempt waits one roster interval
+    assert manager.get(1, 2026) is league
+    assert len(loads.calls) == 2
+
+
+def test_failed_first_load_raises_and_is_not_cached(loads):
+    manager = LeagueConnectionManager()
+    loads.fail = RuntimeError
+    with pytest.raises(RuntimeError):
+        manager.get(1, 2026)
+    assert manager.status() == []
+
+
+def test_missing_2026_league_falls_back_to_2025(loads, monkeypatch):
+    manager = LeagueConnectionManager()
+    monkeypatch.setattr(espn_connector, "connections", manager)
+
+    def load(league_id, season, espn_s2, swid):
+        loads.calls.append((league_id, season, espn_s2))
+        if season == 2026:
+            raise ESPNInvalidLeague("not created yet")
+        return object()
+
+    monkeypatch.setattr(espn_connector, "_load_league", load)
+    league = espn_connector.get_league_connection(7, 2026, "s2", "swid")
+    assert league is not None
+    # Remembered: the next call goes straight to the 2025 entry
+    assert espn_connector.get_league_connection(7, 2026, "s2", "swid") is league
+    assert [call[1] for call in loads.calls] == [2026, 2025]
+
+
+def test_shared_session_stores_no_cookies():
+    policy = espn_connector.get_http_session().cookies.get_policy()
+    assert policy.is_not_allowed("fantasy.espn.com") and policy.is_not_allowed(".espn.com")
+    assert espn_connector.credentials_hash("a", "b") != espn_connector.credentials_hash("a", "c")
+    assert espn_connector.credentials_hash(None, "b") == "public"
+
+
+# --- Incremental roster refresh ---
+
+def entry(player_id, slot=0, injury="ACTIVE"):
+    return {"playerId": player_id, "lineupSlotId": slot, "playerPoolEntry": {"player": {
+        "id": player_id, "fullName": f"Player {player_id}", "proTeamId": 2, "defaultPositionId": 1,
+        "eligibleSlots": [0, 5], "injuryStatus": injury, "stats": [],
+    }}}
+
+
+class RosterLeague:
+    year = 2026
+    pro_schedule = {}
+
+    def __init__(self, rosters):
+        self.teams = []
+        for team_id, entries in rosters.items():
+            team = type("Team", (), {})()
+            team.team_id, team.roster = team_id, [Player(e, self.year, {}) for e in entries]
+            self.teams.append(team)
+        self.response = {}
+        self.espn_request = type("Request", (), {"league_get": lambda _, params: self.response})()
+
+    def serve(self, rosters):
+        self.response = {"teams": [{"id": team_id, "roster": {"entries": entries}} for team_id, entries in rosters.items()]}
+
+
+def test_refresh_rosters_rebuilds_only_changed_teams(monkeypatch):
+    invalidated = []
+    monkeypatch.setattr(league_model, "invalidate_snapshot", invalidated.append)
+    league = RosterLeague({1: [entry(10), entry(11)], 2: [entry(20)]})
+    one, two = league.teams
+    one_roster, two_roster = one.roster, two.roster
+
+    league.serve({1: [entry(10), entry(11)], 2: [entry(20)]})
+    assert espn_connector.refresh_rosters(league) == 0
+    assert invalidated == []
+
+    # Lineup slot and injury changes count, not just adds and drops
+    league.serve({1: [entry(10, slot=12), entry(11)], 2: [entry(20, injury="OUT")]})
+    assert espn_connector.refresh_rosters(league) == 2
+    assert one.roster is not one_roster and two.roster is not two_roster
+    assert one_roster[0].lineupSlot == "PG" # the old list was replaced, not edited
+    assert two.roster[0].injuryStatus == "OUT"
+    assert invalidated == [league]
+
+    league.serve({1: [entry(10, slot=12), entry(11), entry(12)], 2: [entry(20, injury="OUT")]})
+    two_roster = two.roster
+    assert espn_connector.refresh_rosters(league) == 1
+    assert [p.playerId for p in one.roster] == [10, 11, 12]
+    assert two.roster is two_roster
@@ -0,0 +1,168 @@
+import asyncio
+import threading
+from app.services.event_hub import KEEPALIVE, RESYNC, EventHub, Subscription
+
+
+async def take(stream, n):
+    return [await asyncio.wait_for(stream.__anext__(), 1) for _ in range(n)]
+
+
+def frame_ids(frames):
+    return [int(frame.split(b"\n")[0][4:]) for frame in frames]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def subscribed():
+    # Lets pending take() tasks start their streams, so they are subscribed before publishing
+    await asyncio.sleep(0.01)
+
+
+def test_watchlist_filters_events():
+    async def scenario():
+        hub = EventHub()
+        everything, watched = Subscription(), Subscription(player_ids={7}, teams={"BOS"})
+        all_stream, watched_stream = hub.stream(everything), hub.stream(watched)
+        pending = asyncio.gather(take(all_stream, 3), take(watched_stream, 2))
+        await subscribed()
+        hub.publish("news", {"n": 1}, players=[7])
+        hub.publish("news", {"n": 2}, players=[8], teams=["MIA"])
+        hub.publish("news", {"n": 3}, players=[9], teams=["BOS"])
+        return await pending
+
+    all_frames, watched_frames = run(scenario())
+    assert frame_ids(all_frames) == [1, 2, 3]
+    assert frame_ids(watched_frames) == [1, 3]
+
+
+def test_topics_filter_events():
+    async def scenario():
+        hub = EventHub()
+        stream = hub.stream(Subscription(topics={"rankings"}))
+        pending = asyncio.ensure_future(take(stream, 1))
+        await subscribed()
+        hub.publish("news", {"n": 1})
+        hub.publish("rankings", {"n": 2})
+        return await pending
+
+    (frame,) = run(scenario())
+    assert frame.startswith(b"id: 2\nevent: rankings\n")
+
+
+def test_select_cuts_payload_per_watchlist():
+    async def scenario():
+        hub = EventHub()
+        rows = [{"PLAYER_ID": 1}, {"PLAYER_ID": 2}]
+
+        def select(subscription):
+            picked = [row for row in rows if subscription.matches(row["PLAYER_ID"])]
+            return {"changed": picked} if picked else None
+
+        one, none = Subscription(player_ids={2}), Subscription(player_ids={3})
+        one_stream, none_stream = hub.stream(one), hub.stream(none)
+        pending = asyncio.ensure_future(take(one_stream, 1))
+        blocked = asyncio.ensure_future(take(none_stream, 1))
+        await subscribed()
+        hub.publish("rankings", {"changed": rows}, players=[1, 2], select=select)
+        frames = await pending
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        blocked.cancel()
+        return frames
+
+    (frame,) = run(scenario())
+    assert frame.endswith(b'data: {"changed":[{"PLAYER_ID":2}]}\n\n')
+
+
+def test_last_event_id_replays_missed_events():
+    async def scenario():
+        hub = EventHub()
+        for n in range(1, 4):
+            hub.publish("news", {"n": n})
+        stream = hub.stream(Subscription(), last_event_id=1)
+        replayed = await take(stream, 2)
+        hub.publish("news", {"n": 4})
+        return replayed + await take(stream, 1)
+
+    assert frame_ids(run(scenario())) == [2, 3, 4]
+
+
+def test_replay_skips_filtered_events():
+    async def scenario():
+        hub = EventHub()
+        hub.publish("news", {"n": 1}, players=[1])
+        hub.publish("news", {"n": 2}, players=[2])
+        hub.publish("news", {"n": 3}, players=[1])
+        return await take(hub.stream(Subscription(player_ids={1}), last_event_id=0), 2)
+
+    assert frame_ids(run(scenario())) == [1, 3]
+
+
+def test_resync_when_history_no_longer_covers_the_gap():
+    async def scenario():
+        hub = EventHub(history_size=2)
+        for n in range(1, 6):
+            hub.publish("news", {"n": n})
+        return await take(hub.stream(Subscription(), last_event_id=1), 1)
+
+    assert run(scenario()) == [RESYNC]
+
+
+def test_resync_when_id_is_from_before_a_restart():
+    async def scenario():
+        hub = EventHub()
+        hub.publish("news", {"n": 1})
+        return await take(hub.stream(Subscription(), last_event_id=99), 1)
+
+    assert run(scenario()) == [RESYNC]
+
+
+def test_slow_client_gets_resync():
+    async def scenario():
+        hub = EventHub()
+        stream = hub.stream(Subscription(queue_size=2))
+        first = asyncio.ensure_future(take(stream, 1))
+        await subscribed()
+        for n in range(5):
+            hub.publish("news", {"n": n})
+        frames = await first # the backlog was dropped for a resync
+        hub.publish("news", {"n": 5})
+        frames += await take(stream, 1) # then delivery resumes
+        return frames, hub.resyncs
+
+    frames, resyncs = run(scenario())
+    assert frames[0] == RESYNC
+    assert frame_ids(frames[1:]) == [6]
+    assert resyncs >= 1
+
+
+def test_publish_from_worker_thread():
+    async def scenario():
+        hub = EventHub()
+        stream = hub.stream(Subscription())
+        pending = asyncio.ensure_future(take(stream, 1))
+        await subscribed()
+        worker = threading.Thread(target=hub.publish, args=("news", {"n": 1}))
+        worker.start()
+        worker.join()
+        return await pending
+
+    assert frame_ids(run(scenario())) == [1]
+
+
+def test_keepalive_and_close():
+    async def scenario():
+        hub = EventHub()
+        stream = hub.stream(Subscription(), keepalive=0.01)
+        frames = await take(stream, 1)
+        hub.close()
+        try:
+            await asyncio.wait_for(stream.__anext__(), 1)
+        except StopAsyncIteration:
+            return frames, len(hub)
+
+    frames, subscribers = run(scenario())
+    assert frames == [KEEPALIVE]
+    assert subscribers == 0
@@ -0,0 +1,83 @@
+import datetime
+import pandas as pd
+from app.src.data.gamelog_store import STORE_COLUMNS, GameLogStore
+
+SEASON = "2024-25"
+
+
+def log_rows(*games):
+    """(player_id, game_id, game_date, pts) tuples as a LeagueGameLog-shaped frame."""
+    rows = []
+    for player_id, game_id, game_date, pts in games:
+        row = dict.fromkeys(STORE_COLUMNS, 1.0)
+        row.update({
+            'PLAYER_ID': player_id, 'PLAYER_NAME': f'Player {player_id}', 'TEAM_ID': 1610612738,
+            'TEAM_ABBREVIATION': 'BOS', 'GAME_ID': game_id, 'GAME_DATE': f'{game_date}T00:00:00',
+            'MATCHUP': 'BOS vs. MIA', 'WL': 'W', 'PTS': pts,
+        })
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+class Upstream:
+    """Fake LeagueGameLog: serves the games on/after date_from, recording each request."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.requests = []
+
+    def __call__(self, season, date_from=None):
+        self.requests.append((season, date_from))
+        if date_from is None:
+            return self.frame
+        return self.frame[self.frame['GAME_DATE'].str[:10] >= date_from.isoformat()]
+
+
+def make_store(tmp_path):
+    return GameLogStore(str(tmp_path / "gamelogs.sqlite3"), SEASON)
+
+
+def test_bulk_load_then_incremental_sync(tmp_path):
+    store = make_store(tmp_path)
+    upstream = Upstream(log_rows((1, 'g1', '2024-11-01', 20), (2, 'g1', '2024-11-01', 10), (1, 'g2', '2024-11-03', 30)))
+
+    assert store.sync(upstream) == 3
+    assert upstream.requests == [(SEASON, None)] # one league-wide request for the season
+    assert store.last_game_date() == datetime.date(2024, 11, 3)
+
+    # Next night: only games from the latest stored date on are requested, and the
+    # overlapping day isn't stored twice
+    upstream.frame = pd.concat([upstream.frame, log_rows((2, 'g3', '2024-11-05', 12))])
+    assert store.sync(upstream) == 1
+    assert upstream.requests[-1] == (SEASON, datetime.date(2024, 11, 3))
+    assert len(store.load_frame()) == 4
+
+
+def test_reads_are_newest_first_and_filterable(tmp_path):
+    store = make_store(tmp_path)
+    store.append(log_rows((1, 'g1', '2024-11-01', 20), (2, 'g1', '2024-11-01', 10), (1, 'g2', '2024-11-03', 30)))
+
+    frame = store.load_frame(player_ids=[1])
+    assert frame['GAME_ID'].tolist() == ['g2', 'g1']
+    assert frame['PTS'].tolist() == [30, 20]
+    assert store.load_frame(since=datetime.date(2024, 11, 2))['GAME_ID'].tolist() == ['g2']
+
+
+def test_read_since_returns_only_new_rows(tmp_path):
+    store = make_store(tmp_path)
+    store.append(log_rows((1, 'g1', '2024-11-01', 20)))
+    rows, watermark = store.read_since(0)
+    assert len(rows) == 1 and 'ROW_ID' not in rows
+
+    store.append(log_rows((1, 'g1', '2024-11-01', 20), (1, 'g2', '2024-11-03', 30)))
+    rows, newest = store.read_since(watermark)
+    assert rows['GAME_ID'].tolist() == ['g2']
+    rows, unchanged = store.read_since(newest)
+    assert rows.empty and unchanged == newest
+
+
+def test_seasons_are_kept_apart(tmp_path):
+    make_store(tmp_path).append(log_rows((1, 'g1', '2024-11-01', 20)))
+    other = GameLogStore(str(tmp_path / "gamelogs.sqlite3"), "2023-24")
+    assert other.load_frame().empty
+    assert other.last_game_date() is None
@@ -0,0 +1,84 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.src.utils.http_cache import CacheRule, HTTPCacheMiddleware, etag_matches
+
+
+def make_client():
+    state = {"version": "1", "fresh": True, "calls": 0}
+    app = FastAPI()
+
+    @app.get("/data")
+    def data(q: str = ""):
+        state["calls"] += 1
+        return {"version": state["version"], "q": q}
+
+    @app.get("/live")
+    def live():
+        return {"ok": True}
+
+    app.add_middleware(HTTPCacheMiddleware, rules=[
+        CacheRule("/data", max_age=60, stale_while_revalidate=300,
+                  version=lambda: state["version"], fresh=lambda: state["fresh"]),
+        CacheRule("/live"),
+    ])
+    return TestClient(app), state
+
+
+def test_headers_on_first_response():
+    client, _ = make_client()
+    response = client.get("/data")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=60, stale-while-revalidate=300"
+    assert response.headers["etag"].startswith('W/"')
+
+
+def test_fresh_revalidation_skips_the_route():
+    client, state = make_client()
+    etag = client.get("/data").headers["etag"]
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert state["calls"] == 1
+
+
+def test_new_version_gets_a_new_etag():
+    client, state = make_client()
+    etag = client.get("/data").headers["etag"]
+    state["version"] = "2"
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["version"] == "2"
+    assert response.headers["etag"] != etag
+
+
+def test_stale_data_runs_the_route_then_answers_304():
+    client, state = make_client()
+    etag = client.get("/data").headers["etag"]
+    state["fresh"] = False
+    response = client.get("/data", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert state["calls"] == 2 # the read still ran, so it could trigger a refresh
+
+
+def test_etag_depends_on_query():
+    client, _ = make_client()
+    assert client.get("/data?q=a").headers["etag"] != client.get("/data?q=b").headers["etag"]
+    etag = client.get("/data?q=a").headers["etag"]
+    assert client.get("/data?q=b", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_no_store_rule():
+    client, _ = make_client()
+    response = client.get("/live")
+    assert response.headers["cache-control"] == "no-store"
+    assert "etag" not in response.headers
+
+
+def test_etag_matches():
+    assert etag_matches('W/"a-1-x"', 'W/"a-1-x"')
+    assert etag_matches('"a-1-x"', 'W/"a-1-x"')
+    assert etag_matches('W/"other", W/"a-1-x"', 'W/"a-1-x"')
+    assert etag_matches("*", 'W/"a-1-x"')
+    assert not etag_matches('W/"a-2-x"', 'W/"a-1-x"')
+    assert not etag_matches(None, 'W/"a-1-x"')
@@ -0,0 +1,79 @@
+import pickle
+from app.src.analysis import roster_analyzer
+from app.src.data import league_model, matchup_utils
+from app.src.data.league_model import C, PF, PG, SF, SG, LeagueSnapshot
+
+
+def test_snapshot_records(fake_league):
+    snapshot = league_model.build_snapshot(fake_league)
+    assert [team.team_id for team in snapshot.teams] == [1, 2, 3, 4]
+    one = snapshot.team(1)
+    assert one.team_abbrev == 'T1'
+    guard, wing, big = one.roster
+    assert (guard.player_id, guard.name, guard.pro_team) == (101, 'Guard One', 'ATL')
+    assert guard.position_mask == PG and guard.eligible_mask == PG | SG
+    assert wing.position_mask == SF and big.position_mask == C
+    assert one.position_masks.tolist() == [PG, SF, C]
+    assert snapshot.team(2).roster[1].eligible_mask == PF | C
+
+    # Every player points at their NBA team's schedule row; a free agent has none
+    assert guard.schedule_row == snapshot.schedule.team_pos['ATL']
+    assert snapshot.team(2).roster[2].schedule_row == snapshot.schedule.team_pos['DEN']
+    free_agent = snapshot.team(3).roster[1]
+    assert free_agent.schedule_row == -1 and free_agent.injury_status == 'OUT'
+    assert snapshot.roster_weights(snapshot.team(3)).sum() == 1
+
+
+def test_pairings_match_the_team_schedules(fake_league):
+    snapshot = league_model.build_snapshot(fake_league)
+    assert len(snapshot.pairings) == 24
+    for period in range(1, 25):
+        legacy = matchup_utils.get_matchups_from_team_schedules(fake_league, period)
+        pairs = snapshot.matchup_pairs(period)
+        assert [(home.team_id, away.team_id) for home, away in pairs] == \
+            [(home.team_id, away.team_id) for home, away in legacy]
+    assert [(h.team_id, a.team_id) for h, a in snapshot.matchup_pairs(3)] == [(1, 2)] # byes dropped
+    assert snapshot.matchup_pairs(0) == [] and snapshot.matchup_pairs(25) == []
+
+
+def test_roster_version_tracks_roster_moves_only(fake_league):
+    version = league_model.build_snapshot(fake_league).roster_version
+    assert league_model.build_snapshot(fake_league).roster_version == version
+
+    fake_league.teams[0].roster[0].injuryStatus = 'OUT'
+    assert league_model.build_snapshot(fake_league).roster_version == version
+
+    traded = fake_league.teams[0].roster.pop()
+    fake_league.teams[1].roster.append(traded)
+    assert league_model.build_snapshot(fake_league).roster_version != version
+
+
+def test_snapshot_pickles_without_espn_objects(fake_league):
+    snapshot = league_model.build_snapshot(fake_league)
+    copy = pickle.loads(pickle.dumps(snapshot))
+    assert isinstance(copy, LeagueSnapshot)
+    assert copy.roster_version == snapshot.roster_version
+    assert copy.pairings == snapshot.pairings
+    assert copy.schedule.games.tolist() == snapshot.schedule.games.tolist()
+    assert [p.name for p in copy.team(2).roster] == [p.name for p in snapshot.team(2).roster]
+
+
+def test_snapshots_are_cached_per_league(fake_league):
+    snapshot = league_model.get_snapshot(fake_league)
+    assert league_model.get_snapshot(fake_league) is snapshot
+    assert league_model.get_snapshot(snapshot) is snapshot
+    league_model.invalidate_snapshot(fake_league)
+    assert league_model.get_snapshot(fake_league) is not snapshot
+
+
+def test_analysis_matches_on_records_and_espn_players(fake_league):
+    snapshot = league_model.get_snapshot(fake_league)
+    counts = roster_analyzer.league_position_counts(snapshot)
+    for row, (team, record) in enumerate(zip(fake_league.teams, snapshot.teams)):
+        assert roster_analyzer.generate_roster_insight(team.roster) == roster_analyzer.generate_roster_insight(record)
+        assert tuple(counts[row]) == roster_analyzer.position_counts(record.position_masks)
+    assert counts.tolist()[0] == [1, 1, 1]
+
+    overview = roster_analyzer.analyze_league_rosters(fake_league)
+    assert [team['roster_size'] for team in overview['teams']] == [3, 3, 2, 1]
+    assert overview['categories'] == []
@@ -0,0 +1,32 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.routers import league
+from app.src.data import espn_connector
+from app.src.utils import config
+
+
+def make_client(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(config, "LEAGUE_ID", "111")
+    monkeypatch.setattr(config, "LEAGUE_IDS", ["111", "222"])
+    monkeypatch.setattr(espn_connector, "get_league_snapshot", lambda league_id=None, season=None: loaded.append(league_id))
+    app = FastAPI()
+    app.include_router(league.router, prefix="/league")
+    return TestClient(app), loaded
+
+
+def test_unconfigured_league_is_rejected_before_loading(monkeypatch):
+    client, loaded = make_client(monkeypatch)
+    for path in ("/league/overview", "/league/schedule/season", "/league/schedule/upcoming"):
+        response = client.get(path, params={"league_id": 999})
+        assert response.status_code == 404
+    assert loaded == []
+
+
+def test_configured_leagues_are_loaded(monkeypatch):
+    client, loaded = make_client(monkeypatch)
+    # The stubbed loader returns None, which the routes report as a 502
+    assert client.get("/league/overview").status_code == 502
+    assert client.get("/league/overview", params={"league_id": 222}).status_code == 502
+    assert client.get("/league/schedule/season", params={"league_id": 111}).status_code == 502
+    assert loaded == [None, 222, 111]
@@ -0,0 +1,78 @@
+import datetime
+from collections import OrderedDict
+import pytest
+from app.services import matchup_service
+from app.src.data import league_model, matchup_calendar
+from conftest import naive_games
+
+
+@pytest.fixture(autouse=True)
+def fresh_tables(monkeypatch):
+    monkeypatch.setattr(matchup_service, "_season_tables", OrderedDict())
+
+
+def test_season_table_period_counts(fake_league):
+    table = matchup_service.get_season_table(fake_league)
+    periods = matchup_calendar.get_matchup_schedule(2026)
+    assert table.period_ids == list(periods)
+    assert table.totals.shape == (len(fake_league.teams), len(periods))
+
+    for row, team_id in enumerate(table.team_ids):
+        for col, (start, end) in enumerate(periods.values()):
+            assert table.totals[row, col] == naive_games(fake_league, team_id, start, end)
+            daily = table.daily_counts(team_id, start, end)
+            assert len(daily) == (end - start).days + 1
+            assert daily.sum() == table.totals[row, col]
+
+
+def test_season_table_is_cached_per_roster_version(fake_league):
+    table = matchup_service.get_season_table(fake_league)
+    assert matchup_service.get_season_table(fake_league) is table
+
+    # A roster move means a new snapshot with a new version, and so a new table
+    fake_league.teams[0].roster.pop()
+    league_model.invalidate_snapshot(fake_league)
+    moved = matchup_service.get_season_table(fake_league)
+    assert moved is not table
+    assert moved.totals[0].sum() < table.totals[0].sum()
+
+
+def test_matchup_analysis_reads_the_table(fake_league):
+    start, end = matchup_calendar.get_matchup_schedule(2026)[2]
+    analysis = matchup_service.get_matchup_analysis(fake_league, 2, start, end, my_team_id=3)
+    assert analysis['days'] == [(start + datetime.timedelta(days=i)).strftime('%a') for i in range(7)]
+    first, second = analysis['matchups']
+    assert first['is_my_matchup'] and {first['home_team']['id'], first['away_team']['id']} == {3, 4}
+    assert second['home_team']['id'] == 2 # home sides swap every other week
+    for matchup in analysis['matchups']:
+        for side in ('home_team', 'away_team'):
+            assert matchup[side]['total_games'] == naive_games(fake_league, matchup[side]['id'], start, end)
+        assert matchup['diff'] == matchup['home_team']['total_games'] - matchup['away_team']['total_games']
+
+    # Ranges outside the matchup calendar come straight from the game matrix
+    start, end = datetime.date(2025, 10, 1), datetime.date(2025, 10, 23)
+    custom = matchup_service.get_matchup_analysis(fake_league, 1, start, end)
+    assert custom['matchups'][0]['home_team']['total_games'] == naive_games(fake_league, 1, start, end)
+
+
+def test_season_outlook(fake_league):
+    outlook = matchup_service.get_season_outlook(fake_league, my_team_id=1)
+    table = matchup_service.get_season_table(fake_league)
+    assert [p['period'] for p in outlook['periods']] == table.period_ids
+    assert outlook['periods'][2]['matchups'][0]['is_my_matchup']
+    assert len(outlook['periods'][2]['matchups']) == 1 # byes have no matchup
+    team_one = outlook['teams'][0]
+    assert team_one['period_totals'] == table.totals[0].tolist()
+    assert team_one['season_total'] == sum(team_one['period_totals'])
+    assert matchup_service.get_season_outlook(fake_league, my_team_id=1) is outlook
+
+    with pytest.raises(ValueError):
+        matchup_service.get_season_outlook(fake_league, my_team_id=99)
+
+
+def test_upcoming_periods(fake_league):
+    periods = matchup_calendar.get_matchup_schedule(2026)
+    as_of = periods[5][0] + datetime.timedelta(days=1)
+    upcoming = matchup_service.get_upcoming_periods(fake_league, weeks=3, as_of=as_of)
+    assert [p['period'] for p in upcoming] == [5, 6, 7]
+    assert upcoming[0] == matchup_service.get_season_outlook(fake_league)['periods'][4]
@@ -0,0 +1,80 @@
+import time
+import pytest
+import requests
+from app.src.data import nba_stats_client
+from app.src.data.nba_stats_client import CircuitBreaker, CircuitOpenError, StatsSession, TokenBucket
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure(RuntimeError("boom"))
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert 0 < breaker.retry_after() <= 60
+
+
+def test_breaker_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure(RuntimeError("boom"))
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow() # only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+
+def test_breaker_failed_trial_reopens():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.05)
+    for _ in range(3):
+        breaker.record_failure(RuntimeError("boom"))
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure(RuntimeError("still down"))
+    assert breaker.state == "open"
+    assert breaker.status()["last_error"] == "still down"
+
+
+def _failing_session(monkeypatch, calls, **kwargs):
+    def fail(self, method, url, **request_kwargs):
+        calls.append(request_kwargs["timeout"])
+        raise requests.ConnectionError("unreachable")
+
+    monkeypatch.setattr(requests.Session, "request", fail)
+    return StatsSession(TokenBucket(1000, 1000), CircuitBreaker(100, 60), **kwargs)
+
+
+def test_session_retries_then_raises(monkeypatch):
+    monkeypatch.setattr(nba_stats_client, "backoff_delay", lambda attempt, retry_after=None: 0)
+    calls = []
+    session = _failing_session(monkeypatch, calls, max_retries=3)
+    with pytest.raises(requests.ConnectionError):
+        session.get("https://stats.nba.com/stats/x")
+    assert len(calls) == 4
+    assert session.breaker.status()["consecutive_failures"] == 1
+
+
+def test_session_stops_at_retry_budget(monkeypatch):
+    monkeypatch.setattr(nba_stats_client, "backoff_delay", lambda attempt, retry_after=None: 0.1)
+    monkeypatch.setattr(nba_stats_client, "MIN_ATTEMPT_SECONDS", 0.05)
+    calls = []
+    session = _failing_session(monkeypatch, calls, max_retries=50, budget=0.5)
+    started = time.monotonic()
+    with pytest.raises(requests.ConnectionError):
+        session.get("https://stats.nba.com/stats/x")
+    assert time.monotonic() - started < 0.5
+    assert 1 < len(calls) < 51
+    assert all(timeout <= 0.5 for timeout in calls)
+
+
+def test_open_breaker_short_circuits(monkeypatch):
+    calls = []
+    session = _failing_session(monkeypatch, calls, max_retries=0)
+    session.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    session.breaker.record_failure(RuntimeError("boom"))
+    with pytest.raises(CircuitOpenError):
+        session.get("https://stats.nba.com/stats/x")
+    assert calls == []
@@ -0,0 +1,93 @@
+from app.services.news_service import DuplicateIndex, NewsStore
+
+REPORT = (
+    "Jayson Tatum scored 34 points with nine rebounds and six assists in Monday's win over the Heat, "
+    "hitting five threes while playing 38 minutes as Boston moved to 12-3 on the season"
+)
+
+
+def item(item_id, report=REPORT, headline="Tatum drops 34 on Heat", team_abbr="BOS", source="A"):
+    return {"id": item_id, "headline": headline, "report": report, "team_abbr": team_abbr, "player": "Jayson Tatum", "source": source}
+
+
+def test_syndicated_copy_is_skipped():
+    store = NewsStore()
+    assert len(store.add([item("a:1")])) == 1
+    # Same story under another source's id and headline
+    assert store.add([item("b:1", headline="Tatum scores 34 vs. Miami", source="B")]) == []
+    assert store.duplicates_skipped == 1
+
+
+def test_near_duplicate_is_skipped():
+    store = NewsStore()
+    store.add([item("a:1")])
+    edited = REPORT.replace("Monday's", "Monday night's")
+    assert store.add([item("b:1", report=edited)]) == []
+
+
+def test_different_story_is_kept():
+    index = DuplicateIndex()
+    _, keys = index.find(item("a:1"))
+    index.add("a:1", keys)
+    other = (
+        "Jaylen Brown was held to 11 points on 4-for-15 shooting in Wednesday's loss to the Knicks, "
+        "committing five turnovers as Boston fell to 12-4 on the season"
+    )
+    assert index.find(item("b:1", report=other))[0] is None
+
+
+def test_similarity_threshold():
+    words = REPORT.split()
+    index = DuplicateIndex(similarity=0.8)
+    _, keys = index.find(item("a:1"))
+    index.add("a:1", keys)
+    # Rewriting half of the report is a different item, not a near-duplicate
+    rewritten = " ".join(word if i % 2 else f"x{i}" for i, word in enumerate(words))
+    assert index.find(item("b:1", report=rewritten))[0] is None
+
+
+def test_items_without_text_are_never_duplicates():
+    store = NewsStore()
+    blank = [item(f"a:{i}", report="", headline="") for i in range(3)]
+    assert len(store.add(blank)) == 3
+    assert store.duplicates_skipped == 0
+
+
+def _stories(n):
+    # Distinct text per item so none are deduplicated
+    return [
+        item(f"s:{i}", report=f"story {i} " + " ".join(f"w{i}x{j}" for j in range(10)), team_abbr="BOS" if i % 2 else "MIA")
+        for i in range(n)
+    ]
+
+
+def test_cursor_pagination_walks_every_item_once():
+    store = NewsStore()
+    store.add(_stories(25)[::-1]) # pages arrive newest first
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.query(limit=10, cursor=cursor)
+        seen.extend(entry["id"] for entry in page)
+        if cursor is None:
+            break
+    assert seen == [f"s:{i}" for i in range(24, -1, -1)]
+
+
+def test_cursor_pagination_with_filter():
+    store = NewsStore()
+    store.add(_stories(25)[::-1])
+    first, cursor = store.query(team="BOS", limit=5)
+    second, last = store.query(team="BOS", limit=5, cursor=cursor)
+    third, end = store.query(team="BOS", limit=5, cursor=last)
+    ids = [entry["id"] for entry in first + second + third]
+    assert ids == [f"s:{i}" for i in range(23, 0, -2)]
+    assert end is None
+
+
+def test_cursor_survives_new_items():
+    store = NewsStore()
+    store.add(_stories(10)[::-1])
+    page, cursor = store.query(limit=4)
+    store.add([item("new", report="breaking " + " ".join(f"n{j}" for j in range(10)))])
+    next_page, _ = store.query(limit=4, cursor=cursor)
+    assert [entry["id"] for entry in next_page] == ["s:5", "s:4", "s:3", "s:2"]
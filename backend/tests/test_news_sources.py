@@ -0,0 +1,41 @@
+import pickle
+import pytest
+from app.src.data import news_aggregator, news_sources
+
+RSS = b"""<?xml version="1.0"?>
+<rss><channel>
+  <item><title>Tatum drops 34</title><description>&lt;p&gt;Big night in Miami&lt;/p&gt;</description>
+    <guid>tatum-34</guid><pubDate>Mon, 04 Nov 2024 03:00:00 GMT</pubDate></item>
+  <item><title></title><guid>empty</guid></item>
+</channel></rss>"""
+
+
+def test_news_source_is_abstract():
+    with pytest.raises(TypeError):
+        news_sources.NewsSource()
+
+
+def test_sources_share_one_session(monkeypatch):
+    requested = []
+
+    class Response:
+        content = RSS
+
+        def raise_for_status(self):
+            pass
+
+    monkeypatch.setattr(news_aggregator.session, "get", lambda url, **kwargs: requested.append(url) or Response())
+    source = news_sources.RSSSource("ESPN", "https://example.com/rss")
+    assert source.download() == RSS
+    assert news_aggregator.download_news_page() == RSS
+    assert requested == ["https://example.com/rss", news_aggregator.URL]
+
+
+def test_rss_parse_survives_pickling():
+    source = pickle.loads(pickle.dumps(news_sources.RSSSource("ESPN", "https://example.com/rss", "BOS")))
+    items = source.parse(RSS)
+    assert len(items) == 1
+    assert items[0]["headline"] == "Tatum drops 34"
+    assert items[0]["report"] == "Big night in Miami"
+    assert items[0]["published"].startswith("2024-11-04T03:00:00")
+    assert items[0]["id"].startswith("ESPN:")
@@ -0,0 +1,69 @@
+import pytest
+from app.src.data import player_index
+from app.src.data.player_index import PlayerNameIndex, name_key, name_variants
+
+PLAYERS = [
+    {'id': 1, 'full_name': 'Jaren Jackson Jr.', 'last_name': 'Jackson Jr.', 'is_active': True},
+    {'id': 2, 'full_name': 'Nikola Jokić', 'last_name': 'Jokić', 'is_active': True},
+    {'id': 3, 'full_name': 'Herbert Jones', 'last_name': 'Jones', 'is_active': True},
+    {'id': 4, 'full_name': 'Tre Jones', 'last_name': 'Jones', 'is_active': True},
+    {'id': 5, 'full_name': 'Shai Gilgeous-Alexander', 'last_name': 'Gilgeous-Alexander', 'is_active': True},
+    {'id': 6, 'full_name': 'Michael Jordan', 'last_name': 'Jordan', 'is_active': False},
+    {'id': 7, 'full_name': 'Michael Jordan', 'last_name': 'Jordan', 'is_active': True}, # same name, active one wins
+]
+
+
+@pytest.fixture
+def index():
+    return PlayerNameIndex(PLAYERS)
+
+
+def test_name_keys():
+    assert name_key("Gary Trent Jr.") == "gary trent"
+    assert name_key("  D'Angelo  Russell ") == "dangelo russell"
+    assert name_key("Nikola Jokić") == "nikola jokic"
+    assert name_variants("Stephen Curry") == {"stephen curry", "steph curry"}
+    assert "shai gilgeousalexander" in name_variants("Shai Gilgeous-Alexander")
+
+
+def test_exact_and_variant_lookups(index):
+    assert index.resolve("Jaren Jackson Jr.") == 1
+    assert index.resolve("jaren jackson") == 1
+    assert index.resolve("NIKOLA JOKIC") == 2
+    assert index.resolve("Herb Jones") == 3
+    assert index.resolve("Shai Gilgeous Alexander") == 5
+    assert index.resolve("Michael Jordan") == 7
+    assert index.match("Mike Jordan") == (7, 1.0)
+
+
+def test_surnames_resolve_only_when_unambiguous(index):
+    assert index.resolve("Jokic") == 2
+    assert index.resolve("Jones") is None # two active Joneses
+    assert index.resolve("Jordan") == 7 # the inactive one doesn't count
+
+
+def test_fuzzy_fallback(index):
+    player_id, score = index.match("Nikola Jokicc")
+    assert player_id == 2 and 0.6 <= score < 1
+    assert index.resolve("Somebody Else") is None
+
+
+def test_resolve_many_and_news_fields(index, monkeypatch):
+    assert index.resolve_many(["Jokic", "Jones", "Jokic"]) == {"Jokic": 2, "Jones": None}
+    monkeypatch.setattr(player_index, "_index", index)
+    assert player_index.resolve_player_ids("Herb Jones; Unknown Guy; Jokic") == [3, 2]
+    assert player_index.resolve_player_ids(None) == []
+
+
+def test_repeat_lookups_are_cached(index, monkeypatch):
+    assert index.resolve("Jokic") == 2
+    monkeypatch.setattr(index, "last_names", {})
+    assert index.resolve("Jokic") == 2 # served from the cache
+
+
+def test_real_player_list():
+    index = player_index.get_player_index()
+    assert index.resolve("Jokic") == 203999
+    assert index.resolve("Steph Curry") == 201939
+    assert index.resolve("Shai Gilgeous Alexander") == 1628983
+    assert index.resolve("Smith") is None
@@ -0,0 +1,57 @@
+import datetime
+import numpy as np
+from app.src.data import schedule_index
+from app.src.data.schedule_index import ScheduleIndex
+from conftest import SEASON_START, naive_games, pro_game_dates
+
+DAY = datetime.timedelta(days=1)
+
+
+def test_game_matrix_from_team_dates():
+    index = ScheduleIndex({
+        'BOS': [SEASON_START, SEASON_START + 2 * DAY, SEASON_START + 2 * DAY], # duplicate date counted once
+        'MIA': [SEASON_START + DAY, SEASON_START + 4 * DAY],
+    })
+    assert index.start_date == SEASON_START
+    assert index.n_days == 5
+    assert index.games.tolist() == [[1, 0, 1, 0, 0], [0, 1, 0, 0, 1]]
+
+
+def test_daily_matrix_for_many_rosters_and_ranges():
+    index = ScheduleIndex({'BOS': [SEASON_START, SEASON_START + 2 * DAY], 'MIA': [SEASON_START + DAY, SEASON_START + 2 * DAY]})
+    weights = np.array([[2, 0], [1, 1]]) # two Celtics; one of each
+
+    counts = index.daily_matrix(weights, SEASON_START, SEASON_START + 2 * DAY)
+    assert counts.tolist() == [[2, 0, 2], [1, 1, 2]]
+    # Ranges reaching outside the schedule are zero-padded, not shifted
+    counts = index.daily_matrix(weights, SEASON_START - 2 * DAY, SEASON_START + 4 * DAY)
+    assert counts.tolist() == [[0, 0, 2, 0, 2, 0, 0], [0, 0, 1, 1, 2, 0, 0]]
+    assert index.daily_matrix(weights, SEASON_START + 10 * DAY, SEASON_START + 12 * DAY).sum() == 0
+    assert index.column_range(SEASON_START + 5 * DAY, SEASON_START + 9 * DAY) == (5, 5)
+
+
+def test_roster_weights_map_players_to_team_rows(fake_league):
+    index = schedule_index.build_schedule_index(fake_league)
+    two = fake_league.teams[1]
+    weights = index.roster_weights(two.roster)
+    assert weights.sum() == 3
+    assert weights[index.team_pos['BOS']] == 1
+    assert weights[index.team_pos['CHI']] == 1
+    assert weights[index.team_pos['DEN']] == 1 # from the player's own schedule
+    # A free agent without a schedule contributes nothing
+    three = fake_league.teams[2]
+    assert len(index.team_indices(three.roster)) == 1
+
+
+def test_built_index_matches_walking_player_schedules(fake_league):
+    index = schedule_index.build_schedule_index(fake_league)
+    assert set(index.team_keys) == {'ATL', 'BOS', 'CHI', 'LAL', 'DEN'}
+    assert index.games[index.team_pos['BOS']].sum() == len(pro_game_dates(2))
+
+    for start_offset, length in [(0, 6), (6, 7), (40, 14), (170, 30)]:
+        start = SEASON_START + start_offset * DAY
+        end = start + (length - 1) * DAY
+        for team in fake_league.teams:
+            counts = index.daily_matrix(index.roster_weights(team.roster), start, end)[0]
+            assert len(counts) == length
+            assert counts.sum() == naive_games(fake_league, team.team_id, start, end)
@@ -0,0 +1,70 @@
+import datetime
+import threading
+import pytest
+from app.services import pipeline
+from app.services.scheduler import Scheduler, daily_at, every, refresh_cache
+from app.src.utils import config
+from app.src.utils.snapshot_cache import SnapshotCache
+
+
+def test_refresh_cache_raises_this_runs_error():
+    outcomes = iter([1, RuntimeError("upstream down"), 2])
+
+    def loader():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(minutes=5))
+    refresh_cache(cache)
+    with pytest.raises(RuntimeError, match="upstream down"):
+        refresh_cache(cache)
+    # The next run succeeds: the earlier failure isn't reported again
+    refresh_cache(cache)
+    assert cache.peek() == 2
+
+
+def test_refresh_cache_skips_a_reload_in_flight():
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("earlier failure")
+        if len(calls) == 3:
+            started.set()
+            release.wait(2)
+        return len(calls)
+
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(minutes=5))
+    cache.get()
+    cache.refresh()
+    assert cache.status()["last_error"] == "earlier failure"
+
+    cache.refresh(wait=False)
+    assert started.wait(2)
+    refresh_cache(cache) # in flight: neither waits nor reports the earlier failure
+    release.set()
+    assert len(calls) == 3
+
+
+def test_ttl_jobs_run_before_their_cache_expires(monkeypatch):
+    monkeypatch.setattr(config, "NEWS_POLLING", True)
+    monkeypatch.setattr(config, "LEAGUE_IDS", [])
+    scheduler = pipeline.register_jobs(Scheduler())
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for name, ttl in [
+        ("league_stats", pipeline.league_stats_cache._ttl),
+        ("news", pipeline.news_service.news_cache._ttl),
+    ]:
+        assert scheduler.jobs[name].cadence(now) - now < ttl
+    assert "league" not in scheduler.jobs
+
+
+def test_cadences():
+    last = datetime.datetime(2025, 1, 1, 12, 30, tzinfo=datetime.timezone.utc)
+    assert every(30)(last) == last + datetime.timedelta(minutes=30)
+    assert daily_at(10)(last) == datetime.datetime(2025, 1, 2, 10, tzinfo=datetime.timezone.utc)
+    assert daily_at(13)(last) == datetime.datetime(2025, 1, 1, 13, tzinfo=datetime.timezone.utc)
@@ -0,0 +1,104 @@
+import datetime
+import threading
+import pytest
+from app.src.utils.snapshot_cache import SnapshotCache
+
+
+class FlakyLoader:
+    """Returns 1, 2, ... while healthy; raises while failing."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+        self.done = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        try:
+            if self.failing:
+                raise RuntimeError("upstream down")
+            return self.calls
+        finally:
+            self.done.set()
+
+
+def refresh_in_background(cache, loader):
+    loader.done.clear()
+    assert cache.get() is not None
+    assert loader.done.wait(2)
+    # Let the refresh thread store its result and release the loading flag
+    for _ in range(200):
+        if not cache.status()["refreshing"]:
+            return
+        threading.Event().wait(0.005)
+
+
+def test_stale_snapshot_refreshes_in_background():
+    loader = FlakyLoader()
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(0))
+    assert cache.get() == 1
+    refresh_in_background(cache, loader)
+    assert cache.peek() == 2
+    assert cache.version == 2
+
+
+def test_failed_refresh_backs_off_before_retrying():
+    loader = FlakyLoader()
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(0), retry_after=datetime.timedelta(minutes=1))
+    assert cache.get() == 1
+    loader.failing = True
+    refresh_in_background(cache, loader)
+    assert loader.calls == 2
+    status = cache.status()
+    assert status["last_error"] == "upstream down"
+    assert status["retry_at"] is not None
+
+    # Still stale, but every request during the outage is served the old snapshot
+    # without another upstream call
+    for _ in range(20):
+        assert cache.get() == 1
+    assert cache.is_stale() and cache.backing_off()
+    assert loader.calls == 2
+
+
+def test_backoff_doubles_and_resets_on_success():
+    loader = FlakyLoader()
+    retry_after = datetime.timedelta(seconds=30)
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(minutes=5), retry_after=retry_after)
+    cache.get()
+    loader.failing = True
+
+    cache.refresh()
+    first = cache._retry_at - datetime.datetime.now()
+    cache.refresh()
+    second = cache._retry_at - datetime.datetime.now()
+    assert first <= retry_after < second <= 2 * retry_after
+    for _ in range(10):
+        cache.refresh()
+    # Capped at the TTL
+    assert cache._retry_at - datetime.datetime.now() <= datetime.timedelta(minutes=5)
+
+    loader.failing = False
+    cache.refresh()
+    assert not cache.backing_off()
+    assert cache.status()["last_error"] is None
+
+
+def test_backoff_expires():
+    loader = FlakyLoader()
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(0), retry_after=datetime.timedelta(minutes=1))
+    cache.get()
+    loader.failing = True
+    cache.refresh()
+    assert cache.backing_off()
+    assert not cache.backing_off(now=datetime.datetime.now() + datetime.timedelta(minutes=2))
+
+
+def test_failed_cold_load_is_not_retried_per_request():
+    loader = FlakyLoader()
+    loader.failing = True
+    cache = SnapshotCache(loader, ttl=datetime.timedelta(minutes=5))
+    for _ in range(5):
+        with pytest.raises(RuntimeError, match="upstream down"):
+            cache.get()
+    assert loader.calls == 1
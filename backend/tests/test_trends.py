@@ -0,0 +1,79 @@
+import datetime
+import pandas as pd
+import pytest
+from app.src.analysis import trends
+
+SEASON_START = datetime.date(2024, 9, 1)
+
+
+def game(player_id, day, **stats):
+    row = {
+        'PLAYER_ID': player_id, 'PLAYER_NAME': f'Player {player_id}', 'TEAM_ABBREVIATION': 'BOS',
+        'GAME_DATE': (SEASON_START + datetime.timedelta(days=day)).isoformat(),
+        'MIN': 30, 'FGM': 5, 'FGA': 10, 'FTM': 4, 'FTA': 5,
+        'PTS': 15, 'REB': 5, 'AST': 3, 'STL': 1, 'BLK': 1, 'FG3M': 1, 'TOV': 2,
+    }
+    row.update(stats)
+    return row
+
+
+def build_index(rows):
+    index = trends.TrendIndex(SEASON_START)
+    index.update(pd.DataFrame(rows))
+    return index
+
+
+def test_window_percentages_come_from_makes_and_attempts():
+    # Season: 10 games at 5/10 FG; last week: 3 games, 9/10 then 1/2 twice (11/14)
+    rows = [game(1, day) for day in range(10, 20)]
+    rows += [game(1, 60, FGM=9, FGA=10), game(1, 62, FGM=1, FGA=2), game(1, 64, FGM=1, FGA=2)]
+    frame = build_index(rows).window(7).set_index('PLAYER_ID')
+
+    assert frame.loc[1, 'GAMES'] == 3
+    assert frame.loc[1, 'FG_PCT_AVG'] == pytest.approx(11 / 14) # not the mean of 0.9, 0.5, 0.5
+    assert frame.loc[1, 'FG_PCT_SEASON'] == pytest.approx(61 / 114)
+    assert frame.loc[1, 'FG_PCT_DELTA'] == pytest.approx(11 / 14 - 61 / 114)
+    assert frame.loc[1, 'FT_PCT_DELTA'] == pytest.approx(0)
+    assert frame.loc[1, 'PTS_AVG'] == pytest.approx(15)
+
+
+def test_no_attempts_is_missing_not_zero():
+    index = build_index([game(1, 10, FTM=0, FTA=0), game(1, 12, FTM=0, FTA=0)])
+    frame = index.window(7)
+    assert frame['FT_PCT_AVG'].isna().all()
+    result = trends.get_trending(index, days=7, sort_by='FT_PCT')
+    assert result['risers'] == [] and result['fallers'] == []
+
+
+def test_risers_and_fallers_are_mutually_exclusive():
+    rows = []
+    for player_id, recent_minutes in [(1, 38), (2, 34), (3, 30), (4, 26)]:
+        rows += [game(player_id, day) for day in range(10, 20)]
+        rows += [game(player_id, day, MIN=recent_minutes) for day in (60, 62)]
+    result = trends.get_trending(build_index(rows), days=7, sort_by='MIN', limit=25)
+
+    risers = [row['PLAYER_ID'] for row in result['risers']]
+    fallers = [row['PLAYER_ID'] for row in result['fallers']]
+    assert risers == [1, 2] # biggest gain first; player 3 didn't move
+    assert fallers == [4]
+    assert not set(risers) & set(fallers)
+
+
+def test_trending_by_shooting_percentage():
+    rows = []
+    for player_id, recent_makes in [(1, 8), (2, 2)]:
+        rows += [game(player_id, day) for day in range(10, 20)]
+        rows += [game(player_id, day, FGM=recent_makes) for day in (60, 62)]
+    result = trends.get_trending(build_index(rows), days=7, sort_by='FG_PCT')
+    assert [row['PLAYER_ID'] for row in result['risers']] == [1]
+    assert [row['PLAYER_ID'] for row in result['fallers']] == [2]
+    assert result['risers'][0]['FG_PCT_AVG'] == pytest.approx(0.8)
+
+
+def test_min_games_and_unknown_stat():
+    rows = [game(1, day) for day in range(10, 20)] + [game(1, 62, MIN=40)]
+    index = build_index(rows)
+    assert trends.get_trending(index, days=7, min_games=2)['risers'] == []
+    assert [row['PLAYER_ID'] for row in trends.get_trending(index, days=7, min_games=1)['risers']] == [1]
+    with pytest.raises(ValueError):
+        trends.get_trending(index, sort_by='FGA')
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+from app.src.analysis import zscore_engine
+from conftest import league_frame
+
+
+def test_column_fields_match_records(ranking_table):
+    order, totals = zscore_engine.rank_players(ranking_table)
+    records = zscore_engine.to_records(ranking_table, order, totals, limit=10)
+    rows = zscore_engine.select_rows(ranking_table, order, totals, limit=10)
+    columns = zscore_engine.to_columns(ranking_table, rows, order, totals, fields=['PLAYER_ID', 'RANK'])
+
+    assert columns['PLAYER_ID'] == [record['PLAYER_ID'] for record in records]
+    assert all(type(player_id) is int for player_id in columns['PLAYER_ID'])
+    assert columns['RANK'] == list(range(1, 11))
+
+
+def test_sort_by_id_keeps_int_ids(ranking_table):
+    order, totals = zscore_engine.rank_players(ranking_table)
+    rows = zscore_engine.select_rows(ranking_table, order, totals, sort='PLAYER_ID', descending=False, limit=3)
+    columns = zscore_engine.to_columns(ranking_table, rows, order, totals, fields=['PLAYER_ID'])
+    assert columns['PLAYER_ID'] == [1000, 1001, 1002]
+
+
+def test_impact_columns_only_in_impact_mode(ranking_table):
+    impact_columns = {'FG_IMPACT', 'FT_IMPACT', 'FG_IMPACT_Z', 'FT_IMPACT_Z'}
+    order, totals = zscore_engine.rank_players(ranking_table)
+    record = zscore_engine.to_records(ranking_table, order, totals, limit=1)[0]
+    assert not impact_columns & set(record)
+    assert list(record) == zscore_engine.output_columns(ranking_table)
+
+    order, totals = zscore_engine.rank_players(ranking_table, pct_mode='impact')
+    record = zscore_engine.to_records(ranking_table, order, totals, limit=1, pct_mode='impact')[0]
+    assert impact_columns <= set(record)
+    assert list(record) == zscore_engine.output_columns(ranking_table, 'impact')
+
+
+def legacy_rankings(frame):
+    """The pre-engine /rankings computation (pandas, one column at a time), as reference."""
+    df = frame.copy()
+    z_cols = []
+    for cat in zscore_engine.NINE_CAT:
+        mean, std = df[cat].mean(), df[cat].std()
+        df[f'{cat}_Z'] = (mean - df[cat]) / std if cat == 'TOV' else (df[cat] - mean) / std
+        z_cols.append(f'{cat}_Z')
+    df['TOTAL_Z'] = df[z_cols].sum(axis=1)
+    df = df.sort_values(by='TOTAL_Z', ascending=False).reset_index(drop=True)
+    df['RANK'] = df.index + 1
+    return df
+
+
+def ranked(table, **config):
+    order, totals = zscore_engine.rank_players(table, **config)
+    return zscore_engine.to_records(table, order, totals, pct_mode=config.get('pct_mode', 'raw'))
+
+
+def z_sum(record, categories, weights=None):
+    weights = weights or {}
+    return sum(record[f'{cat}_Z'] * weights.get(cat, 1.0) for cat in categories)
+
+
+def test_default_ranking_matches_legacy():
+    frame = league_frame()
+    legacy = legacy_rankings(frame)
+    records = ranked(zscore_engine.build_ranking_table(frame))
+
+    assert [r['PLAYER_ID'] for r in records] == legacy['PLAYER_ID'].tolist()
+    assert [r['RANK'] for r in records] == legacy['RANK'].tolist()
+    np.testing.assert_allclose([r['TOTAL_Z'] for r in records], legacy['TOTAL_Z'], rtol=1e-9)
+    for cat in zscore_engine.NINE_CAT:
+        np.testing.assert_allclose([r[f'{cat}_Z'] for r in records], legacy[f'{cat}_Z'], rtol=1e-9, atol=1e-12)
+
+
+def test_eight_cat_drops_turnovers(ranking_table):
+    records = ranked(ranking_table, league_format='8cat')
+    for record in records:
+        assert record['TOTAL_Z'] == pytest.approx(z_sum(record, zscore_engine.EIGHT_CAT))
+    totals = [r['TOTAL_Z'] for r in records]
+    assert totals == sorted(totals, reverse=True)
+    assert [r['RANK'] for r in records] == list(range(1, len(records) + 1))
+
+
+def test_punted_categories_count_for_nothing(ranking_table):
+    records = ranked(ranking_table, punt=['ft_pct', 'PTS'])
+    kept = [cat for cat in zscore_engine.NINE_CAT if cat not in ('FT_PCT', 'PTS')]
+    for record in records:
+        assert record['TOTAL_Z'] == pytest.approx(z_sum(record, kept))
+    assert [r['TOTAL_Z'] for r in records] == sorted((r['TOTAL_Z'] for r in records), reverse=True)
+
+    # Punting a player's best category moves them down
+    best_scorer = max(records, key=lambda r: r['PTS_Z'])['PLAYER_ID']
+    default_rank = {r['PLAYER_ID']: r['RANK'] for r in ranked(ranking_table)}[best_scorer]
+    punt_rank = {r['PLAYER_ID']: r['RANK'] for r in records}[best_scorer]
+    assert punt_rank >= default_rank
+
+
+def test_custom_weights_scale_categories(ranking_table):
+    weights = {'BLK': 3.0, 'stl': 0.5}
+    records = ranked(ranking_table, weights=weights)
+    for record in records:
+        assert record['TOTAL_Z'] == pytest.approx(z_sum(record, zscore_engine.NINE_CAT, {'BLK': 3.0, 'STL': 0.5}))
+
+    # Heavily weighting blocks puts the best shot blocker near the top
+    top_blocker = max(records, key=lambda r: r['BLK_Z'])['PLAYER_ID']
+    heavy = ranked(ranking_table, weights={'BLK': 100})
+    assert heavy[0]['PLAYER_ID'] == top_blocker
+
+
+def test_points_league_uses_scoring_settings():
+    frame = league_frame()
+    table = zscore_engine.build_ranking_table(frame)
+    records = ranked(table, league_format='points')
+    expected = sum(frame[cat] * points for cat, points in zscore_engine.POINTS_SCORING.items())
+    by_id = dict(zip(frame['PLAYER_ID'], expected))
+    for record in records:
+        assert record['TOTAL_Z'] == pytest.approx(by_id[record['PLAYER_ID']])
+    assert [r['PLAYER_ID'] for r in records] == frame.loc[expected.sort_values(ascending=False, kind='stable').index, 'PLAYER_ID'].tolist()
+
+    # Points leagues accept scoring overrides and punts too
+    doubled = ranked(table, league_format='points', weights={'STL': 8}, punt=['TOV'])
+    by_id = dict(zip(frame['PLAYER_ID'], expected + 4 * frame['STL'] + 2 * frame['TOV']))
+    for record in doubled:
+        assert record['TOTAL_Z'] == pytest.approx(by_id[record['PLAYER_ID']])
+
+
+def test_impact_mode_scores_volume_weighted_percentages(ranking_table):
+    records = ranked(ranking_table, pct_mode='impact')
+    categories = [cat for cat in zscore_engine.NINE_CAT if cat not in ('FG_PCT', 'FT_PCT')] + ['FG_IMPACT', 'FT_IMPACT']
+    for record in records:
+        assert record['TOTAL_Z'] == pytest.approx(z_sum(record, categories))
+
+
+def test_rank_many_matches_single_configs(ranking_table):
+    configs = [
+        zscore_engine.normalize_config(),
+        zscore_engine.normalize_config('8cat', punt=['FG_PCT']),
+        zscore_engine.normalize_config('points'),
+        zscore_engine.normalize_config(weights={'AST': 2}, pct_mode='impact'),
+    ]
+    for config, (order, totals) in zip(configs, zscore_engine.rank_many(ranking_table, configs)):
+        single_order, single_totals = zscore_engine.rank_many(ranking_table, [config])[0]
+        assert order.tolist() == single_order.tolist()
+        np.testing.assert_allclose(totals, single_totals)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"league_format": "10cat"},
+    {"pct_mode": "ratio"},
+    {"league_format": "8cat", "punt": ["TOV"]},
+    {"weights": {"FGA": 1}},
+])
+def test_invalid_configs_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        zscore_engine.normalize_config(**kwargs)
@@ -34,3 +34,8 @@ export const fetchPlayerConsistency = async (playerId: number) => {
     const { data } = await api.get(`/nba/player/${playerId}/consistency`);
     return data;
 };
+
+export const fetchConsistencyBatch = async (playerIds: number[] | 'all', lastN: number = 20) => {
+    const { data } = await api.post('/nba/consistency/batch', { player_ids: playerIds, last_n: lastN });
+    return data;
+};